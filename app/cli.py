@@ -0,0 +1,227 @@
+"""Linha de comando sem interface gráfica, para tarefas agendadas.
+
+Uso: ``python -m app.cli <comando> [opções]``. Comandos:
+
+- ``report``: resumo de vendas do período (texto ou ``--json``);
+- ``export``: clientes, serviços, estoque ou pedidos em CSV/JSON;
+- ``import``: clientes de um CSV (``name,phone,notes`` e ``id`` opcional);
+- ``backup``: backup online verificado (``app.data.backup``);
+- ``sync-flush``: envia a fila de sincronização;
+- ``rebuild-rollups``: recalcula os totais dos arquivos mortos;
+- ``bench``: benchmarks que não dependem do Qt.
+
+Só a camada de dados é importada (nada de PyQt), e cada comando importa o que
+usa dentro da própria função: ``--help`` e comandos simples sobem rápido.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Callable, List, Optional
+
+_EXPORT_KINDS = ("clients", "services", "inventory", "orders")
+# Benchmarks que rodam sem QApplication (bench_startup e bench_icons precisam da interface)
+_BENCHES = {"data": "benchmarks.bench_data", "sync_codec": "benchmarks.bench_sync_codec"}
+
+
+def _brl(cents: int) -> str:
+    return f"R$ {cents / 100:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def _open_out(path: Optional[str]):
+    if not path or path == "-":
+        return sys.stdout
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+# --------- Comandos ---------
+def cmd_report(args: argparse.Namespace) -> int:
+    import json
+    from datetime import date
+
+    from app.data import sqlite as sqldb
+
+    sqldb.init_db()
+    count, total, avg = sqldb.summary_since(args.days)
+    report = {
+        "days": args.days,
+        "orders": count,
+        "revenue_cents": total,
+        "avg_ticket_cents": int(round(avg)),
+        "cash_today_cents": sqldb.cash_sum_for_date(date.today().isoformat()),
+        "revenue_by_day": sqldb.revenue_by_day(args.days),
+        "top_services": sqldb.top_services_by_revenue(args.top, args.days),
+    }
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+    print(f"Últimos {args.days} dias: {count} pedido(s), {_brl(total)} (ticket médio {_brl(int(round(avg)))})")
+    print(f"Recebido hoje: {_brl(report['cash_today_cents'])}")
+    print("Serviços mais vendidos:")
+    for name, _type, subtype, cents in report["top_services"]:
+        label = f"{name} ({subtype})" if subtype else name
+        print(f"  {label:<40s} {_brl(cents):>14s}")
+    return 0
+
+
+def _export_rows(kind: str, args: argparse.Namespace):
+    from app.data import sqlite as sqldb
+
+    if kind == "clients":
+        return ["id", "name", "phone", "notes"], [
+            (c.id, c.name, c.phone, c.notes) for c in sqldb.list_clients()
+        ]
+    if kind == "services":
+        return ["id", "name", "type", "subtype", "price_cents", "active"], [
+            (s.id, s.name, s.type, s.subtype, s.price_cents, int(s.active)) for s in sqldb.list_services(include_inactive=True)
+        ]
+    if kind == "inventory":
+        return ["id", "name", "unit", "quantity"], sqldb.list_inventory()
+    return ["id", "order_code", "client_name", "status", "total_cents", "due_date_iso"], sqldb.list_orders(
+        status=args.status,
+        created_from=args.date_from,
+        created_to=args.date_to,
+        include_archived=args.archived,
+    )
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    import csv
+    import json
+
+    from app.data import sqlite as sqldb
+
+    sqldb.init_db()
+    header, rows = _export_rows(args.kind, args)
+    out = _open_out(args.out)
+    try:
+        if args.format == "json":
+            json.dump([dict(zip(header, r)) for r in rows], out, ensure_ascii=False, indent=2)
+            out.write("\n")
+        else:
+            writer = csv.writer(out)
+            writer.writerow(header)
+            writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{len(rows)} registro(s) exportado(s)", file=sys.stderr)
+    return 0
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    import csv
+
+    from app.data import sqlite as sqldb
+    from app.models.client import Client
+
+    sqldb.init_db()
+    clients: List[Client] = []
+    with open(args.file, encoding="utf-8-sig", newline="") as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            name = (row.get("name") or "").strip()
+            if not name:
+                print(f"linha {line_no}: sem nome, ignorada", file=sys.stderr)
+                continue
+            clients.append(Client(
+                id=(row.get("id") or "").strip() or None,
+                name=name,
+                phone=(row.get("phone") or "").strip() or None,
+                notes=(row.get("notes") or "").strip() or None,
+            ))
+    if args.dry_run:
+        print(f"{len(clients)} cliente(s) seriam importados")
+        return 0
+    saved = sqldb.upsert_clients(clients)
+    print(f"{len(saved)} cliente(s) importado(s)")
+    return 0
+
+
+def cmd_backup(args: argparse.Namespace) -> int:
+    from app.data import backup
+
+    return backup.main(["--dir", args.dir] if args.dir else [])
+
+
+def cmd_sync_flush(args: argparse.Namespace) -> int:
+    from app.config.firebase_config import get_firestore_client
+    from app.data import sqlite as sqldb
+    from app.utils.sync_manager import SyncManager
+
+    sqldb.init_db()
+    pending = sqldb.count_sync_queue()
+    client = get_firestore_client()
+    if client is None:
+        print(f"modo offline: {pending} item(ns) continuam na fila")
+        return 1
+    sent = SyncManager(client).flush_now()
+    print(f"{sent} de {pending} item(ns) enviados")
+    return 0 if sent == pending else 1
+
+
+def cmd_rebuild_rollups(args: argparse.Namespace) -> int:
+    from app.data import archive
+
+    return archive.main(["--rebuild-rollups"])
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    import importlib
+
+    module = importlib.import_module(_BENCHES[args.name])
+    return module.main(args.bench_args)
+
+
+# --------- Entrada ---------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Tarefas em lote sem interface gráfica.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("report", help="resumo de vendas do período")
+    p.add_argument("--days", type=int, default=30)
+    p.add_argument("--top", type=int, default=10, help="quantos serviços listar")
+    p.add_argument("--json", action="store_true", help="saída em JSON")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("export", help="exporta dados em CSV ou JSON")
+    p.add_argument("kind", choices=_EXPORT_KINDS)
+    p.add_argument("--format", choices=("csv", "json"), default="csv")
+    p.add_argument("--out", default=None, help="arquivo de saída (padrão: stdout)")
+    p.add_argument("--status", default=None, help="pedidos: filtra pelo status")
+    p.add_argument("--from", dest="date_from", default=None, help="pedidos: criados a partir de AAAA-MM-DD")
+    p.add_argument("--to", dest="date_to", default=None, help="pedidos: criados até AAAA-MM-DD")
+    p.add_argument("--archived", action="store_true", help="pedidos: inclui o arquivo morto")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="importa clientes de um CSV (name,phone,notes[,id])")
+    p.add_argument("file")
+    p.add_argument("--dry-run", action="store_true", help="só valida o arquivo")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("backup", help="backup online verificado e compactado")
+    p.add_argument("--dir", default=None, help="pasta de destino (padrão: BACKUP_DIR)")
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("sync-flush", help="envia a fila de sincronização")
+    p.set_defaults(func=cmd_sync_flush)
+
+    p = sub.add_parser("rebuild-rollups", help="recalcula os totais dos arquivos mortos")
+    p.set_defaults(func=cmd_rebuild_rollups)
+
+    p = sub.add_parser("bench", help="benchmarks sem interface gráfica")
+    p.add_argument("name", choices=sorted(_BENCHES))
+    p.add_argument("bench_args", nargs=argparse.REMAINDER, help="opções repassadas ao benchmark")
+    p.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    func: Callable[[argparse.Namespace], int] = args.func
+    return func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
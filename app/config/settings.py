@@ -13,18 +13,43 @@ _DEFAULTS: Dict[str, Any] = {
     "PHONE": "(16) 98854-7350",
     # Persistência offline (SQLite)
     "DB_PATH": "myrthes.db",
+    # Arquivo morto: pedidos entregues há mais de N meses vão para archive/archive_AAAA.db (0 desliga)
+    "ARCHIVE_AFTER_MONTHS": 12,
+    "ARCHIVE_DIR": None,  # padrão: pasta "archive" ao lado do DB_PATH
+    "ARCHIVE_BATCH_SIZE": 500,
+    # Backup online (API de backup do SQLite), compactado e com rotação
+    "BACKUP_ENABLED": True,
+    "BACKUP_DIR": None,  # padrão: pasta "backups" ao lado do DB_PATH
+    "BACKUP_INTERVAL_HOURS": 24,
+    "BACKUP_KEEP": 7,
+    "BACKUP_PAGES_PER_STEP": 256,
+    "BACKUP_STEP_SLEEP_MS": 5,
+    # Manutenção do banco (PRAGMA optimize, ANALYZE, incremental_vacuum) com o app ocioso
+    "MAINTENANCE_ENABLED": True,
+    "MAINTENANCE_IDLE_SECONDS": 120,  # sem uso do banco há pelo menos N segundos
+    "MAINTENANCE_OPTIMIZE_HOURS": 6,
+    "MAINTENANCE_ANALYZE_DAYS": 7,
+    "MAINTENANCE_VACUUM_BUDGET_MS": 500,  # tempo máximo de incremental_vacuum por rodada
+    "MAINTENANCE_VACUUM_PAGES_PER_STEP": 128,
+    # Instrumentação das consultas (app.data.profiling); também liga com MYRTHES_DB_PROFILE=1
+    "DB_PROFILE_ENABLED": False,
+    "DB_SLOW_QUERY_MS": 200,  # comandos acima disso vão para logs/slow_queries.log com o plano
+    # Rastreamento entre camadas (app.utils.tracing); também liga com MYRTHES_TRACE=1
+    "TRACE_ENABLED": False,
     # Impressora térmica
     "THERMAL_PRINTER_VENDOR_ID": None,  # ex.: 0x04b8
     "THERMAL_PRINTER_PRODUCT_ID": None,  # ex.: 0x0e15
     "THERMAL_PRINTER_SERIAL_PORT": None,  # ex.: 'COM3'
     "THERMAL_PRINTER_BAUDRATE": 9600,
     "THERMAL_PRINTER_HOST": None,
+    "THERMAL_PRINTER_RASTER": True,  # recibo como uma imagem 1 bit (False: ESC/POS, com as fontes da impressora)
     # Aparência (UI)
     "UI_FONT_FAMILY": "Segoe UI",
     "UI_FONT_SIZE_PT": 12,
     "UI_TABLE_ROW_HEIGHT": 28,
     "UI_HEADER_FONT_DELTA": 1,
     "UI_THEME": "system",  # system | dark
+    "UI_STALL_THRESHOLD_MS": 500,  # UI sem resposta por mais que isso: pilha em logs/ui_stalls.log (0 desliga)
     # Sincronização / Credenciais Firebase (opcional override)
     "FIREBASE_CREDENTIALS": None,
 }
@@ -36,7 +61,9 @@ _CURRENT: Dict[str, Any] = _DEFAULTS.copy()
 
 
 def _coerce_types(d: Dict[str, Any]) -> Dict[str, Any]:
-    coerced = _DEFAULTS.copy()
+    # Só as chaves presentes em ``d``: o resto de _CURRENT (chaves que existem
+    # apenas no settings.json, como BACKUP_*/ARCHIVE_*) fica como está
+    coerced: Dict[str, Any] = {}
     for key, default_value in _DEFAULTS.items():
         if key not in d:
             continue
@@ -2,20 +2,33 @@ from __future__ import annotations
 
 from typing import List
 
+from app.events.bus import bus
 from app.models.client import Client
+from app.utils.client_index import ClientIndex
+from app.utils import tracing
 from app.utils.firebase_repository import FirebaseRepository
 
 
+@tracing.traced_methods("controller.clients")
 class ClientController:
     def __init__(self, repository: FirebaseRepository) -> None:
         self._repository = repository
+        # Índice para o seletor de clientes: atualizado aqui a cada gravação e
+        # reconstruído só quando a lista muda fora do controller (client_list_changed)
+        self._index = ClientIndex(self._repository.list_clients)
+        bus.client_list_changed.connect(self._index.invalidate)
 
     def upsert(self, name: str, phone: str | None, notes: str | None) -> Client:
         client = Client(id=None, name=name.strip(), phone=(phone or '').strip() or None, notes=(notes or '').strip() or None)
-        return self._repository.upsert_client(client)
+        saved = self._repository.upsert_client(client)
+        self._index.add(saved)
+        return saved
 
     def list(self) -> List[Client]:
         return self._repository.list_clients()
 
     def search(self, query: str) -> List[Client]:
         return self._repository.search_clients(query)
+
+    def index(self) -> ClientIndex:
+        return self._index
@@ -1,35 +1,76 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from app.models.order import OrderItem
+from app.events.bus import bus
+from app.models.client import Client
+from app.models.order import Order, OrderItem, Payment
+from app.utils import tracing
 from app.utils.firebase_repository import FirebaseRepository
 
 
+@tracing.traced_methods("controller.orders")
 class OrdersController:
     def __init__(self, repository: FirebaseRepository) -> None:
         self._repository = repository
 
     def create_order(self, client_id: str, items: List[OrderItem], due_date_iso: Optional[str] = None):
         order = self._repository.create_order(client_id, items, due_date_iso=due_date_iso)
+        bus.publish("orders_created", order.id)
         # Exemplo de baixa simples de estoque: zíper consome 1 unidade por item
         for it in items:
             if it.service_type == "troca_ziper":
                 self._repository.adjust_inventory("ziper_padrao", -it.quantity)
+                bus.publish("inventory_adjusted", "ziper_padrao")
         return order
 
     def update_status(self, order_id: str, status: str, delivered_at_iso: Optional[str]) -> None:
-        self._repository.update_order_status(order_id, status, delivered_at_iso)
+        self.update_statuses([order_id], status, delivered_at_iso)
 
-    def list_orders(self, status: Optional[str] = None, client_query: Optional[str] = None, order_code_query: Optional[str] = None):
-        return self._repository.list_orders(status, client_query, order_code_query)
+    def update_statuses(self, order_ids: Iterable[str], status: str, delivered_at_iso: Optional[str]) -> List[str]:
+        updated = self._repository.update_orders_status(order_ids, status, delivered_at_iso)
+        if updated:
+            bus.publish("orders_updated", *updated)
+        return updated
+
+    def list_orders(
+        self,
+        status: Optional[str] = None,
+        client_query: Optional[str] = None,
+        order_code_query: Optional[str] = None,
+        ids: Optional[Iterable[str]] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        include_archived: bool = False,
+    ):
+        return self._repository.list_orders(status, client_query, order_code_query, ids, created_from, created_to, include_archived)
 
     def get_order_with_items(self, order_id: str):
         return self._repository.get_order_with_items(order_id)
 
+    def receipt_records(self, order_ids: Iterable[str]) -> List[Tuple[Order, Optional[Client], List[Payment]]]:
+        """Pedido, cliente e pagamentos de cada id, para ``receipt_template.render_many``.
+
+        Pagamentos numa consulta só; cada cliente é lido uma vez.
+        """
+        ids = list(order_ids)
+        payments = self._repository.list_payments(ids)
+        clients: Dict[str, Optional[Client]] = {}
+        records = []
+        for oid in ids:
+            found = self._repository.get_order_with_items(oid)
+            if found is None:
+                continue
+            order = found[0]
+            if order.client_id not in clients:
+                clients[order.client_id] = self._repository.get_client_by_id(order.client_id)
+            records.append((order, clients[order.client_id], payments.get(oid, [])))
+        return records
+
     # --------- Pagamentos / Caixa ---------
     def add_payment(self, order_id: str, amount_cents: int, method: str | None = None, note: str | None = None) -> None:
         self._repository.add_payment(order_id, int(amount_cents), method, note)
+        bus.publish("payments_added", order_id)
 
     def cash_closing_sum_for_date(self, date_iso: str) -> int:
         """Retorna soma de pagamentos em uma data para fechamento de caixa (centavos)."""
@@ -37,4 +78,10 @@ class OrdersController:
 
     # --------- Remoção ---------
     def delete_order(self, order_id: str) -> None:
-        self._repository.delete_order(order_id)
\ No newline at end of file
+        self.delete_orders([order_id])
+
+    def delete_orders(self, order_ids: Iterable[str]) -> List[str]:
+        deleted = self._repository.delete_orders(order_ids)
+        if deleted:
+            bus.publish("orders_deleted", *deleted)
+        return deleted
@@ -2,23 +2,47 @@ from __future__ import annotations
 
 from typing import List
 
+from app.events.bus import bus
 from app.models.service import Service
+from app.utils import tracing
 from app.utils.firebase_repository import FirebaseRepository
+from app.utils.service_catalog import ServiceCatalog
 
 
+@tracing.traced_methods("controller.services")
 class ServiceController:
     def __init__(self, repository: FirebaseRepository) -> None:
         self._repository = repository
+        # Serviços lidos uma vez; as alterações abaixo atualizam o catálogo sem recarregar
+        self._catalog = ServiceCatalog(
+            lambda: self._repository.list_services(include_inactive=True),
+            self._repository.recent_item_services,
+        )
+
+    def catalog(self) -> ServiceCatalog:
+        return self._catalog
 
     def list_services(self, include_inactive: bool = False) -> List[Service]:
-        return self._repository.list_services(include_inactive=include_inactive)
+        return self._catalog.services(include_inactive=include_inactive)
 
     def update_price(self, service: Service, new_price_cents: int) -> None:
         self._repository.update_service_price(service, int(new_price_cents))
+        self._catalog.set_price(service.id, int(new_price_cents))
+        bus.publish("services_changed", service.id)
 
     def upsert(self, name: str, type_: str, subtype: str | None, price_cents: int, active: bool = True) -> Service:
         svc = Service(id=None, name=name.strip(), type=type_.strip(), subtype=(subtype or '').strip() or None, price_cents=int(price_cents), active=bool(active))
-        return self._repository.upsert_service(svc)
+        saved = self._repository.upsert_service(svc)
+        self._catalog.put(saved)
+        bus.publish("services_changed", saved.id)
+        return saved
 
     def set_active(self, service_id: str, active: bool) -> None:
         self._repository.set_service_active(service_id, active)
+        self._catalog.set_active(service_id, active)
+        bus.publish("services_changed", service_id)
+
+    def reload(self) -> None:
+        """Descarta o catálogo; a próxima consulta relê a tabela ``services``."""
+        self._catalog.invalidate()
+        bus.publish("services_changed")
@@ -0,0 +1,339 @@
+"""Arquivo morto de pedidos: tira do banco principal os pedidos entregues há muito tempo.
+
+Pedidos entregues há mais de ``ARCHIVE_AFTER_MONTHS`` meses vão, com itens e
+pagamentos, para ``archive_AAAA.db`` (ano de criação do pedido). O banco
+principal guarda só:
+
+- ``archive_meta``: quais anos existem e o intervalo de datas de cada arquivo;
+- ``rollup_*``: totais diários do que foi arquivado, somados pelos relatórios.
+
+As listagens anexam (``ATTACH``) um arquivo apenas quando o filtro alcança o
+ano dele: intervalo de datas, código do pedido (``MC-AAMMDD-…``) ou pedido
+explícito de incluir o histórico.
+
+Uso manual: ``python -m app.data.archive [--months N] [--rebuild-rollups]``.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings as app_settings
+from app.data import sqlite as sqldb
+from app.utils import flight_recorder
+
+# O SQLite permite 10 bancos anexados por conexão por padrão
+MAX_ATTACHED = 9
+
+_logger = logging.getLogger("myrthes.archive")
+
+_ORDER_CODE_YEAR = re.compile(r"MC-(\d{2})", re.IGNORECASE)
+
+_ORDER_COLUMNS = "id, client_id, created_at_iso, status, total_cents, due_date_iso, delivered_at_iso, order_code"
+_ITEM_COLUMNS = "id, order_id, service_name, service_type, service_subtype, unit_price_cents, quantity"
+_PAYMENT_COLUMNS = "id, order_id, amount_cents, method, note, created_at_iso"
+
+
+# --------- Arquivos ---------
+def archive_dir() -> Path:
+    configured = app_settings.get_settings().get("ARCHIVE_DIR")
+    if configured:
+        return Path(configured)
+    return Path(sqldb.DB_PATH).resolve().parent / "archive"
+
+
+def archive_path(year: int) -> Path:
+    return archive_dir() / f"archive_{int(year)}.db"
+
+
+def _ensure_archive_file(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    try:
+        for ddl in sqldb.ORDER_TABLES_DDL:
+            conn.execute(ddl)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def schema_name(year: int) -> str:
+    return f"arch_{int(year)}"
+
+
+# --------- Consulta ---------
+def archived_years(conn: sqlite3.Connection) -> List[Tuple[int, str, str, str]]:
+    """(ano, caminho, menor created_at, maior created_at) de cada arquivo, mais novo primeiro."""
+    rows = conn.execute(
+        "SELECT year, path, min_created_iso, max_created_iso FROM archive_meta ORDER BY year DESC"
+    ).fetchall()
+    return [(int(r[0]), r[1], r[2], r[3]) for r in rows]
+
+
+def years_for(
+    conn: sqlite3.Connection,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    order_code: Optional[str] = None,
+    include_all: bool = False,
+) -> List[int]:
+    """Anos arquivados que o filtro alcança (vazio = só o banco principal)."""
+    meta = archived_years(conn)
+    if not meta:
+        return []
+    if include_all:
+        return _cap([m[0] for m in meta])
+    chosen: List[int] = []
+    match = _ORDER_CODE_YEAR.search(order_code or "")
+    if match:
+        code_year = 2000 + int(match.group(1))
+        chosen.extend(y for y, *_ in meta if y == code_year)
+    if created_from or created_to:
+        for year, _path, min_iso, max_iso in meta:
+            if created_from and max_iso[:10] < created_from[:10]:
+                continue
+            if created_to and min_iso[:10] > created_to[:10]:
+                continue
+            if year not in chosen:
+                chosen.append(year)
+    return _cap(sorted(chosen, reverse=True))
+
+
+def _cap(years: List[int]) -> List[int]:
+    """Os ``MAX_ATTACHED`` anos mais novos; os que ficam de fora são registrados (log e flight recorder)."""
+    if len(years) > MAX_ATTACHED:
+        detail = f"limite de {MAX_ATTACHED} arquivos anexados; fora da consulta: {', '.join(map(str, years[MAX_ATTACHED:]))}"
+        _logger.warning("Arquivo morto: %s", detail)
+        flight_recorder.record("db", "archive.years_dropped", ok=False, detail=detail)
+    return years[:MAX_ATTACHED]
+
+
+def attach(conn: sqlite3.Connection, years: Iterable[int]) -> List[str]:
+    """Anexa os arquivos dos ``years`` a ``conn`` e devolve os nomes de schema.
+
+    Deve ser chamado fora de transação (antes de qualquer escrita na conexão).
+    """
+    attached = {r[1] for r in conn.execute("PRAGMA database_list").fetchall()}
+    schemas: List[str] = []
+    for year in years:
+        name = schema_name(year)
+        if name not in attached:
+            path = archive_path(year)
+            if not path.is_file():
+                continue
+            conn.execute("ATTACH DATABASE ? AS " + name, (str(path),))
+        schemas.append(name)
+    return schemas
+
+
+# --------- Arquivamento ---------
+def cutoff_iso(months: int, now: Optional[datetime] = None) -> str:
+    """Data/hora ISO de ``months`` meses atrás (dia limitado ao fim do mês)."""
+    now = now or datetime.now(timezone.utc)
+    month_index = now.year * 12 + (now.month - 1) - int(months)
+    year, month = divmod(month_index, 12)
+    month += 1
+    days_in_month = [31, 29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28,
+                     31, 30, 31, 30, 31, 31, 30, 31, 30, 31][month - 1]
+    return now.replace(year=year, month=month, day=min(now.day, days_in_month)).isoformat()
+
+
+def archive_delivered(
+    months: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> Dict[int, List[str]]:
+    """Move pedidos entregues antes do corte para os arquivos anuais.
+
+    Cada lote é uma transação (arquivo + banco principal). Retorna os ids
+    movidos por ano. Não gera registros de sync: o remoto mantém o histórico.
+    """
+    cfg = app_settings.get_settings()
+    months = int(cfg.get("ARCHIVE_AFTER_MONTHS", 12) if months is None else months)
+    batch_size = max(1, int(cfg.get("ARCHIVE_BATCH_SIZE", 500) if batch_size is None else batch_size))
+    moved: Dict[int, List[str]] = {}
+    if months <= 0:
+        return moved
+    cutoff = cutoff_iso(months, now)
+    while True:
+        with sqldb.get_conn() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, CAST(substr(created_at_iso,1,4) AS INTEGER) FROM orders
+                WHERE status = 'entregue' AND delivered_at_iso IS NOT NULL AND delivered_at_iso < ?
+                ORDER BY created_at_iso
+                LIMIT ?
+                """,
+                (cutoff, batch_size),
+            ).fetchall()
+        if not rows:
+            return moved
+        by_year: Dict[int, List[str]] = {}
+        for oid, year in rows:
+            by_year.setdefault(int(year), []).append(oid)
+        for year, ids in by_year.items():
+            _archive_batch(year, ids)
+            moved.setdefault(year, []).extend(ids)
+
+
+def _detach(conn: sqlite3.Connection) -> None:
+    """Solta ``arch`` sem encobrir a exceção que interrompeu o lote.
+
+    Com a transação aberta o DETACH falha ("database arch is locked"): desfaz
+    antes; se ainda assim falhar, ``get_conn`` fecha a conexão de qualquer jeito.
+    """
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute("DETACH DATABASE arch")
+    except sqlite3.Error:
+        pass
+
+
+def _archive_batch(year: int, order_ids: List[str]) -> None:
+    path = archive_path(year)
+    _ensure_archive_file(path)
+    with sqldb.get_conn() as conn:
+        conn.execute("ATTACH DATABASE ? AS arch", (str(path),))
+        try:
+            sqldb._load_temp_ids(conn, order_ids)
+            selected = "(SELECT id FROM temp.op_ids)"
+            # Totais diários antes de remover (mesmos critérios dos relatórios)
+            conn.execute(
+                f"""
+                INSERT INTO rollup_orders_day (day, order_count, total_cents)
+                SELECT substr(created_at_iso,1,10), COUNT(*), SUM(total_cents)
+                FROM main.orders WHERE id IN {selected}
+                GROUP BY 1
+                ON CONFLICT(day) DO UPDATE SET
+                    order_count = order_count + excluded.order_count,
+                    total_cents = total_cents + excluded.total_cents
+                """
+            )
+            conn.execute(
+                f"""
+                INSERT INTO rollup_services_day (day, service_name, service_type, service_subtype, total_cents)
+                SELECT substr(o.created_at_iso,1,10), oi.service_name, oi.service_type,
+                       COALESCE(oi.service_subtype,''), SUM(oi.unit_price_cents * oi.quantity)
+                FROM main.order_items oi JOIN main.orders o ON o.id = oi.order_id
+                WHERE oi.order_id IN {selected}
+                GROUP BY 1, 2, 3, 4
+                ON CONFLICT(day, service_name, service_type, service_subtype) DO UPDATE SET
+                    total_cents = total_cents + excluded.total_cents
+                """
+            )
+            conn.execute(
+                f"""
+                INSERT INTO rollup_payments_day (day, amount_cents)
+                SELECT substr(created_at_iso,1,10), SUM(amount_cents)
+                FROM main.payments WHERE order_id IN {selected}
+                GROUP BY 1
+                ON CONFLICT(day) DO UPDATE SET amount_cents = amount_cents + excluded.amount_cents
+                """
+            )
+            for table, cols, key in (
+                ("orders", _ORDER_COLUMNS, "id"),
+                ("order_items", _ITEM_COLUMNS, "order_id"),
+                ("payments", _PAYMENT_COLUMNS, "order_id"),
+            ):
+                conn.execute(
+                    f"INSERT OR REPLACE INTO arch.{table} ({cols}) "
+                    f"SELECT {cols} FROM main.{table} WHERE {key} IN {selected}"
+                )
+            for table, key in (("order_items", "order_id"), ("payments", "order_id"), ("orders", "id")):
+                conn.execute(f"DELETE FROM main.{table} WHERE {key} IN {selected}")
+            span = conn.execute(
+                "SELECT MIN(created_at_iso), MAX(created_at_iso), COUNT(*) FROM arch.orders"
+            ).fetchone()
+            conn.execute(
+                """
+                INSERT INTO archive_meta (year, path, min_created_iso, max_created_iso, order_count, updated_at_iso)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(year) DO UPDATE SET
+                    path = excluded.path,
+                    min_created_iso = excluded.min_created_iso,
+                    max_created_iso = excluded.max_created_iso,
+                    order_count = excluded.order_count,
+                    updated_at_iso = excluded.updated_at_iso
+                """,
+                (year, str(path), span[0], span[1], int(span[2]), datetime.now(timezone.utc).isoformat()),
+            )
+            conn.commit()
+        finally:
+            _detach(conn)
+
+
+def rebuild_rollups() -> int:
+    """Recalcula ``rollup_*`` a partir dos arquivos existentes. Retorna quantos anos leu."""
+    with sqldb.get_conn() as conn:
+        years = [y for y, *_ in archived_years(conn)]
+    with sqldb.get_conn() as conn:
+        for table in ("rollup_orders_day", "rollup_services_day", "rollup_payments_day"):
+            conn.execute(f"DELETE FROM {table}")
+        conn.commit()
+    for year in years:
+        path = archive_path(year)
+        if not path.is_file():
+            continue
+        with sqldb.get_conn() as conn:
+            conn.execute("ATTACH DATABASE ? AS arch", (str(path),))
+            try:
+                conn.execute(
+                    """
+                    INSERT INTO rollup_orders_day (day, order_count, total_cents)
+                    SELECT substr(created_at_iso,1,10), COUNT(*), SUM(total_cents) FROM arch.orders GROUP BY 1
+                    ON CONFLICT(day) DO UPDATE SET
+                        order_count = order_count + excluded.order_count,
+                        total_cents = total_cents + excluded.total_cents
+                    """
+                )
+                conn.execute(
+                    """
+                    INSERT INTO rollup_services_day (day, service_name, service_type, service_subtype, total_cents)
+                    SELECT substr(o.created_at_iso,1,10), oi.service_name, oi.service_type,
+                           COALESCE(oi.service_subtype,''), SUM(oi.unit_price_cents * oi.quantity)
+                    FROM arch.order_items oi JOIN arch.orders o ON o.id = oi.order_id
+                    GROUP BY 1, 2, 3, 4
+                    ON CONFLICT(day, service_name, service_type, service_subtype) DO UPDATE SET
+                        total_cents = total_cents + excluded.total_cents
+                    """
+                )
+                conn.execute(
+                    """
+                    INSERT INTO rollup_payments_day (day, amount_cents)
+                    SELECT substr(created_at_iso,1,10), SUM(amount_cents) FROM arch.payments GROUP BY 1
+                    ON CONFLICT(day) DO UPDATE SET amount_cents = amount_cents + excluded.amount_cents
+                    """
+                )
+                conn.commit()
+            finally:
+                _detach(conn)
+    return len(years)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Arquiva pedidos entregues antigos.")
+    parser.add_argument("--months", type=int, default=None, help="idade mínima da entrega (padrão: ARCHIVE_AFTER_MONTHS)")
+    parser.add_argument("--rebuild-rollups", action="store_true", help="recalcula os totais dos arquivos")
+    args = parser.parse_args(argv)
+    sqldb.init_db()
+    if args.rebuild_rollups:
+        print(f"totais recalculados de {rebuild_rollups()} arquivo(s)")
+        return 0
+    moved = archive_delivered(args.months)
+    for year, ids in sorted(moved.items()):
+        print(f"{year}: {len(ids)} pedido(s) -> {archive_path(year)}")
+    if not moved:
+        print("nada a arquivar")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+"""Backup online do banco com a API de backup do SQLite.
+
+A cópia é feita em passos de ``BACKUP_PAGES_PER_STEP`` páginas com uma pausa
+entre eles, então o app continua lendo e gravando durante o backup. A cópia
+passa por ``PRAGMA integrity_check`` antes de ser compactada (gzip) e só então
+entra na rotação (``BACKUP_KEEP`` arquivos mais recentes).
+
+Cada execução fica registrada em ``maintenance_runs`` (tipo ``backup``) com
+duração, tamanho e vazão. Uso manual: ``python -m app.data.backup``.
+
+Para restaurar: feche o app, descompacte o ``.db.gz`` e substitua o ``DB_PATH``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from app.config import settings as app_settings
+from app.data import sqlite as sqldb
+
+KIND = "backup"
+SUFFIX = ".db.gz"
+# Escritas de outras conexões fazem a cópia em passos recomeçar do início; depois
+# de tantos recomeços, a cópia é feita num passo só (um snapshot, sem pausas)
+MAX_RESTARTS = 3
+
+
+class BackupError(RuntimeError):
+    pass
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+@dataclass
+class BackupResult:
+    path: str
+    started_at_iso: str
+    duration_s: float
+    db_bytes: int
+    gz_bytes: int
+    pages: int
+    throughput_bps: float
+    restarts: int
+    single_pass: bool
+    removed: List[str]
+
+
+def backup_dir() -> Path:
+    configured = app_settings.get_settings().get("BACKUP_DIR")
+    if configured:
+        return Path(configured)
+    return Path(sqldb.DB_PATH).resolve().parent / "backups"
+
+
+def list_backups(directory: Optional[Path] = None) -> List[Path]:
+    """Backups existentes, do mais novo ao mais antigo."""
+    directory = directory or backup_dir()
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob("*" + SUFFIX), reverse=True)
+
+
+def run_backup(
+    directory: Optional[Path] = None,
+    pages_per_step: Optional[int] = None,
+    step_sleep_ms: Optional[int] = None,
+    keep: Optional[int] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> BackupResult:
+    """Gera um snapshot verificado e compactado do banco principal."""
+    cfg = app_settings.get_settings()
+    directory = directory or backup_dir()
+    pages_per_step = max(1, int(cfg.get("BACKUP_PAGES_PER_STEP", 256) if pages_per_step is None else pages_per_step))
+    step_sleep = max(0, int(cfg.get("BACKUP_STEP_SLEEP_MS", 5) if step_sleep_ms is None else step_sleep_ms)) / 1000.0
+    keep = max(1, int(cfg.get("BACKUP_KEEP", 7) if keep is None else keep))
+
+    started = datetime.now(timezone.utc)
+    t0 = time.perf_counter()
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{Path(sqldb.DB_PATH).stem}-{started.strftime('%Y%m%d-%H%M%S')}"
+    tmp_path = directory / f"{stem}.db.part"
+    final_path = directory / f"{stem}{SUFFIX}"
+    total_pages = 0
+    restarts = 0
+    single_pass = False
+    last_remaining: Optional[int] = None
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        nonlocal total_pages, restarts, last_remaining
+        total_pages = total
+        if should_stop is not None and should_stop():
+            raise BackupError("backup interrompido")
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts > MAX_RESTARTS:
+                raise _TooManyRestarts()
+        last_remaining = remaining
+        # Pausa entre passos: libera o banco para as gravações do app
+        if remaining and step_sleep:
+            time.sleep(step_sleep)
+
+    try:
+        src = sqlite3.connect(sqldb.DB_PATH)
+        dst = sqlite3.connect(str(tmp_path))
+        try:
+            try:
+                src.backup(dst, pages=pages_per_step, progress=progress)
+            except _TooManyRestarts:
+                single_pass = True
+                src.backup(dst, pages=-1)
+            check = dst.execute("PRAGMA integrity_check").fetchall()
+        finally:
+            dst.close()
+            src.close()
+        if check != [("ok",)]:
+            raise BackupError(f"integrity_check falhou: {check[:5]}")
+        db_bytes = tmp_path.stat().st_size
+        with open(tmp_path, "rb") as fin, gzip.open(final_path, "wb", compresslevel=6) as fout:
+            shutil.copyfileobj(fin, fout, 1024 * 1024)
+    except Exception as exc:
+        for path in (tmp_path, final_path):
+            if path.exists():
+                path.unlink()
+        duration_ms = int((time.perf_counter() - t0) * 1000)
+        sqldb.record_maintenance_run(KIND, started.isoformat(), duration_ms, False, None, {"error": str(exc)})
+        raise
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    removed = _rotate(directory, keep)
+    duration = time.perf_counter() - t0
+    result = BackupResult(
+        path=str(final_path),
+        started_at_iso=started.isoformat(),
+        duration_s=round(duration, 3),
+        db_bytes=db_bytes,
+        gz_bytes=final_path.stat().st_size,
+        pages=total_pages,
+        throughput_bps=round(db_bytes / duration, 1) if duration > 0 else 0.0,
+        restarts=restarts,
+        single_pass=single_pass,
+        removed=removed,
+    )
+    sqldb.record_maintenance_run(KIND, result.started_at_iso, int(duration * 1000), True, db_bytes, asdict(result))
+    return result
+
+
+def _rotate(directory: Path, keep: int) -> List[str]:
+    removed: List[str] = []
+    for old in list_backups(directory)[keep:]:
+        try:
+            os.remove(old)
+            removed.append(old.name)
+        except OSError:
+            pass
+    return removed
+
+
+def backup_due(now: Optional[datetime] = None) -> bool:
+    """Há backup a fazer? (ligado e sem backup bem-sucedido dentro do intervalo)"""
+    cfg = app_settings.get_settings()
+    if not cfg.get("BACKUP_ENABLED", True):
+        return False
+    interval = timedelta(hours=float(cfg.get("BACKUP_INTERVAL_HOURS", 24)))
+    for run in sqldb.list_maintenance_runs(KIND, limit=10):
+        if run["ok"]:
+            last = datetime.fromisoformat(run["started_at_iso"])
+            return (now or datetime.now(timezone.utc)) - last >= interval
+    return True
+
+
+def run_if_due(should_stop: Optional[Callable[[], bool]] = None) -> Optional[BackupResult]:
+    """Ponto de entrada do agendador: roda o backup só quando estiver vencido."""
+    if not backup_due():
+        return None
+    return run_backup(should_stop=should_stop)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backup online do banco (API de backup do SQLite).")
+    parser.add_argument("--dir", default=None, help="pasta de destino (padrão: BACKUP_DIR)")
+    args = parser.parse_args(argv)
+    sqldb.init_db()
+    result = run_backup(Path(args.dir) if args.dir else None)
+    print(
+        f"{result.path}: {result.db_bytes} bytes -> {result.gz_bytes} compactado, "
+        f"{result.duration_s:.2f}s ({result.throughput_bps / 1e6:.1f} MB/s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,266 @@
+"""Manutenção do banco: ``PRAGMA optimize``, ``ANALYZE`` e ``incremental_vacuum``.
+
+Roda numa thread do agendador (``PeriodicJob`` no ``main.py``) e só quando o
+app não usa o banco há ``MAINTENANCE_IDLE_SECONDS``. Cada etapa é curta:
+
+- ``optimize``: ``PRAGMA optimize`` com ``analysis_limit`` (a cada
+  ``MAINTENANCE_OPTIMIZE_HOURS``);
+- ``analyze``: ``ANALYZE`` amostrado, para o planejador conhecer as tabelas de
+  pedidos/itens/pagamentos (a cada ``MAINTENANCE_ANALYZE_DAYS``);
+- ``vacuum``: ``incremental_vacuum`` em passos de
+  ``MAINTENANCE_VACUUM_PAGES_PER_STEP`` páginas, cada passo na sua própria
+  transação, até acabar o orçamento ``MAINTENANCE_VACUUM_BUDGET_MS``.
+
+O ``incremental_vacuum`` exige ``auto_vacuum=INCREMENTAL``. Bancos novos já
+nascem assim (``init_db``); bancos antigos são convertidos com um VACUUM
+completo, automático só até ``CONVERT_MAX_BYTES`` (acima disso, pela linha de
+comando: ``python -m app.data.maintenance --convert``).
+
+Cada etapa fica registrada em ``maintenance_runs`` com duração e bytes
+devolvidos ao sistema; a aba "Manutenção" das Configurações mostra o histórico.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from app.config import settings as app_settings
+from app.data import sqlite as sqldb
+
+KIND_OPTIMIZE = "optimize"
+KIND_ANALYZE = "analyze"
+KIND_VACUUM = "vacuum"
+
+ANALYSIS_LIMIT = 1000  # linhas amostradas por índice no ANALYZE
+MIN_FREE_PAGES = 64  # abaixo disso não vale a pena rodar o vacuum
+CONVERT_MAX_BYTES = 64 * 1024 * 1024
+STEP_PAUSE_S = 0.01  # folga entre passos do vacuum para as gravações do app
+
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass
+class FileStats:
+    page_size: int
+    page_count: int
+    freelist_count: int
+    auto_vacuum: int
+
+    @property
+    def file_bytes(self) -> int:
+        return self.page_size * self.page_count
+
+    @property
+    def free_bytes(self) -> int:
+        return self.page_size * self.freelist_count
+
+
+@dataclass
+class MaintenanceResult:
+    ran: List[str] = field(default_factory=list)
+    reclaimed_bytes: int = 0
+    skipped: Optional[str] = None
+
+
+def _connect() -> sqlite3.Connection:
+    # Conexão própria em autocommit: cada PRAGMA é uma transação curta
+    return sqlite3.connect(sqldb.DB_PATH, isolation_level=None)
+
+
+def file_stats(conn: Optional[sqlite3.Connection] = None) -> FileStats:
+    own = conn is None
+    conn = conn or _connect()
+    try:
+        return FileStats(
+            page_size=int(conn.execute("PRAGMA page_size").fetchone()[0]),
+            page_count=int(conn.execute("PRAGMA page_count").fetchone()[0]),
+            freelist_count=int(conn.execute("PRAGMA freelist_count").fetchone()[0]),
+            auto_vacuum=int(conn.execute("PRAGMA auto_vacuum").fetchone()[0]),
+        )
+    finally:
+        if own:
+            conn.close()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _record(kind: str, started: datetime, t0: float, ok: bool, bytes_: Optional[int], detail: Dict) -> None:
+    duration_ms = int((time.perf_counter() - t0) * 1000)
+    sqldb.record_maintenance_run(kind, started.isoformat(), duration_ms, ok, bytes_, detail)
+
+
+def run_optimize() -> None:
+    started, t0 = _now(), time.perf_counter()
+    conn = _connect()
+    try:
+        conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        conn.execute("PRAGMA optimize").fetchall()
+    except sqlite3.Error as exc:
+        _record(KIND_OPTIMIZE, started, t0, False, None, {"error": str(exc)})
+        raise
+    finally:
+        conn.close()
+    _record(KIND_OPTIMIZE, started, t0, True, None, {})
+
+
+def run_analyze() -> None:
+    """``ANALYZE`` amostrado: com ``analysis_limit`` o custo não cresce com o banco."""
+    started, t0 = _now(), time.perf_counter()
+    conn = _connect()
+    try:
+        conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        conn.execute("ANALYZE")
+    except sqlite3.Error as exc:
+        _record(KIND_ANALYZE, started, t0, False, None, {"error": str(exc)})
+        raise
+    finally:
+        conn.close()
+    _record(KIND_ANALYZE, started, t0, True, None, {})
+
+
+def run_incremental_vacuum(
+    budget_ms: Optional[int] = None,
+    pages_per_step: Optional[int] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> int:
+    """Devolve páginas livres ao sistema dentro do orçamento. Retorna bytes liberados."""
+    cfg = app_settings.get_settings()
+    budget_s = max(1, int(cfg.get("MAINTENANCE_VACUUM_BUDGET_MS", 500) if budget_ms is None else budget_ms)) / 1000.0
+    step = max(1, int(cfg.get("MAINTENANCE_VACUUM_PAGES_PER_STEP", 128) if pages_per_step is None else pages_per_step))
+
+    started, t0 = _now(), time.perf_counter()
+    conn = _connect()
+    try:
+        before = file_stats(conn)
+        if before.auto_vacuum != _AUTO_VACUUM_INCREMENTAL:
+            conn.close()
+            return 0
+        steps = 0
+        activity = sqldb.last_activity()
+        while conn.execute("PRAGMA freelist_count").fetchone()[0] > 0:
+            if time.perf_counter() - t0 >= budget_s:
+                break
+            if should_stop is not None and should_stop():
+                break
+            # O app voltou a usar o banco: para e tenta de novo na próxima rodada
+            if sqldb.last_activity() != activity:
+                break
+            # executescript() roda o PRAGMA até o fim; execute() liberaria uma página só
+            conn.executescript(f"PRAGMA incremental_vacuum({step})")
+            steps += 1
+            time.sleep(STEP_PAUSE_S)
+        after = file_stats(conn)
+    except sqlite3.Error as exc:
+        conn.close()
+        _record(KIND_VACUUM, started, t0, False, None, {"error": str(exc)})
+        raise
+    conn.close()
+    reclaimed = max(0, before.file_bytes - after.file_bytes)
+    _record(
+        KIND_VACUUM,
+        started,
+        t0,
+        True,
+        reclaimed,
+        {"steps": steps, "free_pages_before": before.freelist_count, "free_pages_after": after.freelist_count},
+    )
+    return reclaimed
+
+
+def convert_to_incremental() -> int:
+    """Liga ``auto_vacuum=INCREMENTAL`` num banco antigo (VACUUM completo). Retorna bytes liberados."""
+    started, t0 = _now(), time.perf_counter()
+    conn = _connect()
+    try:
+        before = file_stats(conn)
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        after = file_stats(conn)
+    except sqlite3.Error as exc:
+        conn.close()
+        _record(KIND_VACUUM, started, t0, False, None, {"full": True, "error": str(exc)})
+        raise
+    conn.close()
+    reclaimed = max(0, before.file_bytes - after.file_bytes)
+    _record(KIND_VACUUM, started, t0, True, reclaimed, {"full": True, "free_pages_before": before.freelist_count})
+    return reclaimed
+
+
+def _last_ok(kind: str) -> Optional[datetime]:
+    for run in sqldb.list_maintenance_runs(kind, limit=10):
+        if run["ok"]:
+            return datetime.fromisoformat(run["started_at_iso"])
+    return None
+
+
+def _due(kind: str, interval: timedelta, now: datetime) -> bool:
+    last = _last_ok(kind)
+    return last is None or now - last >= interval
+
+
+def run_if_idle(should_stop: Optional[Callable[[], bool]] = None, now: Optional[datetime] = None) -> MaintenanceResult:
+    """Ponto de entrada do agendador: roda as etapas vencidas se o banco estiver ocioso."""
+    cfg = app_settings.get_settings()
+    result = MaintenanceResult()
+    if not cfg.get("MAINTENANCE_ENABLED", True):
+        result.skipped = "desligada"
+        return result
+    if sqldb.idle_seconds() < float(cfg.get("MAINTENANCE_IDLE_SECONDS", 120)):
+        result.skipped = "banco em uso"
+        return result
+    now = now or _now()
+
+    if _due(KIND_ANALYZE, timedelta(days=float(cfg.get("MAINTENANCE_ANALYZE_DAYS", 7))), now):
+        run_analyze()
+        result.ran.append(KIND_ANALYZE)
+    elif _due(KIND_OPTIMIZE, timedelta(hours=float(cfg.get("MAINTENANCE_OPTIMIZE_HOURS", 6))), now):
+        # ANALYZE recém-feito já deixa as estatísticas em dia
+        run_optimize()
+        result.ran.append(KIND_OPTIMIZE)
+    if should_stop is not None and should_stop():
+        return result
+
+    stats = file_stats()
+    if stats.freelist_count < MIN_FREE_PAGES:
+        return result
+    if stats.auto_vacuum != _AUTO_VACUUM_INCREMENTAL:
+        if stats.file_bytes <= CONVERT_MAX_BYTES:
+            result.reclaimed_bytes += convert_to_incremental()
+            result.ran.append(KIND_VACUUM)
+        return result
+    result.reclaimed_bytes += run_incremental_vacuum(should_stop=should_stop)
+    result.ran.append(KIND_VACUUM)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manutenção do banco (optimize, ANALYZE, incremental_vacuum).")
+    parser.add_argument("--convert", action="store_true", help="ativa auto_vacuum=INCREMENTAL com um VACUUM completo")
+    parser.add_argument("--budget-ms", type=int, default=None, help="orçamento do incremental_vacuum")
+    args = parser.parse_args(argv)
+    sqldb.init_db()
+    before = os.path.getsize(sqldb.DB_PATH)
+    if args.convert:
+        convert_to_incremental()
+    run_analyze()
+    run_optimize()
+    run_incremental_vacuum(budget_ms=args.budget_ms)
+    stats = file_stats()
+    print(
+        f"{sqldb.DB_PATH}: {before} -> {os.path.getsize(sqldb.DB_PATH)} bytes, "
+        f"{stats.freelist_count} páginas livres, auto_vacuum={stats.auto_vacuum}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+"""Instrumentação opcional das consultas feitas via ``get_conn``.
+
+Desligada por padrão. Liga com ``DB_PROFILE_ENABLED`` nas configurações, com a
+variável de ambiente ``MYRTHES_DB_PROFILE=1`` ou, em tempo de execução, com
+``set_enabled(True)``. Desligada, ``get_conn`` só testa ``ENABLED`` e abre a
+conexão comum do ``sqlite3``.
+
+Ligada, cada conexão de ``get_conn`` mede:
+
+- por comando SQL: tempo total (execução + leitura das linhas), linhas lidas e
+  tempo esperando trava de outra conexão. A conexão é aberta com
+  ``timeout=0`` e a espera é feita aqui, com a mesma duração máxima do padrão
+  do ``sqlite3``, para essa parcela ser medida à parte;
+- por bloco ``with get_conn()``: tempo total no histograma ``db.<função>``
+  (``app.utils.metrics``), com a função de ``app.data`` que abriu a conexão.
+
+Comandos acima de ``DB_SLOW_QUERY_MS`` vão para o log de consultas lentas
+(``logs/slow_queries.log`` ao lado do banco, uma linha JSON por comando) com
+o ``EXPLAIN QUERY PLAN``, a função chamadora, a origem fora da camada de dados
+(view/controlador) e a thread. As últimas entradas ficam em ``recent_slow()``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from app.config import settings as app_settings
+from app.utils import metrics
+
+_cfg = app_settings.get_settings()
+ENABLED: bool = bool(_cfg.get("DB_PROFILE_ENABLED")) or os.environ.get("MYRTHES_DB_PROFILE") == "1"
+SLOW_MS: float = float(_cfg.get("DB_SLOW_QUERY_MS", 200))
+BUSY_TIMEOUT_S = 5.0  # o mesmo padrão de sqlite3.connect
+MAX_SQL_CHARS = 2000
+
+_recent_slow: Deque[Dict[str, Any]] = deque(maxlen=100)
+_logger = logging.getLogger("myrthes.slow_queries")
+_logger.propagate = False
+_log_lock = threading.Lock()
+_SKIP_FILES = {contextlib.__file__, __file__}
+
+
+def set_enabled(on: bool, slow_ms: Optional[float] = None) -> None:
+    global ENABLED, SLOW_MS
+    ENABLED = bool(on)
+    if slow_ms is not None:
+        SLOW_MS = float(slow_ms)
+
+
+def recent_slow() -> List[Dict[str, Any]]:
+    """Consultas lentas mais recentes primeiro."""
+    return list(reversed(_recent_slow))
+
+
+class _Statement:
+    __slots__ = ("sql", "params", "seconds", "lock_wait", "rows")
+
+    def __init__(self, sql: str, params: Any) -> None:
+        self.sql = sql
+        self.params = params
+        self.seconds = 0.0
+        self.lock_wait = 0.0
+        self.rows = 0
+
+
+def _is_busy(exc: sqlite3.OperationalError) -> bool:
+    msg = str(exc)
+    return "locked" in msg or "busy" in msg
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    _stmt: Optional[_Statement] = None
+
+    def _run(self, method, sql: str, params: Any, record_params: Any):
+        conn: ProfiledConnection = self.connection  # type: ignore[assignment]
+        stmt = _Statement(sql, record_params)
+        conn._statements.append(stmt)
+        self._stmt = stmt
+        t0 = time.perf_counter()
+        try:
+            return conn._retry_busy(lambda: method(self, sql, params), stmt)
+        finally:
+            stmt.seconds += time.perf_counter() - t0
+
+    def execute(self, sql: str, parameters: Any = ()):  # type: ignore[override]
+        return self._run(sqlite3.Cursor.execute, sql, parameters, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any):  # type: ignore[override]
+        # Um gerador se esgota na primeira tentativa; a repetição em _retry_busy precisa da lista
+        return self._run(sqlite3.Cursor.executemany, sql, list(seq_of_parameters), None)
+
+    def _timed_fetch(self, fetch, *args):
+        t0 = time.perf_counter()
+        rows = fetch(self, *args)
+        if self._stmt is not None:
+            self._stmt.seconds += time.perf_counter() - t0
+            if isinstance(rows, list):
+                self._stmt.rows += len(rows)
+            elif rows is not None:
+                self._stmt.rows += 1
+        return rows
+
+    def fetchone(self):  # type: ignore[override]
+        return self._timed_fetch(sqlite3.Cursor.fetchone)
+
+    def fetchmany(self, size: int = 1):  # type: ignore[override]
+        return self._timed_fetch(sqlite3.Cursor.fetchmany, size)
+
+    def fetchall(self):  # type: ignore[override]
+        return self._timed_fetch(sqlite3.Cursor.fetchall)
+
+    def __next__(self):
+        return self._timed_fetch(sqlite3.Cursor.__next__)
+
+
+class ProfiledConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._statements: List[_Statement] = []
+        self._db_path = str(args[0]) if args else str(kwargs.get("database", ""))
+        self._started = time.perf_counter()
+
+    def _retry_busy(self, call, stmt: Optional[_Statement]):
+        """Repete ``call`` enquanto o banco estiver travado, até ``BUSY_TIMEOUT_S``."""
+        waited, delay = 0.0, 0.001
+        while True:
+            try:
+                return call()
+            except sqlite3.OperationalError as exc:
+                if not _is_busy(exc) or waited >= BUSY_TIMEOUT_S:
+                    raise
+            time.sleep(delay)
+            waited += delay
+            if stmt is not None:
+                stmt.lock_wait += delay
+            delay = min(delay * 2, 0.05)
+
+    def cursor(self, factory=ProfiledCursor):  # type: ignore[override]
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()):  # type: ignore[override]
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any):  # type: ignore[override]
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self) -> None:  # type: ignore[override]
+        if not self.in_transaction:
+            return
+        stmt = _Statement("COMMIT", None)
+        self._statements.append(stmt)
+        t0 = time.perf_counter()
+        try:
+            self._retry_busy(lambda: sqlite3.Connection.commit(self), stmt)
+        finally:
+            stmt.seconds += time.perf_counter() - t0
+
+
+def connect(path: str) -> ProfiledConnection:
+    return sqlite3.connect(path, timeout=0, factory=ProfiledConnection)  # type: ignore[return-value]
+
+
+def _callers() -> tuple[str, Optional[str]]:
+    """(função da camada de dados que abriu a conexão, primeira função fora dela)."""
+    frame = sys._getframe(2)
+    caller: Optional[str] = None
+    depth = 0
+    while frame is not None and depth < 40:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "")
+        if code.co_filename not in _SKIP_FILES and code.co_name != "get_conn":
+            label = code.co_name if module == "app.data.sqlite" else f"{module.rsplit('.', 1)[-1]}.{code.co_name}"
+            if caller is None:
+                caller = label
+            if not module.startswith("app.data"):
+                return caller, label
+        frame = frame.f_back
+        depth += 1
+    return caller or "?", None
+
+
+def finish(conn: ProfiledConnection) -> None:
+    """Registra as medições de ``conn`` (chamada por ``get_conn`` antes de fechar)."""
+    try:
+        wall_ms = (time.perf_counter() - conn._started) * 1000
+        caller, origin = _callers()
+        metrics.histogram(f"db.{caller}").observe(wall_ms)
+        for stmt in conn._statements:
+            if stmt.seconds * 1000 >= SLOW_MS:
+                _log_slow(conn, stmt, caller, origin)
+    except Exception:
+        # A instrumentação nunca pode derrubar a consulta do app
+        pass
+
+
+def _query_plan(conn: sqlite3.Connection, stmt: _Statement) -> List[str]:
+    if stmt.sql == "COMMIT" or stmt.params is None:
+        return []
+    try:
+        rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + stmt.sql, stmt.params).fetchall()
+    except sqlite3.Error as exc:
+        return [f"indisponível: {exc}"]
+    return [str(r[-1]) for r in rows]
+
+
+def _log_slow(conn: ProfiledConnection, stmt: _Statement, caller: str, origin: Optional[str]) -> None:
+    entry = {
+        "at": datetime.now(timezone.utc).isoformat(),
+        "caller": caller,
+        "origin": origin,
+        "thread": threading.current_thread().name,
+        "ms": round(stmt.seconds * 1000, 2),
+        "lock_wait_ms": round(stmt.lock_wait * 1000, 2),
+        "rows": stmt.rows,
+        "sql": " ".join(stmt.sql.split())[:MAX_SQL_CHARS],
+        "plan": _query_plan(conn, stmt),
+    }
+    _recent_slow.append(entry)
+    with _log_lock:
+        if not _logger.handlers:
+            log_dir = Path(conn._db_path).resolve().parent / "logs"
+            log_dir.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(log_dir / "slow_queries.log", maxBytes=1024 * 1024, backupCount=3, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger.addHandler(handler)
+            _logger.setLevel(logging.INFO)
+    _logger.info(json.dumps(entry, ensure_ascii=False))
@@ -1,29 +1,109 @@
 from __future__ import annotations
 
+import json
 import sqlite3
-from contextlib import contextmanager
-from typing import Generator, List, Optional, Tuple
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple, Union
 from uuid import uuid4
 
 from app.config.settings import DB_PATH
+from app.data import profiling
+from app.data.sync_codec import encode_payload
 from app.models.client import Client
-from app.models.order import Order, OrderItem
+from app.models.order import Order, OrderItem, Payment
 from app.models.service import Service
+from app.utils import tracing
+
+
+# Tabelas de pedidos; também usadas para criar os arquivos de arquivo morto (app.data.archive)
+ORDER_TABLES_DDL: Tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS orders (
+        id TEXT PRIMARY KEY,
+        client_id TEXT NOT NULL,
+        created_at_iso TEXT NOT NULL,
+        status TEXT NOT NULL,
+        total_cents INTEGER NOT NULL,
+        due_date_iso TEXT,
+        delivered_at_iso TEXT,
+        order_code TEXT,
+        FOREIGN KEY(client_id) REFERENCES clients(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS order_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_id TEXT NOT NULL,
+        service_name TEXT NOT NULL,
+        service_type TEXT NOT NULL,
+        service_subtype TEXT,
+        unit_price_cents INTEGER NOT NULL,
+        quantity INTEGER NOT NULL,
+        FOREIGN KEY(order_id) REFERENCES orders(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS payments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_id TEXT NOT NULL,
+        amount_cents INTEGER NOT NULL,
+        method TEXT,
+        note TEXT,
+        created_at_iso TEXT NOT NULL,
+        FOREIGN KEY(order_id) REFERENCES orders(id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items(order_id)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_order ON payments(order_id)",
+)
+
+
+# Último uso do banco pelo app (relógio monotônico); a manutenção só roda com o banco ocioso
+_last_activity = time.monotonic()
 
 
 @contextmanager
-def get_conn() -> Generator[sqlite3.Connection, None, None]:
-    conn = sqlite3.connect(DB_PATH)
-    try:
-        yield conn
-        conn.commit()
-    finally:
-        conn.close()
+def get_conn(track_activity: bool = True) -> Generator[sqlite3.Connection, None, None]:
+    """Conexão com commit ao sair.
+
+    ``track_activity=False``: não conta como uso do banco em ``idle_seconds``
+    (consultas periódicas em segundo plano, como a da fila de impressão).
+    """
+    global _last_activity
+    # Instrumentação opcional (app.data.profiling); desligada custa só este teste
+    profiled = profiling.ENABLED
+    # Trecho db.<função> no rastreamento (app.utils.tracing), se ligado
+    span = tracing.span(f"db.{tracing.caller_name(3)}") if tracing.ENABLED else nullcontext()
+    with span:
+        conn = profiling.connect(DB_PATH) if profiled else sqlite3.connect(DB_PATH)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            if profiled:
+                profiling.finish(conn)
+            conn.close()
+            if track_activity:
+                _last_activity = time.monotonic()
+
+
+def last_activity() -> float:
+    """Instante (``time.monotonic``) do último uso do banco via ``get_conn``."""
+    return _last_activity
+
+
+def idle_seconds() -> float:
+    return time.monotonic() - _last_activity
 
 
 def init_db() -> None:
     with get_conn() as conn:
         cur = conn.cursor()
+        # Bancos novos devolvem páginas livres aos poucos (app.data.maintenance);
+        # em bancos já existentes não tem efeito até um VACUUM completo
+        cur.execute("PRAGMA auto_vacuum = INCREMENTAL")
         # Serviços
         cur.execute(
             """
@@ -50,73 +130,107 @@ def init_db() -> None:
         )
         cur.execute("CREATE INDEX IF NOT EXISTS idx_clients_name ON clients(name)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_clients_phone ON clients(phone)")
-        # Pedidos
+        # Pedidos, itens e pagamentos (índices por pedido evitam varrer itens/pagamentos)
+        for ddl in ORDER_TABLES_DDL:
+            cur.execute(ddl)
+        # Fila de sync
         cur.execute(
             """
-            CREATE TABLE IF NOT EXISTS orders (
+            CREATE TABLE IF NOT EXISTS sync_queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                entity TEXT NOT NULL,
+                action TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        # Estoque básico
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS inventory (
                 id TEXT PRIMARY KEY,
-                client_id TEXT NOT NULL,
-                created_at_iso TEXT NOT NULL,
-                status TEXT NOT NULL,
-                total_cents INTEGER NOT NULL,
-                due_date_iso TEXT,
-                delivered_at_iso TEXT,
-                order_code TEXT,
-                FOREIGN KEY(client_id) REFERENCES clients(id)
+                name TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                quantity INTEGER NOT NULL
             )
             """
         )
+        # Arquivo morto (app.data.archive): anos arquivados e totais diários do que saiu
+        # das tabelas quentes, para que relatórios não precisem abrir os arquivos
         cur.execute(
             """
-            CREATE TABLE IF NOT EXISTS order_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                order_id TEXT NOT NULL,
+            CREATE TABLE IF NOT EXISTS archive_meta (
+                year INTEGER PRIMARY KEY,
+                path TEXT NOT NULL,
+                min_created_iso TEXT NOT NULL,
+                max_created_iso TEXT NOT NULL,
+                order_count INTEGER NOT NULL DEFAULT 0,
+                updated_at_iso TEXT NOT NULL
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rollup_orders_day (
+                day TEXT PRIMARY KEY,
+                order_count INTEGER NOT NULL,
+                total_cents INTEGER NOT NULL
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rollup_services_day (
+                day TEXT NOT NULL,
                 service_name TEXT NOT NULL,
                 service_type TEXT NOT NULL,
-                service_subtype TEXT,
-                unit_price_cents INTEGER NOT NULL,
-                quantity INTEGER NOT NULL,
-                FOREIGN KEY(order_id) REFERENCES orders(id)
+                service_subtype TEXT NOT NULL,
+                total_cents INTEGER NOT NULL,
+                PRIMARY KEY (day, service_name, service_type, service_subtype)
             )
             """
         )
-        # Fila de sync
         cur.execute(
             """
-            CREATE TABLE IF NOT EXISTS sync_queue (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                entity TEXT NOT NULL,
-                action TEXT NOT NULL,
-                payload TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            CREATE TABLE IF NOT EXISTS rollup_payments_day (
+                day TEXT PRIMARY KEY,
+                amount_cents INTEGER NOT NULL
             )
             """
         )
-        # Pagamentos (registro simples de entradas)
+        # Histórico de tarefas de manutenção (backup, ANALYZE, vacuum etc.)
         cur.execute(
             """
-            CREATE TABLE IF NOT EXISTS payments (
+            CREATE TABLE IF NOT EXISTS maintenance_runs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                order_id TEXT NOT NULL,
-                amount_cents INTEGER NOT NULL,
-                method TEXT,
-                note TEXT,
-                created_at_iso TEXT NOT NULL,
-                FOREIGN KEY(order_id) REFERENCES orders(id)
+                kind TEXT NOT NULL,
+                started_at_iso TEXT NOT NULL,
+                duration_ms INTEGER NOT NULL,
+                bytes INTEGER,
+                ok INTEGER NOT NULL,
+                detail TEXT
             )
             """
         )
-        # Estoque básico
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_maintenance_runs_kind ON maintenance_runs(kind, started_at_iso)")
+        # Fila de impressão (app.utils.print_spooler); sobrevive a reinícios do app
         cur.execute(
             """
-            CREATE TABLE IF NOT EXISTS inventory (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                unit TEXT NOT NULL,
-                quantity INTEGER NOT NULL
+            CREATE TABLE IF NOT EXISTS print_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at_iso TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                payload TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                finished_at_iso TEXT,
+                latency_ms INTEGER
             )
             """
         )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_print_jobs_status ON print_jobs(status, next_attempt_at)")
         conn.commit()
 
 
@@ -169,6 +283,15 @@ def list_services(include_inactive: bool = False) -> List[Service]:
         ]
 
 
+def recent_item_services(limit: int = 200) -> List[Tuple[str, str, Optional[str]]]:
+    """(nome, tipo, subtipo) dos itens de pedido mais recentes, do mais novo ao mais antigo."""
+    with get_conn() as conn:
+        return conn.execute(
+            "SELECT service_name, service_type, service_subtype FROM order_items ORDER BY id DESC LIMIT ?",
+            (int(limit),),
+        ).fetchall()
+
+
 def update_service_price(service: Service, new_price_cents: int) -> None:
     with get_conn() as conn:
         conn.execute(
@@ -204,6 +327,28 @@ def upsert_client(client: Client) -> Client:
     return Client(id=cid, name=client.name, phone=client.phone, notes=client.notes)
 
 
+def upsert_clients(clients: Iterable[Client]) -> List[Client]:
+    """Grava vários clientes numa única transação, já com os registros de sync."""
+    saved = [
+        Client(id=c.id or f"local:client:{uuid4()}", name=c.name, phone=c.phone, notes=c.notes)
+        for c in clients
+    ]
+    with get_conn() as conn:
+        conn.executemany(
+            """
+            INSERT INTO clients (id, name, phone, notes)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                name=excluded.name,
+                phone=excluded.phone,
+                notes=excluded.notes
+            """,
+            [(c.id, c.name, c.phone, c.notes) for c in saved],
+        )
+        _enqueue_sync_many(conn, "client", "upsert", (c.__dict__ for c in saved))
+    return saved
+
+
 def list_clients() -> List[Client]:
     with get_conn() as conn:
         rows = conn.execute("SELECT id, name, phone, notes FROM clients ORDER BY name ASC").fetchall()
@@ -285,26 +430,79 @@ def create_order(order: Order) -> Order:
     )
 
 
-def update_order_status(order_id: str, status: str, delivered_at_iso: Optional[str]) -> None:
+def _load_temp_ids(conn: sqlite3.Connection, ids: Iterable[str]) -> None:
+    """Carrega ``ids`` na tabela temporária ``temp.op_ids`` (por conexão) para joins."""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS op_ids (id TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.op_ids")
+    conn.executemany("INSERT OR IGNORE INTO temp.op_ids (id) VALUES (?)", ((str(i),) for i in ids))
+
+
+def update_orders_status(order_ids: Iterable[str], status: str, delivered_at_iso: Optional[str]) -> List[str]:
+    """Atualiza o status de vários pedidos numa única transação.
+
+    Grava também um registro de sync ``order/update_status`` por pedido. Retorna
+    os ids que existiam (os demais são ignorados).
+    """
     with get_conn() as conn:
+        _load_temp_ids(conn, order_ids)
+        found = [r[0] for r in conn.execute(
+            "SELECT o.id FROM orders o JOIN temp.op_ids t ON t.id = o.id"
+        ).fetchall()]
+        if not found:
+            return []
         conn.execute(
-            "UPDATE orders SET status = ?, delivered_at_iso = ? WHERE id = ?",
-            (status, delivered_at_iso, order_id),
+            "UPDATE orders SET status = ?, delivered_at_iso = ? WHERE id IN (SELECT id FROM temp.op_ids)",
+            (status, delivered_at_iso),
         )
+        _enqueue_sync_many(conn, "order", "update_status", (
+            {"id": oid, "status": status, "delivered_at_iso": delivered_at_iso} for oid in found
+        ))
+        return found
 
 
-def delete_order(order_id: str) -> None:
-    """Remove pedido, itens e pagamentos relacionados."""
-    with get_conn() as conn:
-        conn.execute("DELETE FROM order_items WHERE order_id = ?", (order_id,))
-        conn.execute("DELETE FROM payments WHERE order_id = ?", (order_id,))
-        conn.execute("DELETE FROM orders WHERE id = ?", (order_id,))
+def delete_orders(order_ids: Iterable[str]) -> List[str]:
+    """Remove vários pedidos (com itens e pagamentos) numa única transação.
 
+    Grava um registro de sync ``order/delete`` por pedido removido e retorna seus ids.
+    """
+    with get_conn() as conn:
+        _load_temp_ids(conn, order_ids)
+        found = [r[0] for r in conn.execute(
+            "SELECT o.id FROM orders o JOIN temp.op_ids t ON t.id = o.id"
+        ).fetchall()]
+        if not found:
+            return []
+        conn.execute("DELETE FROM order_items WHERE order_id IN (SELECT id FROM temp.op_ids)")
+        conn.execute("DELETE FROM payments WHERE order_id IN (SELECT id FROM temp.op_ids)")
+        conn.execute("DELETE FROM orders WHERE id IN (SELECT id FROM temp.op_ids)")
+        _enqueue_sync_many(conn, "order", "delete", ({"id": oid} for oid in found))
+        return found
+
+
+def list_orders(
+    status: Optional[str] = None,
+    client_query: Optional[str] = None,
+    order_code_query: Optional[str] = None,
+    ids: Optional[Iterable[str]] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    include_archived: bool = False,
+) -> List[Tuple[str, str, str, str, int, Optional[str]]]:
+    """Retorna lista de pedidos: (id, order_code, client_name, status, total_cents, due_date_iso).
+
+    ``ids`` restringe a consulta a esses pedidos (atualização pontual de linhas na view).
+    ``created_from``/``created_to`` (AAAA-MM-DD) filtram pela data de criação. Os
+    arquivos de arquivo morto só são anexados quando o intervalo, o código do
+    pedido ou ``include_archived`` chegam até eles (ver app.data.archive).
+    """
+    from app.data import archive
 
-def list_orders(status: Optional[str] = None, client_query: Optional[str] = None, order_code_query: Optional[str] = None) -> List[Tuple[str, str, str, str, int, Optional[str]]]:
-    """Retorna lista de pedidos: (id, order_code, client_name, status, total_cents, due_date_iso)."""
     where = []
     params: List[object] = []
+    if ids is not None:
+        # Um único parâmetro JSON evita o limite de variáveis do SQLite
+        where.append("o.id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(list(ids)))
     if status and status != "todos":
         where.append("o.status = ?")
         params.append(status)
@@ -315,30 +513,46 @@ def list_orders(status: Optional[str] = None, client_query: Optional[str] = None
     if order_code_query:
         where.append("o.order_code LIKE ?")
         params.append(f"%{order_code_query}%")
-    sql = (
-        "SELECT o.id, o.order_code, COALESCE(c.name,''), o.status, o.total_cents, o.due_date_iso "
-        "FROM orders o LEFT JOIN clients c ON c.id = o.client_id"
-    )
-    if where:
-        sql += " WHERE " + " AND ".join(where)
-    sql += " ORDER BY o.created_at_iso DESC"
+    if created_from:
+        where.append("substr(o.created_at_iso,1,10) >= ?")
+        params.append(created_from[:10])
+    if created_to:
+        where.append("substr(o.created_at_iso,1,10) <= ?")
+        params.append(created_to[:10])
     with get_conn() as conn:
+        years = archive.years_for(conn, created_from, created_to, order_code_query, include_archived)
+        schemas = archive.attach(conn, years)
+        source = "main.orders"
+        if schemas:
+            cols = "id, order_code, client_id, status, total_cents, due_date_iso, created_at_iso"
+            source = "(" + " UNION ALL ".join(
+                f"SELECT {cols} FROM {schema}.orders" for schema in ["main", *schemas]
+            ) + ")"
+        sql = (
+            "SELECT o.id, o.order_code, COALESCE(c.name,''), o.status, o.total_cents, o.due_date_iso "
+            f"FROM {source} o LEFT JOIN main.clients c ON c.id = o.client_id"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY o.created_at_iso DESC"
         rows = conn.execute(sql, params).fetchall()
         return [(r[0], r[1], r[2], r[3], int(r[4]), r[5]) for r in rows]
 
 
 def get_order_with_items(order_id: str) -> Optional[Tuple[Order, List[OrderItem]]]:
+    from app.data import archive
+
     with get_conn() as conn:
-        row = conn.execute(
-            "SELECT id, client_id, created_at_iso, status, total_cents, due_date_iso, delivered_at_iso, order_code FROM orders WHERE id = ?",
-            (order_id,),
-        ).fetchone()
-        if not row:
-            return None
-        items_rows = conn.execute(
-            "SELECT service_name, service_type, service_subtype, unit_price_cents, quantity FROM order_items WHERE order_id = ?",
-            (order_id,),
-        ).fetchall()
+        found = _fetch_order_with_items(conn, "main", order_id)
+        if found is None:
+            # Fora do banco principal: procura nos arquivos, do mais novo ao mais antigo
+            for schema in archive.attach(conn, archive.years_for(conn, include_all=True)):
+                found = _fetch_order_with_items(conn, schema, order_id)
+                if found is not None:
+                    break
+    if found is None:
+        return None
+    row, items_rows = found
     items = [
         OrderItem(
             service_name=ir[0],
@@ -363,17 +577,46 @@ def get_order_with_items(order_id: str) -> Optional[Tuple[Order, List[OrderItem]
     return order, items
 
 
+def _fetch_order_with_items(conn: sqlite3.Connection, schema: str, order_id: str):
+    row = conn.execute(
+        f"SELECT id, client_id, created_at_iso, status, total_cents, due_date_iso, delivered_at_iso, order_code FROM {schema}.orders WHERE id = ?",
+        (order_id,),
+    ).fetchone()
+    if not row:
+        return None
+    items_rows = conn.execute(
+        f"SELECT service_name, service_type, service_subtype, unit_price_cents, quantity FROM {schema}.order_items WHERE order_id = ?",
+        (order_id,),
+    ).fetchall()
+    return row, items_rows
+
+
 # ---------- Fila de sincronização ----------
 
-def enqueue_sync(entity: str, action: str, payload_json: str) -> None:
+def enqueue_sync(entity: str, action: str, payload: Union[Dict[str, Any], str, bytes]) -> None:
+    """Enfileira uma operação. Dicionários são gravados no formato compacto (ver sync_codec)."""
     with get_conn() as conn:
-        conn.execute(
-            "INSERT INTO sync_queue (entity, action, payload) VALUES (?, ?, ?)",
-            (entity, action, payload_json),
-        )
+        _enqueue_sync_many(conn, entity, action, (payload,))
+
+
+def _enqueue_sync_many(
+    conn: sqlite3.Connection,
+    entity: str,
+    action: str,
+    payloads: Iterable[Union[Dict[str, Any], str, bytes]],
+) -> None:
+    """Enfileira na transação de ``conn`` (junto com a alteração que descreve)."""
+    conn.executemany(
+        "INSERT INTO sync_queue (entity, action, payload) VALUES (?, ?, ?)",
+        (
+            (entity, action, encode_payload(entity, action, p) if isinstance(p, dict) else p)
+            for p in payloads
+        ),
+    )
 
 
-def read_sync_batch(limit: int = 50) -> List[Tuple[int, str, str, str]]:
+def read_sync_batch(limit: int = 50) -> List[Tuple[int, str, str, Union[str, bytes]]]:
+    """Retorna (id, entity, action, payload); use sync_codec.decode_payload no payload."""
     with get_conn() as conn:
         rows = conn.execute(
             "SELECT id, entity, action, payload FROM sync_queue ORDER BY id ASC LIMIT ?",
@@ -393,11 +636,26 @@ def count_sync_queue() -> int:
         return int(row[0]) if row else 0
 
 
+def sync_queue_stats() -> Tuple[int, Optional[str]]:
+    """(itens na fila, ``created_at`` do mais antigo em UTC "AAAA-MM-DD HH:MM:SS").
+
+    Leitura de monitoramento: não conta como uso do banco em ``idle_seconds``.
+    """
+    with get_conn(track_activity=False) as conn:
+        row = conn.execute("SELECT COUNT(1), MIN(created_at) FROM sync_queue").fetchone()
+    return (int(row[0]), row[1]) if row else (0, None)
+
+
 # ---------- Estoque ----------
 
-def list_inventory() -> List[Tuple[str, str, str, int]]:
+def list_inventory(ids: Optional[Iterable[str]] = None) -> List[Tuple[str, str, str, int]]:
+    sql = "SELECT id, name, unit, quantity FROM inventory"
+    params: List[object] = []
+    if ids is not None:
+        sql += " WHERE id IN (SELECT value FROM json_each(?))"
+        params.append(json.dumps(list(ids)))
     with get_conn() as conn:
-        rows = conn.execute("SELECT id, name, unit, quantity FROM inventory ORDER BY name ASC").fetchall()
+        rows = conn.execute(sql + " ORDER BY name ASC", params).fetchall()
         return list(rows)
 
 
@@ -422,75 +680,61 @@ def adjust_inventory(item_id: str, delta: int) -> None:
 
 
 # ---------- Analytics / Relatórios ----------
+# Os relatórios somam as tabelas quentes com os totais diários (rollup_*) dos pedidos
+# já arquivados, então continuam corretos sem abrir os arquivos de arquivo morto.
+
+def _services_revenue(limit: int, last_n_days: int | None, ascending: bool) -> List[Tuple[str, str, str, int]]:
+    where_live = where_rollup = ""
+    params: List[object] = []
+    if last_n_days is not None:
+        since = f'-{int(last_n_days)} day'
+        where_live = "WHERE substr(o.created_at_iso,1,10) >= date('now', ?)"
+        where_rollup = "WHERE day >= date('now', ?)"
+        params = [since, since]
+    sql = f"""
+        SELECT service_name, service_type, service_subtype, SUM(amount) AS total
+        FROM (
+            SELECT oi.service_name, oi.service_type, COALESCE(oi.service_subtype,'') AS service_subtype,
+                   oi.unit_price_cents * oi.quantity AS amount
+            FROM order_items oi
+            JOIN orders o ON o.id = oi.order_id
+            {where_live}
+            UNION ALL
+            SELECT service_name, service_type, service_subtype, total_cents
+            FROM rollup_services_day
+            {where_rollup}
+        )
+        GROUP BY service_name, service_type, service_subtype
+        ORDER BY total {"ASC" if ascending else "DESC"}
+        LIMIT ?
+    """
+    with get_conn() as conn:
+        rows = conn.execute(sql, (*params, limit)).fetchall()
+        return [(r[0], r[1], r[2], int(r[3])) for r in rows]
+
 
 def top_services_by_revenue(limit: int = 10, last_n_days: int | None = None) -> List[Tuple[str, str, str, int]]:
     """Retorna (service_name, service_type, service_subtype, total_cents) ordenado por receita desc.
 
     Se last_n_days for informado, considera apenas pedidos dentro do período.
     """
-    with get_conn() as conn:
-        if last_n_days is None:
-            rows = conn.execute(
-                """
-                SELECT service_name, service_type, COALESCE(service_subtype,''), SUM(unit_price_cents * quantity) AS total
-                FROM order_items
-                GROUP BY service_name, service_type, service_subtype
-                ORDER BY total DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                """
-                SELECT oi.service_name, oi.service_type, COALESCE(oi.service_subtype,''), SUM(oi.unit_price_cents * oi.quantity) AS total
-                FROM order_items oi
-                JOIN orders o ON o.id = oi.order_id
-                WHERE substr(o.created_at_iso,1,10) >= date('now', ?)
-                GROUP BY oi.service_name, oi.service_type, oi.service_subtype
-                ORDER BY total DESC
-                LIMIT ?
-                """,
-                (f'-{int(last_n_days)} day', limit),
-            ).fetchall()
-        return [(r[0], r[1], r[2], int(r[3])) for r in rows]
+    return _services_revenue(limit, last_n_days, ascending=False)
 
 
 def bottom_services_by_revenue(limit: int = 10, last_n_days: int | None = None) -> List[Tuple[str, str, str, int]]:
-    with get_conn() as conn:
-        if last_n_days is None:
-            rows = conn.execute(
-                """
-                SELECT service_name, service_type, COALESCE(service_subtype,''), SUM(unit_price_cents * quantity) AS total
-                FROM order_items
-                GROUP BY service_name, service_type, service_subtype
-                ORDER BY total ASC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                """
-                SELECT oi.service_name, oi.service_type, COALESCE(oi.service_subtype,''), SUM(oi.unit_price_cents * oi.quantity) AS total
-                FROM order_items oi
-                JOIN orders o ON o.id = oi.order_id
-                WHERE substr(o.created_at_iso,1,10) >= date('now', ?)
-                GROUP BY oi.service_name, oi.service_type, oi.service_subtype
-                ORDER BY total ASC
-                LIMIT ?
-                """,
-                (f'-{int(last_n_days)} day', limit),
-            ).fetchall()
-        return [(r[0], r[1], r[2], int(r[3])) for r in rows]
+    return _services_revenue(limit, last_n_days, ascending=True)
 
 
 def revenue_by_day(last_n_days: int = 30) -> List[Tuple[str, int]]:
     with get_conn() as conn:
         rows = conn.execute(
             """
-            SELECT substr(created_at_iso,1,10) AS day, SUM(total_cents) AS total
-            FROM orders
+            SELECT day, SUM(total) AS total
+            FROM (
+                SELECT substr(created_at_iso,1,10) AS day, total_cents AS total FROM orders
+                UNION ALL
+                SELECT day, total_cents FROM rollup_orders_day
+            )
             GROUP BY day
             ORDER BY day DESC
             LIMIT ?
@@ -502,14 +746,22 @@ def revenue_by_day(last_n_days: int = 30) -> List[Tuple[str, int]]:
 
 def summary_since(last_n_days: int = 30) -> Tuple[int, int, float]:
     """Retorna (num_pedidos, total_cents, avg_ticket) no período."""
+    since = f'-{int(last_n_days)} day'
     with get_conn() as conn:
         row = conn.execute(
             """
-            SELECT COUNT(*), COALESCE(SUM(total_cents),0)
-            FROM orders
-            WHERE substr(created_at_iso,1,10) >= date('now', ?)
+            SELECT COALESCE(SUM(n),0), COALESCE(SUM(total),0)
+            FROM (
+                SELECT COUNT(*) AS n, COALESCE(SUM(total_cents),0) AS total
+                FROM orders
+                WHERE substr(created_at_iso,1,10) >= date('now', ?)
+                UNION ALL
+                SELECT SUM(order_count), SUM(total_cents)
+                FROM rollup_orders_day
+                WHERE day >= date('now', ?)
+            )
             """,
-            (f'-{int(last_n_days)} day',),
+            (since, since),
         ).fetchone()
         count = int(row[0]) if row else 0
         total = int(row[1]) if row else 0
@@ -534,6 +786,44 @@ def add_payment(order_id: str, amount_cents: int, method: str | None = None, not
         )
 
 
+def list_payments(order_ids: Iterable[str]) -> Dict[str, List[Payment]]:
+    """Pagamentos de vários pedidos numa consulta só, por pedido e em ordem de registro.
+
+    Pedidos que não estão no banco principal são procurados nos arquivos
+    (como em ``get_order_with_items``): o arquivamento leva os pagamentos junto.
+    """
+    from app.data import archive
+
+    ids = list(dict.fromkeys(order_ids))
+    out: Dict[str, List[Payment]] = {}
+    with get_conn() as conn:
+        archived = [
+            r[0]
+            for r in conn.execute(
+                "SELECT value FROM json_each(?) WHERE value NOT IN (SELECT id FROM main.orders)",
+                (json.dumps(ids),),
+            ).fetchall()
+        ]
+        rows = _fetch_payments(conn, "main", ids)
+        if archived:
+            for schema in archive.attach(conn, archive.years_for(conn, include_all=True)):
+                rows += _fetch_payments(conn, schema, archived)
+    for r in rows:
+        out.setdefault(r[0], []).append(Payment(r[0], int(r[1]), r[2], r[3], r[4]))
+    return out
+
+
+def _fetch_payments(conn: sqlite3.Connection, schema: str, order_ids: List[str]) -> List[Tuple]:
+    return conn.execute(
+        f"""
+        SELECT order_id, amount_cents, method, note, created_at_iso FROM {schema}.payments
+        WHERE order_id IN (SELECT value FROM json_each(?))
+        ORDER BY order_id, id
+        """,
+        (json.dumps(order_ids),),
+    ).fetchall()
+
+
 def cash_sum_for_date(date_iso: str) -> int:
     """Total recebido em uma data (YYYY-MM-DD) somando amount_cents dos pagamentos nessa data (UTC)."""
     with get_conn() as conn:
@@ -541,4 +831,174 @@ def cash_sum_for_date(date_iso: str) -> int:
             "SELECT COALESCE(SUM(amount_cents), 0) FROM payments WHERE substr(created_at_iso, 1, 10) = ?",
             (date_iso,),
         ).fetchone()
-        return int(row[0]) if row and row[0] is not None else 0
+        archived = conn.execute(
+            "SELECT amount_cents FROM rollup_payments_day WHERE day = ?", (date_iso,)
+        ).fetchone()
+        total = int(row[0]) if row and row[0] is not None else 0
+        return total + (int(archived[0]) if archived else 0)
+
+
+# ---------- Manutenção ----------
+
+def record_maintenance_run(
+    kind: str,
+    started_at_iso: str,
+    duration_ms: int,
+    ok: bool,
+    bytes_: Optional[int] = None,
+    detail: Optional[Dict[str, Any]] = None,
+) -> None:
+    with get_conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO maintenance_runs (kind, started_at_iso, duration_ms, bytes, ok, detail)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (kind, started_at_iso, int(duration_ms), bytes_, 1 if ok else 0, json.dumps(detail or {}, ensure_ascii=False)),
+        )
+
+
+def list_maintenance_runs(kind: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """Execuções mais recentes primeiro; ``detail`` já vem decodificado."""
+    sql = "SELECT kind, started_at_iso, duration_ms, bytes, ok, detail FROM maintenance_runs"
+    params: List[object] = []
+    if kind:
+        sql += " WHERE kind = ?"
+        params.append(kind)
+    sql += " ORDER BY started_at_iso DESC LIMIT ?"
+    params.append(int(limit))
+    with get_conn() as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return [
+        {
+            "kind": r[0],
+            "started_at_iso": r[1],
+            "duration_ms": int(r[2]),
+            "bytes": r[3],
+            "ok": bool(r[4]),
+            "detail": json.loads(r[5]) if r[5] else {},
+        }
+        for r in rows
+    ]
+
+
+# ---------- Fila de impressão ----------
+
+PRINT_PENDING, PRINT_PRINTING, PRINT_DONE, PRINT_FAILED = "pending", "printing", "done", "failed"
+
+
+def enqueue_print_job(payload: Dict[str, Any]) -> int:
+    with get_conn() as conn:
+        cur = conn.execute(
+            "INSERT INTO print_jobs (created_at_iso, status, payload) VALUES (?, ?, ?)",
+            (datetime.now(timezone.utc).isoformat(), PRINT_PENDING, json.dumps(payload, ensure_ascii=False)),
+        )
+        return int(cur.lastrowid)
+
+
+def claim_print_job(now: float) -> Optional[Tuple[int, Dict[str, Any], int, str]]:
+    """Marca como ``printing`` o trabalho pendente mais antigo já vencido.
+
+    Retorna (id, payload, tentativa atual, created_at_iso) ou ``None``. ``now``
+    é ``time.time()``, comparado com ``next_attempt_at``. A fila consulta a cada
+    segundo; isso não conta como uso do banco (a manutenção espera ociosidade).
+    """
+    with get_conn(track_activity=False) as conn:
+        row = conn.execute(
+            """
+            SELECT id, payload, attempts, created_at_iso FROM print_jobs
+            WHERE status = ? AND next_attempt_at <= ?
+            ORDER BY id LIMIT 1
+            """,
+            (PRINT_PENDING, now),
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE print_jobs SET status = ?, attempts = attempts + 1 WHERE id = ?",
+            (PRINT_PRINTING, row[0]),
+        )
+    return int(row[0]), json.loads(row[1]), int(row[2]) + 1, row[3]
+
+
+def finish_print_job(
+    job_id: int,
+    ok: bool,
+    latency_ms: Optional[float] = None,
+    error: Optional[str] = None,
+    retry_at: Optional[float] = None,
+) -> None:
+    """Conclui o trabalho; com ``retry_at`` (``time.time()``) ele volta a ``pending``."""
+    if ok:
+        status = PRINT_DONE
+    elif retry_at is not None:
+        status = PRINT_PENDING
+    else:
+        status = PRINT_FAILED
+    finished = None if status == PRINT_PENDING else datetime.now(timezone.utc).isoformat()
+    with get_conn() as conn:
+        conn.execute(
+            """
+            UPDATE print_jobs
+            SET status = ?, last_error = ?, next_attempt_at = COALESCE(?, next_attempt_at),
+                finished_at_iso = ?, latency_ms = ?
+            WHERE id = ?
+            """,
+            (status, error, retry_at, finished, None if latency_ms is None else int(latency_ms), job_id),
+        )
+
+
+def requeue_print_jobs(purge_days: int = 30) -> int:
+    """Na partida: trabalhos que estavam imprimindo quando o app caiu voltam à fila.
+
+    Também apaga os concluídos há mais de ``purge_days`` dias. Retorna quantos
+    voltaram à fila (podem sair impressos em dobro, se a queda foi após o envio).
+    """
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=purge_days)).isoformat()
+    with get_conn() as conn:
+        cur = conn.execute("UPDATE print_jobs SET status = ? WHERE status = ?", (PRINT_PENDING, PRINT_PRINTING))
+        conn.execute(
+            "DELETE FROM print_jobs WHERE status IN (?, ?) AND finished_at_iso < ?",
+            (PRINT_DONE, PRINT_FAILED, cutoff),
+        )
+        return cur.rowcount
+
+
+def print_queue_stats() -> Dict[str, int]:
+    """Trabalhos de impressão por status (só os status que têm algum); não conta como uso do banco."""
+    with get_conn(track_activity=False) as conn:
+        rows = conn.execute("SELECT status, COUNT(1) FROM print_jobs GROUP BY status").fetchall()
+    return {r[0]: int(r[1]) for r in rows}
+
+
+def list_print_jobs(limit: int = 50, status: Optional[str] = None, with_payload: bool = True) -> List[Dict[str, Any]]:
+    """Trabalhos mais recentes primeiro; ``payload`` já vem decodificado.
+
+    ``with_payload=False``: só as colunas de controle, sem ler nem decodificar
+    o recibo, e sem contar como uso do banco (painel de diagnóstico).
+    """
+    cols = "id, created_at_iso, status, attempts, last_error, finished_at_iso, latency_ms"
+    sql = f"SELECT {cols}{', payload' if with_payload else ''} FROM print_jobs"
+    params: List[object] = []
+    if status:
+        sql += " WHERE status = ?"
+        params.append(status)
+    sql += " ORDER BY id DESC LIMIT ?"
+    params.append(int(limit))
+    with get_conn(track_activity=with_payload) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    jobs = []
+    for r in rows:
+        job = {
+            "id": int(r[0]),
+            "created_at_iso": r[1],
+            "status": r[2],
+            "attempts": int(r[3]),
+            "last_error": r[4],
+            "finished_at_iso": r[5],
+            "latency_ms": r[6],
+        }
+        if with_payload:
+            job["payload"] = json.loads(r[7])
+        jobs.append(job)
+    return jobs
@@ -0,0 +1,144 @@
+"""Codificação compacta dos payloads da fila de sincronização (``sync_queue``).
+
+Formato v1 (gravado como BLOB):
+
+- byte 0: versão do formato (``FORMAT_VERSION``)
+- byte 1: id do schema (ver ``_SCHEMAS``); 0 = dicionário JSON genérico
+- byte 2: flags (bit 0 = corpo comprimido com zlib)
+- bytes 3+: corpo em JSON compacto com os valores em posições fixas
+
+Nos pedidos, os textos dos itens (nome/tipo/subtipo do serviço) vão para uma
+tabela de strings no fim do corpo e os itens guardam apenas índices.
+Payloads antigos (TEXT com JSON) continuam sendo lidos por ``decode_payload``.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+# Abaixo disso a compressão raramente compensa o custo de CPU
+COMPRESS_MIN_BYTES = 512
+
+_GENERIC_SCHEMA = 0
+
+# id -> (entity, action, campos em ordem). Ids nunca devem ser reutilizados.
+_SCHEMAS: Dict[int, Tuple[str, str, Tuple[str, ...]]] = {
+    1: ("service", "upsert", ("id", "name", "type", "subtype", "price_cents", "active")),
+    2: ("service", "set_active", ("id", "active")),
+    3: ("service", "update_price", ("id", "price_cents", "name", "type", "subtype", "active")),
+    4: ("client", "upsert", ("id", "name", "phone", "notes")),
+    5: (
+        "order",
+        "upsert",
+        ("id", "client_id", "created_at_iso", "status", "total_cents", "due_date_iso", "delivered_at_iso", "order_code", "items"),
+    ),
+    6: ("order", "update_status", ("id", "status", "delivered_at_iso")),
+    7: ("inventory", "upsert", ("id", "name", "unit", "quantity")),
+    8: ("inventory", "adjust", ("id", "delta")),
+    9: ("order", "delete", ("id",)),
+}
+_SCHEMA_BY_KEY: Dict[Tuple[str, str], int] = {(e, a): sid for sid, (e, a, _) in _SCHEMAS.items()}
+
+_ITEM_FIELDS = ("service_name", "service_type", "service_subtype", "unit_price_cents", "quantity")
+# Campos do item que vão para a tabela de strings
+_ITEM_INTERNED = 3
+
+Payload = Union[str, bytes, bytearray, memoryview]
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _pack_items(items: Any) -> Optional[Tuple[List[List[Any]], List[Optional[str]]]]:
+    if not isinstance(items, list):
+        return None
+    strings: List[Optional[str]] = []
+    index: Dict[Optional[str], int] = {}
+    packed: List[List[Any]] = []
+    for it in items:
+        if not isinstance(it, dict) or set(it) != set(_ITEM_FIELDS):
+            return None
+        row: List[Any] = []
+        for name in _ITEM_FIELDS[:_ITEM_INTERNED]:
+            value = it[name]
+            pos = index.get(value)
+            if pos is None:
+                pos = index[value] = len(strings)
+                strings.append(value)
+            row.append(pos)
+        row.extend(it[name] for name in _ITEM_FIELDS[_ITEM_INTERNED:])
+        packed.append(row)
+    return packed, strings
+
+
+def _unpack_items(packed: List[List[Any]], strings: List[Optional[str]]) -> List[Dict[str, Any]]:
+    items = []
+    for row in packed:
+        values = [strings[i] for i in row[:_ITEM_INTERNED]] + list(row[_ITEM_INTERNED:])
+        items.append(dict(zip(_ITEM_FIELDS, values)))
+    return items
+
+
+def _encode_body(entity: str, action: str, data: Dict[str, Any]) -> Tuple[int, Any]:
+    sid = _SCHEMA_BY_KEY.get((entity, action))
+    if sid is None:
+        return _GENERIC_SCHEMA, data
+    fields = _SCHEMAS[sid][2]
+    if set(data) != set(fields):
+        return _GENERIC_SCHEMA, data
+    values = [data[name] for name in fields]
+    if "items" in fields:
+        pos = fields.index("items")
+        packed = _pack_items(values[pos])
+        if packed is None:
+            return _GENERIC_SCHEMA, data
+        values[pos] = packed[0]
+        values.append(packed[1])
+    return sid, values
+
+
+def encode_payload(entity: str, action: str, data: Dict[str, Any]) -> bytes:
+    """Serializa ``data`` no formato compacto versionado."""
+    sid, body = _encode_body(entity, action, data)
+    raw = _dumps(body)
+    flags = 0
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(raw, 6)
+        if len(compressed) < len(raw):
+            raw = compressed
+            flags |= FLAG_ZLIB
+    return bytes((FORMAT_VERSION, sid, flags)) + raw
+
+
+def decode_payload(payload: Payload) -> Dict[str, Any]:
+    """Lê um payload da fila (formato compacto ou JSON legado)."""
+    if isinstance(payload, str):
+        return json.loads(payload)
+    buf = bytes(payload)
+    if not buf or buf[:1] == b"{":
+        # JSON legado gravado como BLOB
+        return json.loads(buf.decode("utf-8"))
+    if len(buf) < 3:
+        raise ValueError("payload de sync truncado")
+    version, sid, flags = buf[0], buf[1], buf[2]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"versão de payload desconhecida: {version}")
+    raw = buf[3:]
+    if flags & FLAG_ZLIB:
+        raw = zlib.decompress(raw)
+    body = json.loads(raw.decode("utf-8"))
+    if sid == _GENERIC_SCHEMA:
+        return body
+    schema = _SCHEMAS.get(sid)
+    if schema is None:
+        raise ValueError(f"schema de payload desconhecido: {sid}")
+    fields = schema[2]
+    data = dict(zip(fields, body))
+    if "items" in fields:
+        data["items"] = _unpack_items(data["items"], body[len(fields)])
+    return data
@@ -1,10 +1,78 @@
 from __future__ import annotations
 
-from PyQt6.QtCore import QObject, pyqtSignal
+import threading
+from typing import Dict, Set
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
 
 
 class EventBus(QObject):
+    """Eventos de domínio com os ids afetados.
+
+    Use ``publish`` em vez de emitir os sinais tipados diretamente: os ids
+    publicados na mesma volta do event loop são agrupados e entregues uma única
+    vez, então uma ação que mexe em vários pedidos gera uma só atualização na
+    view. ``publish`` sem ids (lista vazia no sinal) significa "mudou tudo
+    desse tipo": a view recarrega por completo.
+    """
+
     client_list_changed = pyqtSignal()
 
+    orders_created = pyqtSignal(list)  # ids de pedidos
+    orders_updated = pyqtSignal(list)
+    orders_deleted = pyqtSignal(list)
+    payments_added = pyqtSignal(list)  # ids dos pedidos que receberam pagamento
+    services_changed = pyqtSignal(list)  # ids de serviços
+    inventory_adjusted = pyqtSignal(list)  # ids de itens de estoque
+
+    # Ordem de entrega na descarga
+    EVENTS = (
+        "orders_created",
+        "orders_updated",
+        "orders_deleted",
+        "payments_added",
+        "services_changed",
+        "inventory_adjusted",
+    )
+
+    _flush_requested = pyqtSignal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._pending: Dict[str, Dict[str, None]] = {}  # dict como conjunto ordenado
+        self._everything: Set[str] = set()
+        self._lock = threading.Lock()
+        # Conexão enfileirada: a descarga roda na próxima volta do loop da thread
+        # da UI, mesmo que ``publish`` tenha sido chamado de outra thread
+        self._flush_requested.connect(self._flush, Qt.ConnectionType.QueuedConnection)
+
+    def publish(self, event: str, *ids: str) -> None:
+        if event not in self.EVENTS:
+            raise ValueError(f"Evento desconhecido: {event}")
+        with self._lock:
+            schedule = not self._pending
+            if not ids:
+                self._everything.add(event)
+            self._pending.setdefault(event, {}).update(dict.fromkeys(ids))
+        if schedule:
+            self._flush_requested.emit()
+
+    def _flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            everything, self._everything = self._everything, set()
+        # Pedido criado/alterado e removido na mesma volta: só a remoção interessa
+        for event in ("orders_created", "orders_updated", "payments_added"):
+            for oid in pending.get("orders_deleted", ()):
+                pending.get(event, {}).pop(oid, None)
+        # Criado e alterado na mesma volta: basta o "criado" (a view lê o estado atual)
+        for oid in pending.get("orders_created", ()):
+            pending.get("orders_updated", {}).pop(oid, None)
+        for event in self.EVENTS:
+            if event in everything:
+                getattr(self, event).emit([])
+            elif pending.get(event):
+                getattr(self, event).emit(list(pending[event]))
+
 
 bus = EventBus()
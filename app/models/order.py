@@ -24,3 +24,12 @@ class Order:
     due_date_iso: Optional[str] = None
     delivered_at_iso: Optional[str] = None
     order_code: Optional[str] = None
+
+
+@dataclass
+class Payment:
+    order_id: str
+    amount_cents: int
+    method: Optional[str] = None
+    note: Optional[str] = None
+    created_at_iso: Optional[str] = None
@@ -0,0 +1,164 @@
+"""Índice em memória de clientes para busca por prefixo (nome ou telefone).
+
+Mantém arrays ordenados de chaves normalizadas e usa ``bisect`` para achar o
+início do prefixo; cada busca custa O(log n + resultados) e não toca o banco.
+"""
+
+from __future__ import annotations
+
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.models.client import Client
+from app.utils import metrics
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Minúsculas, sem acentos e com espaços simples: "José  Ávila" -> "jose avila"."""
+    text = text or ""
+    if text.isascii():
+        return " ".join(text.lower().split())
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.lower().split())
+
+
+def phone_digits(text: Optional[str]) -> str:
+    return "".join(ch for ch in (text or "") if ch.isdigit())
+
+
+class ClientIndex:
+    """Índice de prefixos sobre nome (completo e por palavra) e dígitos do telefone."""
+
+    def __init__(self, loader: Callable[[], List[Client]]) -> None:
+        self._loader = loader
+        self._clients: Dict[str, Client] = {}
+        self._names: List[Tuple[str, str]] = []  # (chave normalizada, client_id)
+        self._phones: List[Tuple[str, str]] = []
+        self._by_name: List[Tuple[str, str]] = []  # só o nome completo, para a lista sem filtro
+        self._stale = True
+        # A reconstrução pode rodar numa thread de fundo enquanto a UI busca
+        self._lock = threading.RLock()
+
+    # --------- Manutenção ---------
+    def invalidate(self) -> None:
+        """Marca o índice para ser reconstruído na próxima busca."""
+        self._stale = True
+
+    def ensure_fresh(self) -> None:
+        """Reconstrói se estiver desatualizado (pode ser chamado fora da thread da UI)."""
+        with self._lock:
+            if self._stale:
+                self.rebuild()
+
+    def rebuild(self, clients: Optional[List[Client]] = None) -> None:
+        with self._lock:
+            self._rebuild(self._loader() if clients is None else clients)
+
+    def _rebuild(self, clients: List[Client]) -> None:
+        self._clients = {}
+        names: List[Tuple[str, str]] = []
+        phones: List[Tuple[str, str]] = []
+        by_name: List[Tuple[str, str]] = []
+        for c in clients:
+            if not c.id:
+                continue
+            self._clients[c.id] = c
+            keys = self._name_keys(c)
+            names.extend((key, c.id) for key in keys)
+            phones.extend((key, c.id) for key in self._phone_keys(c))
+            by_name.append((keys[0] if keys else "", c.id))
+        names.sort()
+        phones.sort()
+        by_name.sort()
+        self._names, self._phones, self._by_name = names, phones, by_name
+        self._stale = False
+
+    def add(self, client: Client) -> None:
+        """Inclui/atualiza um cliente sem reconstruir o índice."""
+        with self._lock:
+            if not self._stale and client.id:
+                self._add(client)
+
+    def _add(self, client: Client) -> None:
+        if client.id in self._clients:
+            self._remove(client.id)
+        self._clients[client.id] = client
+        keys = self._name_keys(client)
+        insort(self._by_name, (keys[0] if keys else "", client.id))
+        for key in keys:
+            insort(self._names, (key, client.id))
+        for key in self._phone_keys(client):
+            insort(self._phones, (key, client.id))
+
+    def remove(self, client_id: str) -> None:
+        with self._lock:
+            self._remove(client_id)
+
+    def _remove(self, client_id: str) -> None:
+        client = self._clients.pop(client_id, None)
+        if client is None:
+            return
+        name_keys = self._name_keys(client)
+        for keys, entries in (
+            (name_keys, self._names),
+            (self._phone_keys(client), self._phones),
+            (name_keys[:1] or [""], self._by_name),
+        ):
+            for key in keys:
+                pos = bisect_left(entries, (key, client_id))
+                if pos < len(entries) and entries[pos] == (key, client_id):
+                    del entries[pos]
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    # --------- Busca ---------
+    def search(self, query: str, limit: int = 50) -> List[Client]:
+        """Clientes cujo nome (ou alguma palavra dele) ou telefone começa com ``query``."""
+        with self._lock:
+            if self._stale:
+                metrics.counter("cache.clients.rebuild").inc()
+                self.rebuild()
+            else:
+                metrics.counter("cache.clients.hit").inc()
+            return self._search(query, limit)
+
+    def _search(self, query: str, limit: int) -> List[Client]:
+        digits = phone_digits(query)
+        text = normalize_text(query)
+        if not text:
+            return [self._clients[client_id] for _, client_id in self._by_name[:limit]]
+        # Consulta só com dígitos/pontuação de telefone procura no telefone
+        is_phone = bool(digits) and all(ch.isdigit() or ch in " ()-+." for ch in query.strip())
+        entries, prefix = (self._phones, digits) if is_phone else (self._names, text)
+        found: Dict[str, Client] = {}
+        pos = bisect_left(entries, (prefix, ""))
+        while pos < len(entries) and len(found) < limit:
+            key, client_id = entries[pos]
+            if not key.startswith(prefix):
+                break
+            found.setdefault(client_id, self._clients[client_id])
+            pos += 1
+        return sorted(found.values(), key=lambda c: normalize_text(c.name))
+
+    @staticmethod
+    def _name_keys(client: Client) -> List[str]:
+        full = normalize_text(client.name)
+        if not full:
+            return []
+        words = full.split(" ")
+        # nome completo + cada sobrenome/palavra a partir da segunda
+        return [full] + [" ".join(words[i:]) for i in range(1, len(words))]
+
+    @staticmethod
+    def _phone_keys(client: Client) -> List[str]:
+        digits = phone_digits(client.phone)
+        if not digits:
+            return []
+        keys = [digits]
+        if len(digits) > 9:
+            keys.append(digits[2:])  # sem DDD
+        return keys
@@ -0,0 +1,93 @@
+"""Retrato da saúde do app: métricas publicadas, fila de sync e arquivos do banco.
+
+Usado pelo diálogo de diagnóstico e pelo export em JSON anexado a relatos de
+problema. Não importa Qt; as leituras do banco são consultas curtas, que não
+contam como uso do banco (a manutenção continua rodando com o painel aberto).
+O diálogo chama ``collect()`` fora da thread da UI.
+"""
+
+from __future__ import annotations
+
+import os
+import platform
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.config import settings as app_settings
+from app.utils import flight_recorder, metrics, stall_watchdog
+
+
+def _file_size(path: str) -> Optional[int]:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _sync_queue() -> Dict[str, Any]:
+    from app.data import sqlite as sqldb
+
+    depth, oldest = sqldb.sync_queue_stats()
+    age_s = None
+    if oldest:
+        # ``CURRENT_TIMESTAMP`` do SQLite: UTC, sem fuso
+        created = datetime.strptime(oldest, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+        age_s = int((datetime.now(timezone.utc) - created).total_seconds())
+    return {"depth": depth, "oldest": oldest, "oldest_age_s": age_s}
+
+
+def _db_files() -> Dict[str, Optional[int]]:
+    from app.data import sqlite as sqldb
+
+    path = sqldb.DB_PATH
+    return {
+        "db_bytes": _file_size(path),
+        "wal_bytes": _file_size(path + "-wal"),
+        "journal_bytes": _file_size(path + "-journal"),
+    }
+
+
+def _print_jobs() -> list:
+    from app.data import sqlite as sqldb
+
+    # Sem o payload: o texto do recibo tem dados do cliente e não é exibido
+    return sqldb.list_print_jobs(20, with_payload=False)
+
+
+def collect() -> Dict[str, Any]:
+    from app.data import profiling
+    from app.data import sqlite as sqldb
+
+    snap = metrics.snapshot()
+    try:
+        sync_queue = _sync_queue()
+    except Exception as exc:
+        sync_queue = {"error": str(exc)}
+    try:
+        print_jobs = _print_jobs()
+        print_queue = sqldb.print_queue_stats()
+    except Exception as exc:
+        print_jobs = [{"error": str(exc)}]
+        print_queue = {"error": str(exc)}
+    return {
+        "at": datetime.now(timezone.utc).isoformat(),
+        "app": {
+            "name": app_settings.get_settings().get("APP_NAME"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "pid": os.getpid(),
+            "argv": sys.argv[:1],
+        },
+        "db": _db_files(),
+        "sync_queue": sync_queue,
+        "print_jobs": print_jobs,
+        "print_queue": print_queue,
+        "profiling_enabled": profiling.ENABLED,
+        "slow_queries": profiling.recent_slow()[:20],
+        "ui_stall_sites": stall_watchdog.top_sites(),
+        "recent_operations": flight_recorder.entries()[-200:],
+        **snap,
+    }
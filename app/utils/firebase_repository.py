@@ -1,16 +1,19 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 
 from app.data import sqlite as sqldb
 from app.models.client import Client
-from app.models.order import Order, OrderItem
+from app.models.order import Order, OrderItem, Payment
 from app.models.service import Service
+from app.utils import metrics, tracing
 
 
+# Latência de cada método público em repo.<método> (diálogo de diagnóstico)
+@tracing.traced_methods("repo")
+@metrics.timed_methods("repo")
 class FirebaseRepository:
     """Acesso ao Firestore com persistência offline (SQLite) e fila de sincronização.
     """
@@ -44,16 +47,19 @@ class FirebaseRepository:
     def list_services(self, include_inactive: bool = False) -> List[Service]:
         return sqldb.list_services(include_inactive=include_inactive)
 
+    def recent_item_services(self, limit: int = 200) -> List[Tuple[str, str, Optional[str]]]:
+        return sqldb.recent_item_services(limit)
+
     def upsert_service(self, service: Service) -> Service:
         if not service.id:
             service.id = f"local:{service.name}:{service.type}:{service.subtype or ''}"
         sqldb.upsert_service(service)
-        sqldb.enqueue_sync("service", "upsert", json.dumps(service.__dict__))
+        sqldb.enqueue_sync("service", "upsert", service.__dict__)
         return service
 
     def set_service_active(self, service_id: str, active: bool) -> None:
         sqldb.set_service_active(service_id, active)
-        sqldb.enqueue_sync("service", "set_active", json.dumps({"id": service_id, "active": bool(active)}))
+        sqldb.enqueue_sync("service", "set_active", {"id": service_id, "active": bool(active)})
 
     def update_service_price(self, target: Service, new_price_cents: int) -> None:
         target.price_cents = int(new_price_cents)
@@ -67,12 +73,12 @@ class FirebaseRepository:
             "active": target.active,
         }
         action = "update_price" if target.id and not str(target.id).startswith("local:") else "upsert"
-        sqldb.enqueue_sync("service", action, json.dumps(payload))
+        sqldb.enqueue_sync("service", action, payload)
 
     # --------- Clientes ---------
     def upsert_client(self, client: Client) -> Client:
         saved = sqldb.upsert_client(client)
-        sqldb.enqueue_sync("client", "upsert", json.dumps(saved.__dict__))
+        sqldb.enqueue_sync("client", "upsert", saved.__dict__)
         return saved
 
     def list_clients(self) -> List[Client]:
@@ -82,6 +88,9 @@ class FirebaseRepository:
         query = (query or "").strip()
         return sqldb.search_clients(query) if query else self.list_clients()
 
+    def get_client_by_id(self, client_id: str) -> Optional[Client]:
+        return sqldb.get_client_by_id(client_id)
+
     # --------- Pedidos ---------
     def create_order(self, client_id: str, items: List[OrderItem], due_date_iso: Optional[str] = None) -> Order:
         created_at_iso = datetime.now(timezone.utc).isoformat()
@@ -117,44 +126,61 @@ class FirebaseRepository:
                 for it in items
             ],
         }
-        sqldb.enqueue_sync("order", "upsert", json.dumps(payload))
+        sqldb.enqueue_sync("order", "upsert", payload)
         return saved
 
     # --------- Pagamentos / Caixa ---------
     def add_payment(self, order_id: str, amount_cents: int, method: str | None = None, note: str | None = None) -> None:
         sqldb.add_payment(order_id, int(amount_cents), method, note)
 
+    def list_payments(self, order_ids: Iterable[str]) -> Dict[str, List[Payment]]:
+        return sqldb.list_payments(order_ids)
+
     def cash_sum_for_date(self, date_iso: str) -> int:
         return sqldb.cash_sum_for_date(date_iso)
 
     def update_order_status(self, order_id: str, status: str, delivered_at_iso: Optional[str]) -> None:
-        sqldb.update_order_status(order_id, status, delivered_at_iso)
-        payload = {"id": order_id, "status": status, "delivered_at_iso": delivered_at_iso}
-        sqldb.enqueue_sync("order", "update_status", json.dumps(payload))
-
-    def list_orders(self, status: Optional[str] = None, client_query: Optional[str] = None, order_code_query: Optional[str] = None):
-        return sqldb.list_orders(status, client_query, order_code_query)
+        self.update_orders_status([order_id], status, delivered_at_iso)
+
+    def update_orders_status(self, order_ids: Iterable[str], status: str, delivered_at_iso: Optional[str]) -> List[str]:
+        """Status de vários pedidos numa transação (com um registro de sync por pedido)."""
+        return sqldb.update_orders_status(order_ids, status, delivered_at_iso)
+
+    def list_orders(
+        self,
+        status: Optional[str] = None,
+        client_query: Optional[str] = None,
+        order_code_query: Optional[str] = None,
+        ids: Optional[Iterable[str]] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        include_archived: bool = False,
+    ):
+        return sqldb.list_orders(status, client_query, order_code_query, ids, created_from, created_to, include_archived)
 
     def get_order_with_items(self, order_id: str):
         return sqldb.get_order_with_items(order_id)
 
     def delete_order(self, order_id: str) -> None:
-        # Remove local e deixa uma marca de remoção opcionalmente no remoto (não implementado)
-        sqldb.delete_order(order_id)
+        self.delete_orders([order_id])
+
+    def delete_orders(self, order_ids: Iterable[str]) -> List[str]:
+        """Remove vários pedidos numa transação e enfileira a remoção no remoto."""
+        return sqldb.delete_orders(order_ids)
 
     # --------- Estoque ---------
-    def list_inventory(self) -> List[Tuple[str, str, str, int]]:
-        return sqldb.list_inventory()
+    def list_inventory(self, ids: Optional[Iterable[str]] = None) -> List[Tuple[str, str, str, int]]:
+        return sqldb.list_inventory(ids)
 
     def upsert_inventory_item(self, item_id: str, name: str, unit: str, quantity: int) -> None:
         sqldb.upsert_inventory_item(item_id, name, unit, quantity)
         payload = {"id": item_id, "name": name, "unit": unit, "quantity": int(quantity)}
-        sqldb.enqueue_sync("inventory", "upsert", json.dumps(payload))
+        sqldb.enqueue_sync("inventory", "upsert", payload)
 
     def adjust_inventory(self, item_id: str, delta: int) -> None:
         sqldb.adjust_inventory(item_id, delta)
         payload = {"id": item_id, "delta": int(delta)}
-        sqldb.enqueue_sync("inventory", "adjust", json.dumps(payload))
+        sqldb.enqueue_sync("inventory", "adjust", payload)
 
     # --------- Sync ---------
     def count_sync_queue(self) -> int:
@@ -0,0 +1,192 @@
+"""Gravador de voo: as últimas operações do app, para ler depois de uma queda.
+
+Guarda as ``CAPACITY`` operações mais recentes (chamadas ao repositório,
+lotes de sincronização, impressões, ações da UI) com horário, thread, duração
+e resultado. As posições são alocadas uma vez; ``record`` só sobrescreve a
+posição seguinte do anel, sem lock (cada atribuição é atômica no CPython).
+
+O anel é gravado em ``logs/flight-AAAAMMDD-HHMMSS.log`` ao lado do banco:
+
+- em exceção não tratada (``sys.excepthook`` e ``threading.excepthook``);
+- em mensagem fatal do Qt (``install_qt_handler``), antes do ``abort``; a
+  pilha de todas as threads no momento da queda vai para ``logs/fatal.log``
+  pelo ``faulthandler``, que também cobre falhas em código nativo;
+- quando a UI fica travada por mais de ``stall_watchdog.ONGOING_LOG_S``;
+- sob demanda (``dump()``, botão no diálogo de diagnóstico).
+
+Só os ``KEEP_DUMPS`` arquivos mais recentes são mantidos. Não importa Qt.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import faulthandler
+import functools
+import itertools
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+CAPACITY = 2048
+KEEP_DUMPS = 10
+
+_at: List[float] = [0.0] * CAPACITY
+_thread: List[str] = [""] * CAPACITY
+_kind: List[str] = [""] * CAPACITY
+_name: List[str] = [""] * CAPACITY
+_ms: List[float] = [0.0] * CAPACITY
+_ok: List[bool] = [True] * CAPACITY
+_detail: List[Any] = [None] * CAPACITY
+_seq = itertools.count()
+_written = 0
+
+_log_dir: Optional[Path] = None
+_dump_lock = threading.Lock()
+_fatal_file = None
+
+
+def record(kind: str, name: str, ms: float = 0.0, ok: bool = True, detail: Any = None) -> None:
+    """Anota uma operação. ``detail`` é guardado como veio e só vira texto no dump."""
+    global _written
+    n = next(_seq)
+    i = n % CAPACITY
+    _at[i] = time.time()
+    _thread[i] = threading.current_thread().name
+    _kind[i] = kind
+    _name[i] = name
+    _ms[i] = ms
+    _ok[i] = ok
+    _detail[i] = detail
+    _written = n + 1
+
+
+@contextlib.contextmanager
+def timed(kind: str, name: str, detail: Any = None) -> Iterator[None]:
+    t0 = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        record(kind, name, (time.perf_counter() - t0) * 1000, ok, detail)
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def recorded(kind: str, name: str) -> Callable[[_F], _F]:
+    """Decorador: cada chamada entra no anel como ``kind``/``name``."""
+
+    def decorate(fn: _F) -> _F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(kind, name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def entries() -> List[Dict[str, Any]]:
+    """Operações do anel, da mais antiga para a mais recente."""
+    written = _written
+    start = max(0, written - CAPACITY)
+    out = []
+    for n in range(start, written):
+        i = n % CAPACITY
+        out.append({
+            "at": datetime.fromtimestamp(_at[i]).isoformat(timespec="milliseconds"),
+            "thread": _thread[i],
+            "kind": _kind[i],
+            "name": _name[i],
+            "ms": round(_ms[i], 2),
+            "ok": _ok[i],
+            "detail": None if _detail[i] is None else str(_detail[i]),
+        })
+    return out
+
+
+def _format(reason: str, exc_text: Optional[str]) -> str:
+    lines = [f"Gravador de voo — {datetime.now().isoformat(timespec='seconds')} — {reason}", ""]
+    if exc_text:
+        lines += [exc_text.rstrip(), ""]
+    lines.append(f"Últimas {min(_written, CAPACITY)} operações (mais antiga primeiro):")
+    for e in entries():
+        status = "ok  " if e["ok"] else "FALHA"
+        detail = f"  {e['detail']}" if e["detail"] else ""
+        lines.append(f"{e['at'][11:]} {status} {e['ms']:9.1f} ms  [{e['thread']}] {e['kind']}.{e['name']}{detail}")
+    lines += ["", "Threads no momento do registro:"]
+    names = {t.ident: t.name for t in threading.enumerate()}
+    for ident, frame in sys._current_frames().items():
+        lines.append(f"--- {names.get(ident, ident)}")
+        lines += [l.rstrip() for l in traceback.format_stack(frame)]
+    return "\n".join(lines) + "\n"
+
+
+def _prune(log_dir: Path) -> None:
+    for old in sorted(log_dir.glob("flight-*.log"))[:-KEEP_DUMPS]:
+        with contextlib.suppress(OSError):
+            old.unlink()
+
+
+def dump(reason: str = "sob demanda", exc_text: Optional[str] = None) -> Optional[Path]:
+    """Grava o anel em ``logs/``; devolve o caminho (``None`` se não deu para gravar)."""
+    log_dir = _log_dir or Path("logs")
+    try:
+        with _dump_lock:
+            log_dir.mkdir(parents=True, exist_ok=True)
+            path = log_dir / f"flight-{datetime.now():%Y%m%d-%H%M%S}.log"
+            if path.exists():
+                path = path.with_name(f"{path.stem}-{time.monotonic_ns() % 1000:03d}.log")
+            path.write_text(_format(reason, exc_text), encoding="utf-8")
+            _prune(log_dir)
+        return path
+    except Exception:
+        # Gravando no meio de uma queda: não pode gerar outra
+        return None
+
+
+def install(log_dir: Path) -> None:
+    """Liga os ganchos de exceção e o ``faulthandler``; grava em ``log_dir``."""
+    global _log_dir, _fatal_file
+    _log_dir = log_dir
+    prev_hook = sys.excepthook
+    prev_thread_hook = threading.excepthook
+
+    def excepthook(exc_type, exc, tb) -> None:
+        dump("exceção não tratada", "".join(traceback.format_exception(exc_type, exc, tb)))
+        prev_hook(exc_type, exc, tb)
+
+    def thread_excepthook(args) -> None:
+        name = args.thread.name if args.thread else "?"
+        text = "".join(traceback.format_exception(args.exc_type, args.exc_value, args.exc_traceback))
+        dump(f"exceção não tratada na thread {name}", text)
+        prev_thread_hook(args)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
+    try:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        _fatal_file = open(log_dir / "fatal.log", "a", encoding="utf-8")
+        faulthandler.enable(_fatal_file, all_threads=True)
+    except OSError:
+        pass
+
+
+def install_qt_handler() -> None:
+    """Grava o anel antes de o Qt abortar o processo numa mensagem fatal."""
+    from PyQt6.QtCore import QtMsgType, qInstallMessageHandler
+
+    def handler(msg_type, context, message) -> None:
+        if msg_type == QtMsgType.QtFatalMsg:
+            record("qt", "fatal", ok=False, detail=message)
+            dump("mensagem fatal do Qt", message)
+        else:
+            sys.stderr.write(message + "\n")
+
+    qInstallMessageHandler(handler)
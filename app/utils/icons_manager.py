@@ -1,37 +1,107 @@
 """
 Gerenciador de Ícones (Tabler Icons) para PyQt6
+
+Ícones renderizados ficam num cache LRU em memória, chaveado por
+(nome, tamanho, cor, device pixel ratio). Na primeira chamada é carregado o
+atlas em ``assets/icon_atlas.png`` (+ ``.json``) com os ícones mais usados já
+renderizados; o ``pytablericons`` (importação cara) só é carregado quando um
+ícone não está no cache nem no atlas. Para regerar o atlas:
+
+    python -m app.utils.icons_manager
 """
 
-from PyQt6.QtGui import QIcon, QPixmap, QImage
-from pytablericons import TablerIcons, OutlineIcon
+import json
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QGuiApplication, QIcon, QPixmap, QImage
 from PIL import Image
 
+from app.utils import metrics, startup_profile
+
+_ASSETS_DIR = Path(__file__).resolve().parents[2] / "assets"
+ATLAS_IMAGE = _ASSETS_DIR / "icon_atlas.png"
+ATLAS_INDEX = _ASSETS_DIR / "icon_atlas.json"
+
+IconKey = Tuple[str, int, str, float]
+
 
 class IconManager:
+    # Nome do ícone -> membro de pytablericons.OutlineIcon
     ICON_MAP = {
-        "adicionar": OutlineIcon.PLUS,
-        "editar": OutlineIcon.EDIT,
-        "excluir": OutlineIcon.TRASH,
-        "buscar": OutlineIcon.SEARCH,
-        "pedido": OutlineIcon.RECEIPT,
-        "clientes": OutlineIcon.USERS,
-        "servicos": OutlineIcon.TOOLS,
-        "imprimir": OutlineIcon.PRINTER,
-        "refresh": OutlineIcon.REFRESH,
-        "toggle": OutlineIcon.SWITCH,
-        "sair": OutlineIcon.LOGOUT,
-        "lista": OutlineIcon.LIST,
-        "config": OutlineIcon.SETTINGS,
-        "dashboard": OutlineIcon.CHART_BAR,
-        "ok": OutlineIcon.CHECK,
-        "x": OutlineIcon.X,
+        "adicionar": "PLUS",
+        "editar": "EDIT",
+        "excluir": "TRASH",
+        "buscar": "SEARCH",
+        "pedido": "RECEIPT",
+        "clientes": "USERS",
+        "servicos": "TOOLS",
+        "imprimir": "PRINTER",
+        "refresh": "REFRESH",
+        "toggle": "SWITCH",
+        "sair": "LOGOUT",
+        "lista": "LIST",
+        "config": "SETTINGS",
+        "dashboard": "CHART_BAR",
+        "ok": "CHECK",
+        "x": "X",
     }
+    # (tamanho, cor) usados pelas telas; entram no atlas em cada escala comum do Windows
+    ATLAS_SPECS = ((20, "#2c3e50"), (22, "#ffffff"))
+    ATLAS_RATIOS = (1.0, 1.25, 1.5, 2.0)
+    CACHE_SIZE = 256
+
+    _cache: "OrderedDict[IconKey, QIcon]" = OrderedDict()
+    _atlas: Optional[Dict[IconKey, QPixmap]] = None
+    hits = 0
+    misses = 0
 
     @classmethod
     def get_icon(cls, icon_name: str, size: int = 20, color: str = "#2c3e50") -> QIcon:
-        icon_enum = cls.ICON_MAP.get(icon_name, OutlineIcon.HELP)
-        pil_image = TablerIcons.load(icon_enum, size=size, color=color)
-        return QIcon(cls._pil_to_qpixmap(pil_image))
+        start = time.perf_counter()
+        key = (icon_name, int(size), color.lower(), cls._device_pixel_ratio())
+        icon = cls._cache.get(key)
+        if icon is not None:
+            cls._cache.move_to_end(key)
+            cls.hits += 1
+        else:
+            cls.misses += 1
+            icon = QIcon(cls._pixmap_for(key))
+            cls._cache[key] = icon
+            if len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        startup_profile.add_duration("icons", time.perf_counter() - start)
+        return icon
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._cache.clear()
+        cls.hits = cls.misses = 0
+
+    @staticmethod
+    def _device_pixel_ratio() -> float:
+        app = QGuiApplication.instance()
+        return round(float(app.devicePixelRatio()), 2) if app else 1.0
+
+    @classmethod
+    def _pixmap_for(cls, key: IconKey) -> QPixmap:
+        pixmap = cls._load_atlas().get(key)
+        if pixmap is None:
+            name, size, color, ratio = key
+            pixmap = cls._pil_to_qpixmap(cls._render(name, round(size * ratio), color))
+        pixmap.setDevicePixelRatio(key[3])
+        return pixmap
+
+    @classmethod
+    def _render(cls, icon_name: str, pixel_size: int, color: str) -> Image.Image:
+        # Importação tardia: o pytablericons leva centenas de ms para carregar
+        from pytablericons import TablerIcons, OutlineIcon
+
+        icon_enum = getattr(OutlineIcon, cls.ICON_MAP.get(icon_name, "HELP"), OutlineIcon.HELP)
+        return TablerIcons.load(icon_enum, size=pixel_size, color=color)
 
     @staticmethod
     def _pil_to_qpixmap(pil_image: Image.Image) -> QPixmap:
@@ -43,4 +113,72 @@ class IconManager:
             pil_image.height,
             QImage.Format.Format_RGBA8888,
         )
-        return QPixmap.fromImage(qimage) 
\ No newline at end of file
+        return QPixmap.fromImage(qimage)
+
+    # --------- Atlas em disco ---------
+    @staticmethod
+    def _atlas_key(key: IconKey) -> str:
+        name, size, color, ratio = key
+        return f"{name}|{size}|{color}|{ratio:g}"
+
+    @classmethod
+    def _load_atlas(cls) -> Dict[IconKey, QPixmap]:
+        if cls._atlas is not None:
+            return cls._atlas
+        cls._atlas = {}
+        try:
+            index = json.loads(ATLAS_INDEX.read_text(encoding="utf-8"))
+            sheet = QPixmap(str(ATLAS_IMAGE))
+            if sheet.isNull():
+                return cls._atlas
+            for entry, (x, y, w, h) in index["icons"].items():
+                name, size, color, ratio = entry.split("|")
+                cls._atlas[(name, int(size), color, float(ratio))] = sheet.copy(QRect(x, y, w, h))
+        except Exception:
+            # atlas é opcional: sem ele os ícones são renderizados sob demanda
+            cls._atlas = {}
+        return cls._atlas
+
+    @classmethod
+    def build_atlas(cls, specs: Iterable[Tuple[int, str]] = (), ratios: Iterable[float] = ()) -> int:
+        """Renderiza os ícones conhecidos numa única folha PNG + índice JSON.
+
+        Não depende de QApplication. Retorna quantos ícones foram gravados.
+        """
+        specs = tuple(specs) or cls.ATLAS_SPECS
+        ratios = tuple(ratios) or cls.ATLAS_RATIOS
+        images = []
+        for ratio in ratios:
+            for size, color in specs:
+                for name in cls.ICON_MAP:
+                    key = (name, int(size), color.lower(), round(float(ratio), 2))
+                    images.append((key, cls._render(name, round(size * ratio), color).convert("RGBA")))
+
+        # Empacotamento em prateleiras de largura fixa
+        sheet_width = 512
+        x = y = row_height = 0
+        placements = {}
+        for key, img in images:
+            if x + img.width > sheet_width:
+                x, y, row_height = 0, y + row_height, 0
+            placements[cls._atlas_key(key)] = (x, y, img.width, img.height)
+            x += img.width
+            row_height = max(row_height, img.height)
+        sheet = Image.new("RGBA", (sheet_width, y + row_height), (0, 0, 0, 0))
+        for key, img in images:
+            px, py, _, _ = placements[cls._atlas_key(key)]
+            sheet.paste(img, (px, py))
+
+        _ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+        sheet.save(ATLAS_IMAGE, optimize=True)
+        ATLAS_INDEX.write_text(json.dumps({"version": 1, "icons": placements}, separators=(",", ":")), encoding="utf-8")
+        cls._atlas = None
+        return len(placements)
+
+
+metrics.register_gauge("cache.icons.hit_rate", lambda: metrics.hit_rate(IconManager.hits, IconManager.misses))
+metrics.register_gauge("cache.icons.size", lambda: len(IconManager._cache))
+
+
+if __name__ == "__main__":
+    print(f"Atlas gerado com {IconManager.build_atlas()} ícones em {ATLAS_IMAGE}")
@@ -0,0 +1,56 @@
+"""Mede o atraso do event loop da UI (travamentos percebidos no balcão).
+
+Um ``QTimer`` dispara a cada ``INTERVAL_MS``; a diferença entre o intervalo
+esperado e o real é o tempo em que a thread da UI ficou ocupada. Cada atraso
+vai para o histograma ``ui.loop_lag`` e, acima de ``STALL_MS``, conta em
+``ui.stalls`` (``app.utils.metrics``). ``STALL_MS`` é o mesmo
+``UI_STALL_THRESHOLD_MS`` do watchdog, para a contagem e a tabela de pontos
+de travamento do diagnóstico falarem dos mesmos travamentos.
+
+Cada volta também é o batimento do ``StallWatchdog``, que captura a pilha da
+thread da UI quando ela passa de ``UI_STALL_THRESHOLD_MS`` sem responder.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QTimer
+
+from app.utils import metrics, stall_watchdog
+from app.utils.stall_watchdog import StallWatchdog
+
+INTERVAL_MS = 100
+# Com o watchdog desligado (0) a contagem segue no limiar padrão
+STALL_MS = stall_watchdog.THRESHOLD_MS if stall_watchdog.THRESHOLD_MS > 0 else 500.0
+
+
+class LoopLagMonitor(QObject):
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setInterval(INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+        self._last = 0.0
+        self.watchdog = StallWatchdog()
+
+    def start(self) -> None:
+        from app.data import sqlite as sqldb
+
+        self._last = time.perf_counter()
+        self._timer.start()
+        self.watchdog.start(Path(sqldb.DB_PATH).resolve().parent / "logs")
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self.watchdog.stop()
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self._last) * 1000 - INTERVAL_MS)
+        self._last = now
+        self.watchdog.beat()
+        metrics.histogram("ui.loop_lag").observe(lag_ms)
+        if lag_ms >= STALL_MS:
+            metrics.counter("ui.stalls").inc()
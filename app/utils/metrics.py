@@ -0,0 +1,195 @@
+"""Registro de métricas do app, em memória e barato de alimentar.
+
+Os subsistemas publicam aqui; o diálogo de diagnóstico (e o export em JSON)
+só lê. Três tipos:
+
+- ``histogram(nome)``: tempos em ms. Cada ``RollingHistogram`` guarda só as
+  últimas ``window`` amostras, então os números refletem o comportamento
+  recente, não a média desde que o app abriu; os percentis são calculados só
+  no ``snapshot``;
+- ``counter(nome)``: total acumulado e taxa no último minuto;
+- ``register_gauge(nome, função)``: valor lido na hora do ``snapshot`` (tamanho
+  de cache, contadores mantidos por outra classe etc.).
+
+Convenção de nomes: ``repo.*`` (repositório), ``db.*`` (consultas, com
+``app.data.profiling`` ligado), ``sync.*``, ``print.*``, ``cache.*``, ``ui.*``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import threading
+import time
+import types
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple, TypeVar
+
+from app.utils import flight_recorder
+
+# Limites superiores das faixas, em ms (a última faixa é "acima de 10 s")
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+DEFAULT_WINDOW = 1024
+
+
+class RollingHistogram:
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self._samples: Deque[float] = deque(maxlen=max(1, int(window)))
+        self._counts: List[int] = [0] * (len(BUCKETS_MS) + 1)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        with self._lock:
+            if len(self._samples) == self._samples.maxlen:
+                self._counts[bisect.bisect_left(BUCKETS_MS, self._samples[0])] -= 1
+            self._samples.append(value_ms)
+            self._counts[bisect.bisect_left(BUCKETS_MS, value_ms)] += 1
+            self._total += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._samples)
+            counts = list(self._counts)
+            total = self._total
+        if not samples:
+            return {"count": 0, "total": total}
+
+        def pct(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 3)
+
+        labels = [f"<={b:g}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]:g}"]
+        return {
+            "count": len(samples),
+            "total": total,
+            "mean": round(sum(samples) / len(samples), 3),
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+            "max": round(samples[-1], 3),
+            "buckets": {label: n for label, n in zip(labels, counts) if n},
+        }
+
+
+class Counter:
+    RATE_WINDOW_S = 60.0
+
+    def __init__(self) -> None:
+        self._total = 0
+        self._recent: Deque[Tuple[float, int]] = deque(maxlen=10_000)
+        self._lock = threading.Lock()
+
+    def inc(self, n: int = 1) -> None:
+        with self._lock:
+            self._total += n
+            self._recent.append((time.monotonic(), n))
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    def snapshot(self) -> Dict[str, Any]:
+        cutoff = time.monotonic() - self.RATE_WINDOW_S
+        with self._lock:
+            while self._recent and self._recent[0][0] < cutoff:
+                self._recent.popleft()
+            last_minute = sum(n for _, n in self._recent)
+            return {"total": self._total, "last_min": last_minute}
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._counters: Dict[str, Counter] = {}
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> RollingHistogram:
+        hist = self._histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(name, RollingHistogram())
+        return hist
+
+    def counter(self, name: str) -> Counter:
+        counter = self._counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(name, Counter())
+        return counter
+
+    def register_gauge(self, name: str, fn: Callable[[], Any]) -> None:
+        with self._lock:
+            self._gauges[name] = fn
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+        gauge_values: Dict[str, Any] = {}
+        for name, fn in gauges:
+            try:
+                gauge_values[name] = fn()
+            except Exception as exc:
+                gauge_values[name] = f"erro: {exc}"
+        return {
+            "histograms": {name: hist.snapshot() for name, hist in histograms},
+            "counters": {name: counter.snapshot() for name, counter in counters},
+            "gauges": gauge_values,
+        }
+
+    def reset(self) -> None:
+        """Zera histogramas e contadores (os medidores continuam registrados)."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+registry = MetricsRegistry()
+histogram = registry.histogram
+counter = registry.counter
+register_gauge = registry.register_gauge
+snapshot = registry.snapshot
+reset = registry.reset
+
+
+def hit_rate(hits: int, misses: int) -> float | None:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+_C = TypeVar("_C", bound=type)
+
+
+def timed_methods(prefix: str) -> Callable[[_C], _C]:
+    """Decorador de classe: mede cada método público em ``<prefix>.<método>``.
+
+    Cada chamada também entra no gravador de voo (``app.utils.flight_recorder``).
+    """
+
+    def wrap(method: Callable, hist_name: str, name: str) -> Callable:
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            ok = False
+            try:
+                result = method(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                ms = (time.perf_counter() - t0) * 1000
+                # Busca pelo nome a cada chamada: continua valendo depois de ``reset``
+                histogram(hist_name).observe(ms)
+                flight_recorder.record(prefix, name, ms, ok)
+
+        return timed
+
+    def decorate(cls: _C) -> _C:
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_") or not isinstance(attr, types.FunctionType):
+                continue
+            setattr(cls, name, wrap(attr, f"{prefix}.{name}", name))
+        return cls
+
+    return decorate
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Optional
+
+
+class PeriodicJob:
+    """Executa ``fn`` numa thread própria a cada ``interval_s`` segundos.
+
+    Segue o mesmo ciclo de vida do ``SyncManager`` (start/stop, espera com
+    ``Event.wait``). Exceções de ``fn`` são ignoradas para não matar a thread;
+    a função deve registrar seus próprios erros.
+    """
+
+    def __init__(self, name: str, interval_s: float, fn: Callable[[], object], initial_delay_s: float = 0.0) -> None:
+        self.name = name
+        self._interval_s = max(1.0, float(interval_s))
+        self._initial_delay_s = max(0.0, float(initial_delay_s))
+        self._fn = fn
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 3.0) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def stopping(self) -> bool:
+        """Para tarefas longas interromperem o trabalho quando o app fecha."""
+        return self._stop_event.is_set()
+
+    def _loop(self) -> None:
+        if self._stop_event.wait(self._initial_delay_s):
+            return
+        while not self._stop_event.is_set():
+            try:
+                self._fn()
+            except Exception:
+                pass
+            self._stop_event.wait(self._interval_s)
@@ -0,0 +1,257 @@
+"""Fila de impressão: recibos saem da thread da UI e sobrevivem a reinícios.
+
+``spooler.submit_receipt(recibo)`` (``receipt_template``) grava o trabalho na
+tabela ``print_jobs`` e volta na hora. Uma thread própria pega os trabalhos em ordem,
+monta o recibo numa imagem só (``receipt_renderer``) ou, com
+``THERMAL_PRINTER_RASTER`` desligado, em ESC/POS, e envia para a impressora.
+
+- O envio roda numa thread de E/S separada, esperada por até
+  ``JOB_TIMEOUT_S``: um driver USB travado não prende a fila nem a UI. Enquanto
+  aquela thread não voltar, a impressora é tratada como ocupada.
+- Falhas (impressora desligada, sem papel, sem resposta) são repetidas após
+  ``BACKOFF_S``; depois de ``MAX_ATTEMPTS`` o trabalho fica ``failed`` e o
+  recibo é salvo em ``recibo.txt`` para não se perder.
+- Sem impressora configurada, o recibo vai direto para ``recibo.txt``.
+- Um erro inesperado fora do envio (ex.: banco travado ao concluir o
+  trabalho) vai para o flight recorder e o trabalho volta à fila; a thread
+  da fila não morre.
+- A conexão com a impressora fica aberta entre recibos
+  (``thermal_printer.printer_session``).
+
+O andamento chega à UI pelos sinais ``job_queued``, ``job_started`` e
+``job_finished`` (entregues na thread da UI). Tempos em ``print.job``
+(da entrada na fila até sair impresso).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from app.config import settings as app_settings
+from app.data import sqlite as sqldb
+from app.utils import flight_recorder, metrics
+
+MAX_ATTEMPTS = 5
+BACKOFF_S = (2, 5, 15, 30)
+JOB_TIMEOUT_S = 30.0
+POLL_S = 1.0
+FALLBACK_FILE = "recibo.txt"
+
+
+class PrintError(Exception):
+    pass
+
+
+def _write_fallback(payload: Dict[str, Any]) -> str:
+    from app.views.components.qr_barcode_utils import barcode_image, qr_image
+
+    lines = [payload.get("text", "").rstrip("\n")]
+    order_code = payload.get("order_code")
+    if order_code:
+        # Sobrescritos a cada recibo, como o recibo.txt
+        qr_image(order_code).save("recibo_qr.png")
+        barcode_image(order_code).save("recibo_barcode.png")
+        lines += [
+            f"QR: {os.path.abspath('recibo_qr.png')}",
+            f"Barcode: {os.path.abspath('recibo_barcode.png')}",
+            "(Use um app de QR/código de barras no celular para identificar o pedido)",
+        ]
+    with open(FALLBACK_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return FALLBACK_FILE
+
+
+def _print(printer, payload: Dict[str, Any]) -> str:
+    from app.views.components.qr_barcode_utils import barcode_image, qr_image
+    from app.views.components.receipt_renderer import render_receipt
+    from app.views.components.receipt_template import Receipt
+
+    if not printer.available():
+        raise PrintError(f"impressora indisponível: {printer.last_error or 'não encontrada'}")
+    order_code = payload.get("order_code")
+    if app_settings.get_settings().get("THERMAL_PRINTER_RASTER", True):
+        # Recibo inteiro (logo, texto e códigos) numa imagem só, já em 1 bit
+        if not printer.print_image(render_receipt(payload.get("text", ""), order_code)):
+            raise PrintError(f"falha ao enviar o recibo: {printer.last_error}")
+        printer.cut()
+        return "impressora"
+    if "lines" in payload:
+        # Mesmo modelo, nas fontes e códigos nativos da impressora
+        if not printer.print_raw(Receipt.from_payload(payload).escpos()):
+            raise PrintError(f"falha ao enviar o recibo: {printer.last_error}")
+        printer.cut()
+        return "impressora"
+    if not printer.print_text(payload.get("text", "")):
+        raise PrintError(f"falha ao enviar o texto: {printer.last_error}")
+    if order_code:
+        for img in (qr_image(order_code), barcode_image(order_code)):
+            if not printer.print_image(img):
+                raise PrintError(f"falha ao enviar a imagem: {printer.last_error}")
+    printer.cut()
+    return "impressora"
+
+
+def _send(payload: Dict[str, Any]) -> str:
+    """Imprime ``payload``; devolve o destino. Erros viram ``PrintError``."""
+    from app.views.components.thermal_printer import ThermalPrinter, printer_session
+
+    if not ThermalPrinter.configured():
+        return _write_fallback(payload)
+    # Conexão reaproveitada entre recibos; se não abrir, tenta abrir mais uma vez
+    return printer_session.run(lambda printer: _print(printer, payload))
+
+
+class PrintSpooler(QObject):
+    job_queued = pyqtSignal(int)
+    job_started = pyqtSignal(int, int)  # id, tentativa
+    # id, status (done/pending/failed), ms desde a entrada na fila, destino ou erro
+    job_finished = pyqtSignal(int, str, float, str)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._io: Optional[threading.Thread] = None
+        # Trabalhos que não conseguiram voltar à fila após um erro inesperado: (id, tentativa, erro)
+        self._unreleased: Dict[int, Tuple[int, str]] = {}
+
+    def submit(self, text: str, order_code: Optional[str] = None) -> int:
+        return self._enqueue({"text": text, "order_code": order_code})
+
+    def submit_receipt(self, receipt) -> int:
+        """Enfileira um ``receipt_template.Receipt`` (texto, linhas com estilo e código)."""
+        return self._enqueue(receipt.payload())
+
+    def _enqueue(self, payload: Dict[str, Any]) -> int:
+        job_id = sqldb.enqueue_print_job(payload)
+        self.job_queued.emit(job_id)
+        self._wake.set()
+        return job_id
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="print-spooler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 3.0) -> None:
+        from app.views.components.thermal_printer import printer_session
+
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        if self._io is None or not self._io.is_alive():
+            printer_session.close()
+
+    def _loop(self) -> None:
+        try:
+            sqldb.requeue_print_jobs()
+        except Exception:
+            pass
+        while not self._stop_event.is_set():
+            self._release_unreleased()
+            try:
+                job = sqldb.claim_print_job(time.time())
+            except Exception:
+                job = None
+            if job is None:
+                self._wake.wait(POLL_S)
+                self._wake.clear()
+                continue
+            try:
+                self._run(*job)
+            except Exception as exc:
+                # Erro fora do envio (ex.: banco travado em finish_print_job): a thread
+                # segue viva e o trabalho não fica preso em ``printing``
+                job_id, attempt = job[0], job[2]
+                flight_recorder.record("print", "spooler", ok=False, detail=f"#{job_id} tentativa {attempt}: {exc!r}")
+                self._unreleased[job_id] = (attempt, f"erro interno da fila: {exc}")
+                self._release_unreleased()
+
+    def _release_unreleased(self) -> None:
+        """Devolve à fila (ou encerra, se esgotou as tentativas) os trabalhos interrompidos."""
+        for job_id, (attempt, error) in list(self._unreleased.items()):
+            try:
+                if attempt < MAX_ATTEMPTS:
+                    retry_at = time.time() + BACKOFF_S[min(attempt, len(BACKOFF_S)) - 1]
+                    sqldb.finish_print_job(job_id, False, None, error, retry_at=retry_at)
+                    status = sqldb.PRINT_PENDING
+                else:
+                    sqldb.finish_print_job(job_id, False, None, error)
+                    status = sqldb.PRINT_FAILED
+            except Exception:
+                continue  # banco ainda indisponível: tenta de novo na próxima volta
+            del self._unreleased[job_id]
+            self.job_finished.emit(job_id, status, 0.0, error)
+
+    def _attempt(self, payload: Dict[str, Any]) -> str:
+        from app.views.components.thermal_printer import printer_session
+
+        if self._io is not None and self._io.is_alive():
+            raise PrintError("impressora ainda presa no trabalho anterior")
+        result: Dict[str, Any] = {}
+
+        def target() -> None:
+            try:
+                result["dest"] = _send(payload)
+            except Exception as exc:
+                result["error"] = exc
+
+        self._io = threading.Thread(target=target, name="print-io", daemon=True)
+        self._io.start()
+        self._io.join(JOB_TIMEOUT_S)
+        if self._io.is_alive():
+            # A conexão presa é descartada quando a thread de E/S voltar
+            printer_session.reset()
+            raise PrintError(f"impressora não respondeu em {JOB_TIMEOUT_S:.0f} s")
+        if "error" in result:
+            exc = result["error"]
+            raise exc if isinstance(exc, PrintError) else PrintError(str(exc))
+        return result["dest"]
+
+    def _run(self, job_id: int, payload: Dict[str, Any], attempt: int, created_at_iso: str) -> None:
+        self.job_started.emit(job_id, attempt)
+        t0 = time.perf_counter()
+        try:
+            dest = self._attempt(payload)
+        except PrintError as exc:
+            self._failed(job_id, payload, attempt, created_at_iso, str(exc), t0)
+            return
+        latency_ms = self._since(created_at_iso)
+        sqldb.finish_print_job(job_id, True, latency_ms)
+        metrics.histogram("print.job").observe(latency_ms)
+        flight_recorder.record("print", "job", (time.perf_counter() - t0) * 1000, True, f"#{job_id} → {dest}")
+        self.job_finished.emit(job_id, sqldb.PRINT_DONE, latency_ms, dest)
+
+    def _failed(self, job_id: int, payload: Dict[str, Any], attempt: int, created_at_iso: str, error: str, t0: float) -> None:
+        flight_recorder.record("print", "job", (time.perf_counter() - t0) * 1000, False, f"#{job_id} tentativa {attempt}: {error}")
+        latency_ms = self._since(created_at_iso)
+        if attempt < MAX_ATTEMPTS:
+            retry_at = time.time() + BACKOFF_S[min(attempt, len(BACKOFF_S)) - 1]
+            sqldb.finish_print_job(job_id, False, None, error, retry_at=retry_at)
+            self.job_finished.emit(job_id, sqldb.PRINT_PENDING, latency_ms, error)
+            return
+        metrics.counter("print.job_failed").inc()
+        try:
+            error += f" (recibo salvo em {_write_fallback(payload)})"
+        except OSError:
+            pass
+        sqldb.finish_print_job(job_id, False, latency_ms, error)
+        self.job_finished.emit(job_id, sqldb.PRINT_FAILED, latency_ms, error)
+
+    @staticmethod
+    def _since(created_at_iso: str) -> float:
+        created = datetime.fromisoformat(created_at_iso)
+        return max(0.0, (datetime.now(created.tzinfo) - created).total_seconds() * 1000)
+
+
+spooler = PrintSpooler()
@@ -0,0 +1,206 @@
+"""Catálogo de serviços em memória, com índices por tipo, subtipo e palavras do nome.
+
+A tabela ``services`` é pequena e muda pouco: é lida uma vez e só volta ao banco
+quando o catálogo é invalidado. Alterações feitas pelo ``ServiceController`` são
+aplicadas direto aqui, sem recarregar.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from dataclasses import replace
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.models.order import OrderItem
+from app.models.service import Service
+from app.utils import metrics
+from app.utils.client_index import normalize_text
+
+# Quantos usos recentes são lembrados para ordenar as sugestões
+RECENT_LIMIT = 50
+
+ItemKey = Tuple[str, str, Optional[str]]
+
+
+class ServiceCatalog:
+    def __init__(
+        self,
+        loader: Callable[[], List[Service]],
+        recent_loader: Optional[Callable[[], List[ItemKey]]] = None,
+    ) -> None:
+        # ``loader`` deve trazer também os inativos; o filtro é feito aqui
+        self._loader = loader
+        self._recent_loader = recent_loader
+        self._services: Dict[str, Service] = {}
+        self._order: List[str] = []  # ids na ordem do banco
+        self._by_type: Dict[str, List[str]] = {}
+        self._by_subtype: Dict[str, List[str]] = {}
+        self._tokens: List[Tuple[str, str]] = []  # (palavra normalizada, service_id)
+        self._recent: List[str] = []  # ids, mais recente primeiro
+        self._stale = True
+        self._lock = threading.RLock()
+
+    # --------- Manutenção ---------
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def ensure_fresh(self) -> None:
+        with self._lock:
+            if self._stale:
+                metrics.counter("cache.services.rebuild").inc()
+                self._reload()
+
+    def _reload(self) -> None:
+        services = self._loader()
+        self._services = {s.id: s for s in services if s.id}
+        self._order = [s.id for s in services if s.id]
+        self._reindex()
+        if self._recent_loader is not None and not self._recent:
+            self._recent = self._ids_for_items(self._recent_loader())
+        self._stale = False
+
+    def _reindex(self) -> None:
+        by_type: Dict[str, List[str]] = {}
+        by_subtype: Dict[str, List[str]] = {}
+        tokens: List[Tuple[str, str]] = []
+        for sid in self._order:
+            svc = self._services[sid]
+            by_type.setdefault(svc.type, []).append(sid)
+            if svc.subtype:
+                by_subtype.setdefault(normalize_text(svc.subtype), []).append(sid)
+            tokens.extend((tok, sid) for tok in self._tokens_for(svc))
+        tokens.sort()
+        self._by_type, self._by_subtype, self._tokens = by_type, by_subtype, tokens
+
+    def put(self, service: Service) -> None:
+        """Inclui ou substitui um serviço (após upsert/alteração no banco)."""
+        with self._lock:
+            if self._stale or not service.id:
+                return
+            if service.id not in self._services:
+                self._order.append(service.id)
+            # Cópia: a view pode alterar o objeto que tem em mãos
+            self._services[service.id] = replace(service)
+            self._reindex()
+
+    def set_active(self, service_id: str, active: bool) -> None:
+        with self._lock:
+            svc = self._services.get(service_id)
+            if svc is not None:
+                svc.active = bool(active)
+
+    def set_price(self, service_id: str, price_cents: int) -> None:
+        with self._lock:
+            svc = self._services.get(service_id)
+            if svc is not None:
+                svc.price_cents = int(price_cents)
+
+    # --------- Consulta ---------
+    def services(self, include_inactive: bool = False) -> List[Service]:
+        with self._lock:
+            self.ensure_fresh()
+            return [
+                self._services[sid] for sid in self._order
+                if include_inactive or self._services[sid].active
+            ]
+
+    def get(self, service_id: str) -> Optional[Service]:
+        with self._lock:
+            self.ensure_fresh()
+            return self._services.get(service_id)
+
+    def types(self) -> List[str]:
+        with self._lock:
+            self.ensure_fresh()
+            return sorted(self._by_type)
+
+    def by_type(self, type_: str, include_inactive: bool = False) -> List[Service]:
+        with self._lock:
+            self.ensure_fresh()
+            return self._filter(self._by_type.get(type_, ()), include_inactive)
+
+    def by_subtype(self, subtype: str, include_inactive: bool = False) -> List[Service]:
+        with self._lock:
+            self.ensure_fresh()
+            return self._filter(self._by_subtype.get(normalize_text(subtype), ()), include_inactive)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Service]:
+        """Serviços ativos em que cada palavra da consulta é prefixo de alguma palavra
+        do nome, tipo ou subtipo. Os usados recentemente vêm primeiro."""
+        with self._lock:
+            self.ensure_fresh()
+            words = normalize_text(query).split()
+            if words:
+                matched: Optional[Set[str]] = None
+                for word in words:
+                    ids = self._prefix_ids(word)
+                    matched = ids if matched is None else matched & ids
+                    if not matched:
+                        return []
+                candidates = [sid for sid in self._order if sid in matched]
+            else:
+                candidates = list(self._order)
+            result = self._rank(self._filter(candidates, include_inactive=False))
+            return result if limit is None else result[:limit]
+
+    # --------- Uso ---------
+    def mark_used(self, service_id: str) -> None:
+        with self._lock:
+            if service_id in self._recent:
+                self._recent.remove(service_id)
+            self._recent.insert(0, service_id)
+            del self._recent[RECENT_LIMIT:]
+
+    def make_item(self, service_id: str, quantity: int = 1) -> Optional[OrderItem]:
+        """Monta o item de pedido a partir do catálogo e registra o uso."""
+        svc = self.get(service_id)
+        if svc is None:
+            return None
+        self.mark_used(service_id)
+        return OrderItem(
+            service_name=svc.name,
+            service_type=svc.type,
+            service_subtype=svc.subtype,
+            unit_price_cents=int(svc.price_cents),
+            quantity=int(quantity),
+        )
+
+    # --------- Internos ---------
+    def _prefix_ids(self, prefix: str) -> Set[str]:
+        found: Set[str] = set()
+        pos = bisect_left(self._tokens, (prefix, ""))
+        while pos < len(self._tokens) and self._tokens[pos][0].startswith(prefix):
+            found.add(self._tokens[pos][1])
+            pos += 1
+        return found
+
+    def _filter(self, ids: Iterable[str], include_inactive: bool) -> List[Service]:
+        return [self._services[sid] for sid in ids if include_inactive or self._services[sid].active]
+
+    def _rank(self, services: List[Service]) -> List[Service]:
+        rank = {sid: pos for pos, sid in enumerate(self._recent)}
+        fallback = len(rank)
+        # sort estável: fora dos recentes mantém a ordem do banco
+        return sorted(services, key=lambda s: rank.get(s.id, fallback))
+
+    def _ids_for_items(self, items: List[ItemKey]) -> List[str]:
+        by_key = {(s.name, s.type, s.subtype or None): s.id for s in self._services.values()}
+        recent: List[str] = []
+        for name, type_, subtype in items:
+            sid = by_key.get((name, type_, subtype or None))
+            if sid and sid not in recent:
+                recent.append(sid)
+                if len(recent) >= RECENT_LIMIT:
+                    break
+        return recent
+
+    @staticmethod
+    def _tokens_for(svc: Service) -> Set[str]:
+        text = " ".join(filter(None, (svc.name, svc.type.replace("_", " "), svc.subtype)))
+        return set(normalize_text(text).split())
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.ensure_fresh()
+            return len(self._services)
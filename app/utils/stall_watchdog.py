@@ -0,0 +1,194 @@
+"""Vigia da thread da UI: quando o event loop para de responder, guarda a pilha.
+
+O ``LoopLagMonitor`` chama ``beat()`` a cada volta do event loop. Uma thread
+à parte confere o último batimento; passado ``UI_STALL_THRESHOLD_MS`` sem
+resposta, ela amostra a pilha Python da thread principal
+(``sys._current_frames()``) a cada ``SAMPLE_MS`` até o loop voltar. Cada
+travamento é atribuído ao ponto do código do app que mais apareceu nas
+amostras (a chamada para SQL, matplotlib, PIL ou impressora fica logo abaixo).
+
+Os travamentos são agregados por ponto de chamada (``top_sites()``, exibido no
+diagnóstico) e gravados em ``logs/ui_stalls.log`` ao lado do banco, uma linha
+JSON por travamento. Não importa Qt.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter as _Tally
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings as app_settings
+from app.utils import flight_recorder, metrics
+
+THRESHOLD_MS: float = float(app_settings.get_settings().get("UI_STALL_THRESHOLD_MS", 500))
+POLL_MS = 50
+SAMPLE_MS = 100
+# Travamento que não termina (app prestes a ser fechado à força): registra mesmo assim
+ONGOING_LOG_S = 10.0
+MAX_STACK_FRAMES = 40
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+_SITE_PACKAGES = ("site-packages", "dist-packages")
+
+_logger = logging.getLogger("myrthes.ui_stalls")
+_logger.propagate = False
+_lock = threading.Lock()
+_sites: Dict[str, Dict[str, Any]] = {}
+
+
+def _is_app_file(filename: str) -> bool:
+    return filename.startswith(_PROJECT_ROOT) and not any(p in filename for p in _SITE_PACKAGES)
+
+
+def _frame_label(filename: str, lineno: int, name: str) -> str:
+    if filename.startswith(_PROJECT_ROOT):
+        filename = os.path.relpath(filename, _PROJECT_ROOT)
+    return f"{filename.replace(os.sep, '/')}:{lineno} in {name}"
+
+
+def _call_site(stack: traceback.StackSummary) -> str:
+    """Frame mais interno que pertence ao app (onde ele chamou o que travou)."""
+    for fs in reversed(stack):
+        if _is_app_file(fs.filename):
+            return _frame_label(fs.filename, fs.lineno or 0, fs.name)
+    fs = stack[-1]
+    return _frame_label(fs.filename, fs.lineno or 0, fs.name)
+
+
+class _Stall:
+    __slots__ = ("started", "samples", "stacks", "logged")
+
+    def __init__(self, started: float) -> None:
+        self.started = started
+        self.samples: _Tally[str] = _Tally()
+        self.stacks: Dict[str, List[str]] = {}
+        self.logged = False
+
+
+class StallWatchdog:
+    def __init__(self, threshold_ms: float = THRESHOLD_MS) -> None:
+        self.threshold_ms = float(threshold_ms)
+        self._beat = time.monotonic()
+        self._main_ident = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stall: Optional[_Stall] = None
+        self._log_dir: Optional[Path] = None
+
+    def beat(self) -> None:
+        """Chamado pela thread da UI a cada volta do event loop."""
+        self._beat = time.monotonic()
+
+    def start(self, log_dir: Optional[Path] = None) -> None:
+        if self.threshold_ms <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._log_dir = log_dir
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ui-stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+
+    def _run(self) -> None:
+        next_sample = 0.0
+        while not self._stop.wait(POLL_MS / 1000):
+            now = time.monotonic()
+            beat = self._beat
+            stall = self._stall
+            if stall is not None and beat > stall.started:
+                self._finish(stall, (beat - stall.started) * 1000)
+                self._stall = None
+                continue
+            if (now - beat) * 1000 < self.threshold_ms:
+                continue
+            if stall is None:
+                stall = self._stall = _Stall(beat)
+                next_sample = now
+            if now >= next_sample:
+                self._sample(stall)
+                next_sample = now + SAMPLE_MS / 1000
+            if not stall.logged and now - beat >= ONGOING_LOG_S:
+                stall.logged = True
+                self._write(stall, (now - beat) * 1000, ongoing=True)
+                # Provável travamento de vez (impressora, rede): guarda o que levou a ele
+                site = stall.samples.most_common(1)[0][0] if stall.samples else None
+                flight_recorder.dump(f"interface sem resposta há {now - beat:.0f} s", "\n".join(stall.stacks.get(site, [])))
+
+    def _sample(self, stall: _Stall) -> None:
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame, limit=MAX_STACK_FRAMES)
+        if not stack:
+            return
+        site = _call_site(stack)
+        stall.samples[site] += 1
+        stall.stacks.setdefault(site, [_frame_label(fs.filename, fs.lineno or 0, fs.name) for fs in stack])
+
+    def _finish(self, stall: _Stall, duration_ms: float) -> None:
+        metrics.histogram("ui.stall").observe(duration_ms)
+        if not stall.samples:
+            return
+        site = stall.samples.most_common(1)[0][0]
+        with _lock:
+            agg = _sites.setdefault(site, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            agg["count"] += 1
+            agg["total_ms"] += duration_ms
+            agg["max_ms"] = max(agg["max_ms"], duration_ms)
+            agg["last_at"] = datetime.now(timezone.utc).isoformat()
+            agg["stack"] = stall.stacks[site]
+        self._write(stall, duration_ms, ongoing=False)
+
+    def _write(self, stall: _Stall, duration_ms: float, ongoing: bool) -> None:
+        site = stall.samples.most_common(1)[0][0] if stall.samples else None
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "ms": round(duration_ms, 1),
+            "ongoing": ongoing,
+            "site": site,
+            "samples": dict(stall.samples),
+            "stack": stall.stacks.get(site, []) if site else [],
+        }
+        try:
+            with _lock:
+                if not _logger.handlers:
+                    log_dir = self._log_dir or Path(_PROJECT_ROOT) / "logs"
+                    log_dir.mkdir(parents=True, exist_ok=True)
+                    handler = RotatingFileHandler(log_dir / "ui_stalls.log", maxBytes=1024 * 1024, backupCount=3, encoding="utf-8")
+                    handler.setFormatter(logging.Formatter("%(message)s"))
+                    _logger.addHandler(handler)
+                    _logger.setLevel(logging.INFO)
+            _logger.info(json.dumps(entry, ensure_ascii=False))
+        except OSError:
+            # Sem onde gravar: o agregado em memória continua valendo
+            pass
+
+
+def top_sites(limit: int = 20) -> List[Dict[str, Any]]:
+    """Pontos de chamada com mais tempo travado, do pior para o melhor."""
+    with _lock:
+        items = [dict(site=site, **agg) for site, agg in _sites.items()]
+    items.sort(key=lambda s: s["total_ms"], reverse=True)
+    for item in items:
+        item["total_ms"] = round(item["total_ms"], 1)
+        item["max_ms"] = round(item["max_ms"], 1)
+    return items[:limit]
+
+
+def reset() -> None:
+    with _lock:
+        _sites.clear()
@@ -0,0 +1,75 @@
+"""Marcações de tempo da inicialização do app (opt-in).
+
+Ativado pela variável de ambiente ``MYRTHES_STARTUP_PROFILE`` com o caminho de
+um arquivo JSON. Com ela definida, ``main.py`` registra cada etapa, grava o
+arquivo após a primeira pintura da janela e encerra o app (usado por
+``benchmarks/bench_startup.py``). Sem a variável, ``mark`` não faz nada.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+_T0 = time.perf_counter()
+_OUTPUT: Optional[str] = os.environ.get("MYRTHES_STARTUP_PROFILE") or None
+_MARKS: Dict[str, float] = {}
+_TOTALS: Dict[str, float] = {}
+_FINISH_AFTER = ("first_paint", "current_tab_ready")
+_watchers: list = []
+
+
+def enabled() -> bool:
+    return _OUTPUT is not None
+
+
+def mark(name: str) -> None:
+    """Registra o instante (ms desde a importação deste módulo) de uma etapa."""
+    if _OUTPUT is None or name in _MARKS:
+        return
+    _MARKS[name] = round((time.perf_counter() - _T0) * 1000, 2)
+    if all(k in _MARKS for k in _FINISH_AFTER):
+        _finish()
+
+
+def add_duration(name: str, seconds: float) -> None:
+    """Acumula o tempo gasto numa atividade repetida (ex.: renderização de ícones)."""
+    if _OUTPUT is None or _MARKS.keys() >= set(_FINISH_AFTER):
+        return
+    _TOTALS[name] = _TOTALS.get(name, 0.0) + seconds * 1000
+
+
+def marks() -> Dict[str, float]:
+    return dict(_MARKS)
+
+
+def watch_first_paint(widget: Any) -> None:
+    """Marca ``first_paint`` no primeiro evento de pintura de ``widget``."""
+    if _OUTPUT is None:
+        return
+    from PyQt6.QtCore import QEvent, QObject
+
+    class _PaintWatcher(QObject):
+        def eventFilter(self, obj, event):  # type: ignore[override]
+            if event.type() == QEvent.Type.Paint:
+                obj.removeEventFilter(self)
+                mark("first_paint")
+            return False
+
+    watcher = _PaintWatcher()
+    widget.installEventFilter(watcher)
+    _watchers.append(watcher)
+
+
+def _finish() -> None:
+    try:
+        with open(_OUTPUT, "w", encoding="utf-8") as f:
+            json.dump({"marks": _MARKS, "totals": {k: round(v, 2) for k, v in _TOTALS.items()}}, f)
+    finally:
+        from PyQt6.QtCore import QTimer
+        from PyQt6.QtWidgets import QApplication
+
+        if QApplication.instance() is not None:
+            QTimer.singleShot(0, QApplication.instance().quit)
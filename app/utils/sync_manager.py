@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
 import socket
 import threading
 import time
-from typing import Optional
+from typing import Optional, Union
 
 from app.data.sqlite import delete_sync_item, read_sync_batch
+from app.data.sync_codec import decode_payload
+from app.utils import flight_recorder, metrics, tracing
 
 
 def is_online(timeout_seconds: float = 2.0) -> bool:
@@ -44,34 +45,52 @@ class SyncManager:
                     self._flush_once()
                 except Exception:
                     pass
-            time.sleep(5)
+            # wait() em vez de sleep(): stop() não precisa esperar o intervalo inteiro
+            self._stop_event.wait(5)
 
+    @tracing.traced("sync.flush")
     def _flush_once(self) -> None:
         batch = read_sync_batch(50)
         if not batch:
             return
+        t0 = time.perf_counter()
+        sent = 0
         for item_id, entity, action, payload in batch:
             ok = self._apply_remote(entity, action, payload)
             if ok:
                 delete_sync_item(item_id)
+                sent += 1
+        self._record(len(batch), sent, t0)
 
     # API pública para forçar flush manual (usada no diálogo de sincronização)
+    @tracing.traced("sync.flush_now")
     def flush_now(self) -> int:
         """Força envio imediato da fila. Retorna quantos itens foram enviados com sucesso."""
         sent = 0
         batch = read_sync_batch(500)
         if not batch:
             return 0
+        t0 = time.perf_counter()
         for item_id, entity, action, payload in batch:
             ok = self._apply_remote(entity, action, payload)
             if ok:
                 delete_sync_item(item_id)
                 sent += 1
+        self._record(len(batch), sent, t0)
         return sent
 
-    def _apply_remote(self, entity: str, action: str, payload: str) -> bool:
+    @staticmethod
+    def _record(batch_size: int, sent: int, t0: float) -> None:
+        ms = (time.perf_counter() - t0) * 1000
+        metrics.histogram("sync.flush").observe(ms)
+        flight_recorder.record("sync", "flush", ms, sent == batch_size, f"{sent}/{batch_size} enviados")
+        metrics.counter("sync.sent").inc(sent)
+        if batch_size > sent:
+            metrics.counter("sync.failed").inc(batch_size - sent)
+
+    def _apply_remote(self, entity: str, action: str, payload: Union[str, bytes]) -> bool:
         try:
-            data = json.loads(payload)
+            data = decode_payload(payload)
             if entity == "service":
                 col = self._db.collection("services")
                 if action in ("upsert", "update_price"):
@@ -118,6 +137,11 @@ class SyncManager:
                         "status": data.get("status"),
                         "delivered_at_iso": data.get("delivered_at_iso")
                     })
+                elif action == "delete":
+                    doc_id = data.get("id")
+                    # Pedido "local:" foi enviado com add(); não há id remoto para remover
+                    if doc_id and not str(doc_id).startswith("local:"):
+                        col.document(doc_id).delete()
                 return True
             if entity == "inventory":
                 col = self._db.collection("inventory")
@@ -134,5 +158,6 @@ class SyncManager:
                     col.document(doc_id).set({"quantity": data.get("delta")}, merge=True)
                 return True
             return True
-        except Exception:
+        except Exception as exc:
+            flight_recorder.record("sync", f"{entity}/{action}", ok=False, detail=repr(exc))
             return False
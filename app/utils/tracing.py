@@ -0,0 +1,178 @@
+"""Rastreamento de operações entre camadas (view → controlador → repositório → SQLite).
+
+Desligado por padrão. Liga com ``TRACE_ENABLED`` nas configurações, com a
+variável de ambiente ``MYRTHES_TRACE=1`` ou, em tempo de execução, com
+``set_enabled(True)`` (caixa no diálogo de diagnóstico). Desligado, ``span``
+devolve um contexto vazio e os métodos decorados só testam ``ENABLED``.
+
+Ligado, cada ``with span("nome")`` vira um trecho com início, duração, thread
+e o trecho pai (o que estava aberto no mesmo contexto, via ``contextvars``).
+Os trechos terminados ficam num buffer de ``MAX_SPANS`` e ``export_chrome``
+grava o formato Trace Event do Chrome, que abre em ``chrome://tracing`` ou no
+Perfetto (https://ui.perfetto.dev).
+
+Nomes seguem o prefixo da camada: ``ui.*``, ``controller.*``, ``repo.*``,
+``db.*``, ``codes.*`` (QR/código de barras), ``print.*``, ``sync.*``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import types
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+from app.config import settings as app_settings
+
+ENABLED: bool = bool(app_settings.get_settings().get("TRACE_ENABLED")) or os.environ.get("MYRTHES_TRACE") == "1"
+MAX_SPANS = 20_000
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("myrthes_span", default=None)
+_finished: Deque["Span"] = deque(maxlen=MAX_SPANS)
+_ids = itertools.count(1)
+_T0 = time.perf_counter()
+
+
+class Span:
+    __slots__ = ("id", "parent_id", "name", "start", "end", "thread_id", "thread_name", "args")
+
+    def __init__(self, name: str, parent: Optional["Span"], args: Dict[str, Any]) -> None:
+        self.id = next(_ids)
+        self.parent_id = parent.id if parent is not None else None
+        self.name = name
+        thread = threading.current_thread()
+        self.thread_id = thread.ident or 0
+        self.thread_name = thread.name
+        self.args = args
+        self.start = time.perf_counter()
+        self.end = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+    def set(self, **args: Any) -> None:
+        """Anexa atributos ao trecho (aparecem em ``args`` no visualizador)."""
+        self.args.update(args)
+
+
+def set_enabled(on: bool) -> None:
+    global ENABLED
+    ENABLED = bool(on)
+
+
+@contextlib.contextmanager
+def _open(name: str, args: Dict[str, Any]) -> Iterator[Span]:
+    span_ = Span(name, _current.get(), args)
+    token = _current.set(span_)
+    try:
+        yield span_
+    except BaseException as exc:
+        span_.args["error"] = type(exc).__name__
+        raise
+    finally:
+        span_.end = time.perf_counter()
+        _current.reset(token)
+        _finished.append(span_)
+
+
+def span(name: str, **args: Any) -> contextlib.AbstractContextManager:
+    """``with span("ui.new_order", itens=3) as s:`` — ``s`` é ``None`` se desligado."""
+    if not ENABLED:
+        return contextlib.nullcontext()
+    return _open(name, args)
+
+
+def current() -> Optional[Span]:
+    return _current.get()
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+_C = TypeVar("_C", bound=type)
+
+
+def traced(name: str) -> Callable[[_F], _F]:
+    """Decorador de função: cada chamada vira o trecho ``name``."""
+
+    def decorate(fn: _F) -> _F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with _open(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def traced_methods(prefix: str) -> Callable[[_C], _C]:
+    """Decorador de classe: cada método público vira o trecho ``<prefix>.<método>``."""
+
+    def decorate(cls: _C) -> _C:
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_") or not isinstance(attr, types.FunctionType):
+                continue
+            setattr(cls, name, traced(f"{prefix}.{name}")(attr))
+        return cls
+
+    return decorate
+
+
+def caller_name(depth: int = 2) -> str:
+    """Nome da função ``depth`` quadros acima (ex.: quem abriu ``get_conn``)."""
+    try:
+        return sys._getframe(depth).f_code.co_name
+    except ValueError:
+        return "?"
+
+
+def spans() -> List[Span]:
+    return list(_finished)
+
+
+def clear() -> None:
+    _finished.clear()
+
+
+def chrome_events(items: Optional[List[Span]] = None) -> List[Dict[str, Any]]:
+    items = spans() if items is None else items
+    pid = os.getpid()
+    events: List[Dict[str, Any]] = []
+    threads: Dict[int, str] = {}
+    for s in items:
+        threads.setdefault(s.thread_id, s.thread_name)
+        args = {k: v if isinstance(v, (int, float, bool, type(None))) else str(v) for k, v in s.args.items()}
+        args["span_id"] = s.id
+        if s.parent_id is not None:
+            args["parent_id"] = s.parent_id
+        events.append({
+            "name": s.name,
+            "cat": s.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": round((s.start - _T0) * 1e6, 1),
+            "dur": round((s.end - s.start) * 1e6, 1),
+            "pid": pid,
+            "tid": s.thread_id,
+            "args": args,
+        })
+    for tid, tname in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}})
+    return events
+
+
+def export_chrome(path: str) -> int:
+    """Grava os trechos guardados em ``path`` (JSON Trace Event). Retorna quantos."""
+    items = spans()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": chrome_events(items), "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+    return len(items)
@@ -0,0 +1,81 @@
+"""Execução de consultas fora da thread da UI (QThreadPool/QRunnable)."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    # (geração, resultado) — a geração permite descartar respostas obsoletas
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class Worker(QRunnable):
+    """Executa ``fn(*args, **kwargs)`` no pool e entrega o resultado via sinais.
+
+    Os sinais são emitidos na thread do pool e entregues na thread dona de
+    ``signals`` (a thread da UI), então os slots podem mexer em widgets.
+    """
+
+    def __init__(self, generation: int, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self.generation = generation
+        self.signals = WorkerSignals()
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    def run(self) -> None:
+        try:
+            result = self._fn(*self._args, **self._kwargs)
+        except Exception as exc:
+            self.signals.failed.emit(self.generation, str(exc))
+            return
+        self.signals.finished.emit(self.generation, result)
+
+
+class LatestTaskRunner(QObject):
+    """Roda tarefas em sequência num pool de 1 thread e entrega só a mais recente.
+
+    Tarefas enfileiradas que ainda não começaram são canceladas ao enviar uma
+    nova; o resultado de uma tarefa que já estava rodando é descartado.
+    """
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._generation = 0
+        self._workers: Dict[int, Worker] = {}
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> int:
+        self._generation += 1
+        for generation, pending in list(self._workers.items()):
+            if self._pool.tryTake(pending):
+                self._workers.pop(generation, None)
+        worker = Worker(self._generation, fn, *args, **kwargs)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        self._workers[self._generation] = worker
+        self.busy_changed.emit(True)
+        self._pool.start(worker)
+        return self._generation
+
+    def _on_finished(self, generation: int, result: Any) -> None:
+        self._workers.pop(generation, None)
+        if generation == self._generation:
+            self.busy_changed.emit(False)
+            self.finished.emit(result)
+
+    def _on_failed(self, generation: int, message: str) -> None:
+        self._workers.pop(generation, None)
+        if generation == self._generation:
+            self.busy_changed.emit(False)
+            self.failed.emit(message)
@@ -1,24 +1,29 @@
 from __future__ import annotations
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QKeySequence, QShortcut, QFont
 from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QHeaderView,
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QLabel,
     QLineEdit,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
 )
 
 from app.config.settings import UI_TABLE_ROW_HEIGHT, UI_FONT_SIZE_PT
 from app.controllers.client_controller import ClientController
-from app.events.bus import bus
 from app.models.client import Client
 from app.utils.icons_manager import IconManager
+from app.utils.workers import LatestTaskRunner
 from app.views.components.client_dialog import ClientDialog
+from app.views.components.client_table_model import ClientTableModel
+
+# Espera após a última tecla antes de consultar o banco
+SEARCH_DEBOUNCE_MS = 250
 
 
 class ClientsView(QWidget):
@@ -38,20 +43,34 @@ class ClientsView(QWidget):
         actions.addWidget(self._search)
         actions.addWidget(self._btn_search)
 
-        # Tabela
-        self._table = QTableWidget(0, 3)
-        self._table.setHorizontalHeaderLabels(["Nome", "Telefone", "Observações"])
-        self._table.setSelectionBehavior(self._table.SelectionBehavior.SelectRows)
-        self._table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        # Tabela (model/view: só as linhas visíveis são desenhadas)
+        self._model = ClientTableModel(self)
+        self._table = QTableView()
+        self._table.setModel(self._model)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._table.setWordWrap(False)
+        # Altura uniforme: nada de medir linha a linha
+        rows = self._table.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(UI_TABLE_ROW_HEIGHT)
         header = self._table.horizontalHeader()
-        header.setSectionResizeMode(self._table.horizontalHeader().ResizeMode.Stretch)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         header_font = QFont()
         header_font.setPointSize(UI_FONT_SIZE_PT + 1)
         header.setFont(header_font)
         # Apenas Telefone fixo; demais esticam
-        header.setSectionResizeMode(1, header.ResizeMode.Fixed)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
         self._table.setColumnWidth(1, 120)
 
+        # Busca: debounce da digitação + consulta fora da thread da UI
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._on_search)
+        self._loader = LatestTaskRunner(self)
+        self._loader.finished.connect(self._populate)
+
         layout = QVBoxLayout(self)
         layout.addLayout(actions)
         layout.addWidget(self._table)
@@ -59,7 +78,8 @@ class ClientsView(QWidget):
 
         self._btn_new.clicked.connect(self._on_new_client)
         self._btn_search.clicked.connect(self._on_search)
-        self._search.textChanged.connect(self._on_search)
+        self._search.textChanged.connect(self._search_timer.start)
+        self._search.returnPressed.connect(self._on_search)
 
         # Atalhos
         QShortcut(QKeySequence("Ctrl+N"), self, self._on_new_client)
@@ -72,23 +92,17 @@ class ClientsView(QWidget):
         if dlg.exec() != dlg.DialogCode.Accepted:
             return
         name, phone, notes = dlg.values()
+        # O controller já atualiza o índice do seletor de clientes
         self._controller.upsert(name, phone or "", notes or "")
-        bus.client_list_changed.emit()
         self._reload()
 
     def _on_search(self) -> None:
-        query = self._search.text()
-        clients = self._controller.search(query)
-        self._populate(clients)
+        self._search_timer.stop()
+        # Uma busca nova cancela/descarta a anterior (ver LatestTaskRunner)
+        self._loader.submit(self._controller.search, self._search.text())
 
     def _reload(self) -> None:
-        self._populate(self._controller.list())
+        self._on_search()
 
     def _populate(self, clients: list[Client]) -> None:
-        self._table.setRowCount(len(clients))
-        for r, c in enumerate(clients):
-            self._table.setItem(r, 0, QTableWidgetItem(c.name))
-            self._table.setItem(r, 1, QTableWidgetItem(c.phone or "-"))
-            self._table.setItem(r, 2, QTableWidgetItem(c.notes or "-"))
-            self._table.setRowHeight(r, UI_TABLE_ROW_HEIGHT)
-        self._table.resizeColumnsToContents()
+        self._model.set_clients(clients)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtWidgets import QCompleter, QLineEdit, QWidget
+
+from app.controllers.client_controller import ClientController
+from app.models.client import Client
+from app.utils.workers import LatestTaskRunner
+
+# Quantas sugestões o popup mostra por vez
+MAX_SUGGESTIONS = 50
+
+
+def client_label(client: Client) -> str:
+    return f"{client.name} — {client.phone or ''}"
+
+
+class ClientSuggestionModel(QAbstractListModel):
+    """Lista curta (no máximo MAX_SUGGESTIONS) com o resultado da busca atual."""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._clients: List[Client] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._clients)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        client = self._clients[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return client_label(client)
+        if role == Qt.ItemDataRole.UserRole:
+            return client
+        return None
+
+    def set_clients(self, clients: List[Client]) -> None:
+        self.beginResetModel()
+        self._clients = clients[:MAX_SUGGESTIONS]
+        self.endResetModel()
+
+
+class ClientPicker(QLineEdit):
+    """Campo de cliente com sugestões por nome/telefone vindas do índice em memória.
+
+    Enquanto o usuário digita nada vai ao banco: as buscas usam o ``ClientIndex``
+    do ``ClientController``, construído em segundo plano ao abrir o campo.
+    """
+
+    client_selected = pyqtSignal(object)  # Client | None
+
+    def __init__(self, controller: ClientController, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._index = controller.index()
+        self._selected: Optional[Client] = None
+        self.setPlaceholderText("Digite nome ou telefone do cliente...")
+        self.setClearButtonEnabled(True)
+
+        self._model = ClientSuggestionModel(self)
+        self._completer = QCompleter(self._model, self)
+        # A filtragem é do índice; o completer só exibe a lista pronta
+        self._completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self._completer.setMaxVisibleItems(12)
+        self._completer.setWidget(self)
+        self._completer.activated[QModelIndex].connect(self._on_activated)
+
+        self.textEdited.connect(self._on_text_edited)
+
+        self._warmup = LatestTaskRunner(self)
+        self._warmup.finished.connect(lambda _: self._refresh_suggestions(self.text()))
+        self._warmup.submit(self._index.ensure_fresh)
+
+    def selected_client(self) -> Optional[Client]:
+        return self._selected
+
+    def _on_text_edited(self, text: str) -> None:
+        if self._selected is not None and text != client_label(self._selected):
+            self._set_selected(None)
+        self._refresh_suggestions(text)
+        if self._model.rowCount():
+            self._completer.complete()
+        else:
+            self._completer.popup().hide()
+
+    def _refresh_suggestions(self, text: str) -> None:
+        self._model.set_clients(self._index.search(text, MAX_SUGGESTIONS))
+        # Um único resultado exato já fica selecionado
+        if self._model.rowCount() == 1 and self._selected is None and text.strip():
+            only = self._model.data(self._model.index(0), Qt.ItemDataRole.UserRole)
+            if client_label(only) == text:
+                self._set_selected(only)
+
+    def _on_activated(self, index: QModelIndex) -> None:
+        client = self._model.data(index, Qt.ItemDataRole.UserRole)
+        if client is None:
+            return
+        self.setText(client_label(client))
+        self._set_selected(client)
+
+    def _set_selected(self, client: Optional[Client]) -> None:
+        self._selected = client
+        self.client_selected.emit(client)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from app.models.client import Client
+
+
+class ClientTableModel(QAbstractTableModel):
+    """Modelo somente leitura sobre uma lista de clientes (Nome, Telefone, Observações).
+
+    A view só pede os dados das linhas visíveis, então o custo de exibir 100 mil
+    clientes é o de trocar a lista, não o de criar itens por célula.
+    """
+
+    HEADERS = ("Nome", "Telefone", "Observações")
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._clients: List[Client] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._clients)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        client = self._clients[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            col = index.column()
+            if col == 0:
+                return client.name
+            if col == 1:
+                return client.phone or "-"
+            return client.notes or "-"
+        if role == Qt.ItemDataRole.UserRole:
+            return client
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def set_clients(self, clients: List[Client]) -> None:
+        self.beginResetModel()
+        self._clients = clients
+        self.endResetModel()
+
+    def client_at(self, row: int) -> Optional[Client]:
+        if 0 <= row < len(self._clients):
+            return self._clients[row]
+        return None
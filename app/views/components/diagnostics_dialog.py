@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (
+    QCheckBox,
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QFormLayout,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from app.data import profiling
+from app.data import sqlite as sqldb
+from app.utils import diagnostics, flight_recorder, metrics, stall_watchdog, tracing
+from app.utils.workers import LatestTaskRunner
+from app.views.components.dialog_theme import apply_dialog_theme, DialogHeader
+
+REFRESH_MS = 1000
+
+
+def _fmt_bytes(n: Optional[int]) -> str:
+    if n is None:
+        return "—"
+    if n >= 1024 * 1024:
+        return f"{n / (1024 * 1024):.1f} MB"
+    return f"{n / 1024:.0f} KB"
+
+
+def _fmt_age(seconds: Optional[int]) -> str:
+    if seconds is None:
+        return ""
+    if seconds >= 86400:
+        return f" (mais antigo há {seconds // 86400} d)"
+    if seconds >= 3600:
+        return f" (mais antigo há {seconds // 3600} h)"
+    return f" (mais antigo há {seconds // 60} min)"
+
+
+def _fmt_rate(value: Any) -> str:
+    return "—" if value is None else f"{value * 100:.1f}%"
+
+
+class _NumItem(QTableWidgetItem):
+    """Ordena pela coluna numérica, não pelo texto."""
+
+    def __init__(self, value: float, decimals: int = 2) -> None:
+        super().__init__(f"{value:.{decimals}f}")
+        self._value = value
+        self.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+
+    def __lt__(self, other: QTableWidgetItem) -> bool:
+        return self._value < getattr(other, "_value", 0.0)
+
+
+class DiagnosticsDialog(QDialog):
+    """Painel de desempenho: lê o registro de métricas e atualiza a cada segundo."""
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Diagnóstico de desempenho")
+        self.resize(760, 620)
+        self._last: Dict[str, Any] = {}
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(DialogHeader(
+            "Diagnóstico", "Métricas ao vivo do app. Exporte em JSON para anexar a um relato de problema."
+        ))
+
+        form = QFormLayout()
+        self._labels: Dict[str, QLabel] = {}
+        for key, title in (
+            ("sync", "Fila de sincronização:"),
+            ("sync_rate", "Sincronização (último min / total):"),
+            ("db", "Banco de dados:"),
+            ("ui", "Travamentos da interface:"),
+            ("print", "Impressão:"),
+            ("cache", "Caches:"),
+        ):
+            self._labels[key] = QLabel("…")
+            self._labels[key].setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+            form.addRow(title, self._labels[key])
+        self._profiling = QCheckBox("Medir cada consulta ao banco (histogramas db.* e log de consultas lentas)")
+        self._profiling.setChecked(profiling.ENABLED)
+        self._profiling.toggled.connect(profiling.set_enabled)
+        form.addRow("", self._profiling)
+        self._tracing = QCheckBox("Rastrear operações entre camadas (para abrir no Perfetto / chrome://tracing)")
+        self._tracing.setChecked(tracing.ENABLED)
+        self._tracing.toggled.connect(tracing.set_enabled)
+        form.addRow("", self._tracing)
+        layout.addLayout(form)
+
+        self._table = QTableWidget(0, 5, self)
+        self._table.setHorizontalHeaderLabels(["Métrica", "Amostras", "p50 (ms)", "p95 (ms)", "máx. (ms)"])
+        self._table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self._table.verticalHeader().setVisible(False)
+        self._table.horizontalHeader().setStretchLastSection(False)
+        layout.addWidget(self._table, 2)
+
+        layout.addWidget(QLabel("Onde a interface travou (pilha completa na dica e em logs/ui_stalls.log):"))
+        self._stalls = QTableWidget(0, 4, self)
+        self._stalls.setHorizontalHeaderLabels(["Ponto de chamada", "Vezes", "Total (ms)", "máx. (ms)"])
+        self._stalls.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self._stalls.verticalHeader().setVisible(False)
+        layout.addWidget(self._stalls, 1)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        export_btn = QPushButton("Exportar JSON…")
+        trace_btn = QPushButton("Exportar rastreamento…")
+        flight_btn = QPushButton("Gravar operações recentes")
+        reset_btn = QPushButton("Zerar métricas")
+        buttons.addButton(export_btn, QDialogButtonBox.ButtonRole.ActionRole)
+        buttons.addButton(trace_btn, QDialogButtonBox.ButtonRole.ActionRole)
+        buttons.addButton(flight_btn, QDialogButtonBox.ButtonRole.ActionRole)
+        buttons.addButton(reset_btn, QDialogButtonBox.ButtonRole.ResetRole)
+        export_btn.clicked.connect(self._export)
+        trace_btn.clicked.connect(self._export_trace)
+        flight_btn.clicked.connect(self._dump_flight)
+        reset_btn.clicked.connect(self._reset)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        # Coleta fora da thread da UI: com o banco ocupado o painel só atrasa
+        self._collector = LatestTaskRunner(self)
+        self._collector.finished.connect(self._apply)
+        self._collector.failed.connect(self._on_collect_failed)
+        self._collector.busy_changed.connect(self._on_busy)
+        self._collecting = False
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+        apply_dialog_theme(self, min_width=720)
+        # Painel de consulta: pode ficar aberto enquanto se usa o app
+        self.setModal(False)
+        self.refresh()
+
+    def showEvent(self, event) -> None:  # type: ignore[override]
+        super().showEvent(event)
+        self._timer.start()
+
+    def hideEvent(self, event) -> None:  # type: ignore[override]
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self) -> None:
+        # Uma coleta por vez: se a anterior ainda roda, espera o próximo tique
+        if not self._collecting:
+            self._collector.submit(diagnostics.collect)
+
+    def _on_busy(self, busy: bool) -> None:
+        self._collecting = busy
+
+    def _on_collect_failed(self, message: str) -> None:
+        self._labels["db"].setText(f"diagnóstico indisponível: {message}")
+
+    def _apply(self, data: Dict[str, Any]) -> None:
+        self._last = data
+        counters = data["counters"]
+        gauges = data["gauges"]
+        hists = data["histograms"]
+
+        def total(name: str) -> int:
+            return counters.get(name, {}).get("total", 0)
+
+        def last_min(name: str) -> int:
+            return counters.get(name, {}).get("last_min", 0)
+
+        queue = data["sync_queue"]
+        if "error" in queue:
+            self._labels["sync"].setText(f"indisponível: {queue['error']}")
+        else:
+            self._labels["sync"].setText(f"{queue['depth']} item(ns){_fmt_age(queue['oldest_age_s'])}")
+        self._labels["sync_rate"].setText(
+            f"{last_min('sync.sent')} / {total('sync.sent')} enviados, {total('sync.failed')} falha(s)"
+        )
+        db = data["db"]
+        self._labels["db"].setText(
+            f"{_fmt_bytes(db['db_bytes'])} (WAL {_fmt_bytes(db['wal_bytes'])}, journal {_fmt_bytes(db['journal_bytes'])})"
+        )
+        lag = hists.get("ui.loop_lag", {})
+        self._labels["ui"].setText(
+            f"{total('ui.stalls')} (último min: {last_min('ui.stalls')}); atraso do loop p95 {lag.get('p95', 0):.0f} ms"
+        )
+        pq = data["print_queue"]
+        if "error" in pq:
+            queue_text = f"fila indisponível: {pq['error']}"
+        else:
+            waiting = pq.get(sqldb.PRINT_PENDING, 0) + pq.get(sqldb.PRINT_PRINTING, 0)
+            queue_text = f"fila {waiting}, {pq.get(sqldb.PRINT_FAILED, 0)} recibo(s) não impresso(s)"
+        job = hists.get("print.job")
+        # Envio à impressora: o mais lento entre texto, imagem e ESC/POS
+        sends = [hists[n] for n in ("print.raw", "print.image", "print.text") if n in hists]
+        parts = []
+        if job:
+            parts.append(f"recibo p50 {job['p50']:.0f} ms, p95 {job['p95']:.0f} ms")
+        if sends:
+            parts.append(f"envio p95 {max(h['p95'] for h in sends):.0f} ms")
+        if not parts:
+            parts.append("nenhuma impressão nesta sessão")
+        parts += [queue_text, f"{total('print.failed')} erro(s) de envio"]
+        self._labels["print"].setText("; ".join(parts))
+        clients = metrics.hit_rate(total("cache.clients.hit"), total("cache.clients.rebuild"))
+        self._labels["cache"].setText(
+            f"ícones {_fmt_rate(gauges.get('cache.icons.hit_rate'))}, clientes {_fmt_rate(clients)}, "
+            f"catálogo de serviços recarregado {total('cache.services.rebuild')}×"
+        )
+        self._fill_table(hists)
+        self._fill_stalls(data["ui_stall_sites"])
+
+    def _fill_table(self, hists: Dict[str, Dict[str, Any]]) -> None:
+        rows = [(name, h) for name, h in hists.items() if h.get("count")]
+        self._table.setSortingEnabled(False)
+        self._table.setRowCount(len(rows))
+        for row, (name, h) in enumerate(rows):
+            self._table.setItem(row, 0, QTableWidgetItem(name))
+            self._table.setItem(row, 1, _NumItem(h["count"], 0))
+            self._table.setItem(row, 2, _NumItem(h["p50"]))
+            self._table.setItem(row, 3, _NumItem(h["p95"]))
+            self._table.setItem(row, 4, _NumItem(h["max"]))
+        self._table.setSortingEnabled(True)
+        self._table.resizeColumnsToContents()
+
+    def _fill_stalls(self, sites: list) -> None:
+        self._stalls.setSortingEnabled(False)
+        self._stalls.setRowCount(len(sites))
+        for row, site in enumerate(sites):
+            item = QTableWidgetItem(site["site"])
+            item.setToolTip("\n".join(site.get("stack", [])))
+            self._stalls.setItem(row, 0, item)
+            self._stalls.setItem(row, 1, _NumItem(site["count"], 0))
+            self._stalls.setItem(row, 2, _NumItem(site["total_ms"], 0))
+            self._stalls.setItem(row, 3, _NumItem(site["max_ms"], 0))
+        self._stalls.setSortingEnabled(True)
+        self._stalls.resizeColumnsToContents()
+
+    def _reset(self) -> None:
+        metrics.reset()
+        stall_watchdog.reset()
+        self.refresh()
+
+    def _export(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar diagnóstico", "diagnostico.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(diagnostics.collect(), f, ensure_ascii=False, indent=2)
+        except OSError as exc:
+            QMessageBox.critical(self, "Erro", f"Falha ao exportar: {exc}")
+            return
+        QMessageBox.information(self, "Diagnóstico", f"Diagnóstico salvo em {path}")
+
+    def _export_trace(self) -> None:
+        if not tracing.spans():
+            QMessageBox.information(self, "Rastreamento", "Nenhuma operação rastreada. Ligue o rastreamento e repita a ação lenta.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar rastreamento", "rastreamento.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            count = tracing.export_chrome(path)
+        except OSError as exc:
+            QMessageBox.critical(self, "Erro", f"Falha ao exportar: {exc}")
+            return
+        QMessageBox.information(self, "Rastreamento", f"{count} trecho(s) salvos em {path}. Abra em https://ui.perfetto.dev")
+
+    def _dump_flight(self) -> None:
+        path = flight_recorder.dump("pedido no diagnóstico")
+        if path is None:
+            QMessageBox.critical(self, "Erro", "Não foi possível gravar o registro de operações.")
+            return
+        QMessageBox.information(self, "Diagnóstico", f"Operações recentes salvas em {path}")
@@ -12,7 +12,6 @@ from PyQt6.QtWidgets import (
     QFormLayout,
     QHBoxLayout,
     QLabel,
-    QLineEdit,
     QPushButton,
     QTableWidget,
     QTableWidgetItem,
@@ -26,6 +25,7 @@ from app.controllers.service_controller import ServiceController
 from app.models.client import Client
 from app.models.order import OrderItem
 from app.utils.icons_manager import IconManager
+from app.views.components.client_picker import ClientPicker
 from app.views.components.service_item_dialog import ServiceItemDialog
 
 
@@ -39,9 +39,7 @@ class OrderDialog(QDialog):
         self._services = services
         self._orders = orders
 
-        self._client_search = QLineEdit()
-        self._client_search.setPlaceholderText("Buscar cliente...")
-        self._client_combo = QComboBox()
+        self._client_picker = ClientPicker(clients)
 
         self._due_date = QDateEdit()
         self._due_date.setCalendarPopup(True)
@@ -59,8 +57,7 @@ class OrderDialog(QDialog):
         self._print_after = QCheckBox("Imprimir recibo ao salvar")
 
         form_top = QFormLayout()
-        form_top.addRow("Cliente:", self._client_combo)
-        form_top.addRow("Filtrar:", self._client_search)
+        form_top.addRow("Cliente:", self._client_picker)
         form_top.addRow("Prazo:", self._due_date)
         form_top.addRow("Pagamento:", self._payment_mode)
         form_top.addRow("Opções:", self._print_after)
@@ -92,29 +89,21 @@ class OrderDialog(QDialog):
         self._buttons.rejected.connect(self.reject)
         self._btn_add_item.clicked.connect(self._on_add_item)
         self._btn_remove_item.clicked.connect(self._on_remove_item)
-        self._client_search.textChanged.connect(self._reload_clients)
+        self._client_picker.client_selected.connect(lambda _: self._recompute_total())
         self._table.itemChanged.connect(self._recompute_total)
 
-        self._reload_clients()
         self._recompute_total()
         apply_dialog_theme(self, min_width=820)
 
     def _on_accept(self) -> None:
         if not self.selected_client_id():
-            self._client_combo.setFocus()
+            self._client_picker.setFocus()
             return
         if not self.selected_items():
             self._btn_add_item.setFocus()
             return
         self.accept()
 
-    def _reload_clients(self) -> None:
-        q = self._client_search.text().strip()
-        clients = self._clients.search(q) if q else self._clients.list()
-        self._client_combo.clear()
-        for c in clients:
-            self._client_combo.addItem(f"{c.name} — {c.phone or ''}", c)
-
     def _on_add_item(self) -> None:
         dlg = ServiceItemDialog(self, self._services)
         if dlg.exec() == dlg.DialogCode.Accepted:
@@ -144,11 +133,7 @@ class OrderDialog(QDialog):
         return items
 
     def selected_client(self) -> Client | None:
-        idx = self._client_combo.currentIndex()
-        if idx < 0:
-            return None
-        c = self._client_combo.itemData(idx)
-        return c
+        return self._client_picker.selected_client()
 
     def selected_client_id(self) -> str | None:
         c = self.selected_client()
@@ -175,4 +160,4 @@ class OrderDialog(QDialog):
                 pass
         self._lbl_total.setText(f"Total: R$ {total:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
         ok_btn = self._buttons.button(QDialogButtonBox.StandardButton.Ok)
-        ok_btn.setEnabled(self._client_combo.count() > 0 and self._table.rowCount() > 0)
+        ok_btn.setEnabled(self._client_picker.selected_client() is not None and self._table.rowCount() > 0)
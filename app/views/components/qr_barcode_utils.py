@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-import os
-import tempfile
+from functools import lru_cache
 from typing import Literal
 
 import qrcode
@@ -9,21 +8,74 @@ from PIL import Image
 from barcode import Code128
 from barcode.writer import ImageWriter
 
+from app.utils import metrics, tracing
 
-def generate_qr_png(data: str) -> str:
-    img = qrcode.make(data)
-    fd, path = tempfile.mkstemp(suffix=".png")
-    os.close(fd)
-    img.save(path)
-    return path
+# Largura útil da impressora térmica de 58 mm, em pontos
+PRINTER_DOTS = 384
+QR_MAX_BOX = 8  # pontos por módulo; acima disso o QR só fica maior no papel
+BARCODE_HEIGHT = 60
+CACHE_SIZE = 64
 
+Symbology = Literal["qr", "code128"]
 
-def generate_barcode_png(data: str) -> str:
-    fd, path = tempfile.mkstemp(suffix=".png")
-    os.close(fd)
+
+def _qr(data: str, width: int) -> Image.Image:
+    qr = qrcode.QRCode(border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+    modules = qr.modules_count + 2 * qr.border
+    qr.box_size = max(1, min(QR_MAX_BOX, width // modules))
+    return qr.make_image().get_image().convert("1")
+
+
+def _code128(data: str, width: int) -> Image.Image:
     code = Code128(data, writer=ImageWriter())
-    code.save(path[:-4])  # writer adiciona extensão
-    # garante caminho com .png
-    if not os.path.exists(path):
-        path = path[:-4] + ".png"
-    return path
+    # Com dpi=25.4 as medidas do writer (em mm) saem em pixels: barras com
+    # largura inteira, sem o redimensionamento que borrava a leitura
+    modules = len(code.build()[0]) + 20
+    scale = width // modules
+    options = {
+        "dpi": 25.4,
+        # O writer não desenha barras de 1 pixel: gera com 2 e reduz pela metade
+        "module_width": max(2, scale),
+        "module_height": BARCODE_HEIGHT,
+        "quiet_zone": 10,
+        "write_text": False,
+    }
+    img = code.render(options).convert("1")
+    if scale < 2:
+        img = img.resize((img.width // 2, img.height), Image.Resampling.NEAREST)
+    if img.width > width:
+        img = img.resize((width, img.height), Image.Resampling.NEAREST)
+    return img
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+@tracing.traced("codes.render")
+def code_image(data: str, symbology: Symbology, width: int = PRINTER_DOTS) -> Image.Image:
+    """Imagem 1 bit de ``data`` que cabe em ``width`` pontos, sem passar pelo disco.
+
+    Guardada em cache por (código, simbologia, largura): reimpressões do mesmo
+    pedido não geram de novo. A imagem é compartilhada; não altere, copie.
+    """
+    if symbology == "qr":
+        return _qr(data, width)
+    if symbology == "code128":
+        return _code128(data, width)
+    raise ValueError(f"simbologia desconhecida: {symbology}")
+
+
+def _cache_hit_rate():
+    info = code_image.cache_info()
+    return metrics.hit_rate(info.hits, info.misses)
+
+
+metrics.register_gauge("cache.codes.hit_rate", _cache_hit_rate)
+
+
+def qr_image(data: str, width: int = PRINTER_DOTS) -> Image.Image:
+    return code_image(data, "qr", width)
+
+
+def barcode_image(data: str, width: int = PRINTER_DOTS) -> Image.Image:
+    return code_image(data, "code128", width)
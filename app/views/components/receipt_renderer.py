@@ -0,0 +1,161 @@
+"""Recibo inteiro numa imagem 1 bit na largura da impressora.
+
+``render_receipt(texto, código)`` monta logo, texto, QR e código de barras numa
+só imagem de ``PRINTER_DOTS`` pontos de largura, já em preto e branco; a
+impressora recebe um único ``print_image`` e não precisa redimensionar nem
+pontilhar nada. O resultado é o mesmo em qualquer modelo (não depende das
+fontes internas nem da página de código da impressora).
+
+- Logo (``assets/logo2.png``): convertido uma vez, com pontilhado ordenado
+  (Bayer 4×4) em numpy, e guardado em cache.
+- Texto: fonte monoespaçada (DejaVu Sans Mono, que vem com o matplotlib), com
+  quebra na largura do papel; cada linha desenhada fica em cache, então o
+  cabeçalho e as linhas que se repetem entre recibos não são redesenhados.
+- QR/código de barras: ``qr_barcode_utils.code_image``, também em cache.
+
+Tempos em ``print.render``.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import textwrap
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from app.utils import metrics, tracing
+from app.views.components.qr_barcode_utils import PRINTER_DOTS, barcode_image, qr_image
+
+FONT_SIZE = 20  # ~32 colunas em 384 pontos, como a fonte A da impressora
+LINE_SPACING = 4
+LOGO_WIDTH = PRINTER_DOTS // 2
+GAP = 12  # espaço entre os blocos, em pontos
+LINE_CACHE_SIZE = 256
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+_LOGO_FILE = _PROJECT_ROOT / "assets" / "logo2.png"
+
+# Limiares do pontilhado ordenado 4×4, normalizados para 0–255
+_BAYER4 = (np.array([
+    [0, 8, 2, 10],
+    [12, 4, 14, 6],
+    [3, 11, 1, 9],
+    [15, 7, 13, 5],
+], dtype=np.float32) + 0.5) * (255 / 16)
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """Tons de cinza sobre fundo branco (a transparência vira papel)."""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        bg = Image.new("RGBA", img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(bg, img)
+    return img.convert("L")
+
+
+def to_1bit(img: Image.Image, width: Optional[int] = None, dither: bool = True) -> Image.Image:
+    """Imagem 1 bit pronta para a impressora, com no máximo ``width`` pontos.
+
+    Reduz com LANCZOS (o padrão do PIL serrilha logos e fotos) e aplica o
+    pontilhado ordenado, ou só um limiar com ``dither=False``.
+    """
+    if img.mode == "1" and (width is None or img.width <= width):
+        return img
+    gray = _flatten(img)
+    if width is not None and gray.width > width:
+        gray = gray.resize((width, max(1, round(gray.height * width / gray.width))), Image.Resampling.LANCZOS)
+    if not dither:
+        return gray.point(lambda v: 255 if v >= 128 else 0).convert("1", dither=Image.Dither.NONE)
+    px = np.asarray(gray, dtype=np.float32)
+    h, w = px.shape
+    thresholds = np.tile(_BAYER4, (h // 4 + 1, w // 4 + 1))[:h, :w]
+    return Image.fromarray(px > thresholds)
+
+
+@lru_cache(maxsize=4)
+def _logo(width: int) -> Optional[Image.Image]:
+    try:
+        with Image.open(_LOGO_FILE) as img:
+            return to_1bit(img, width)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _font() -> ImageFont.ImageFont:
+    # A fonte do matplotlib sem importar o matplotlib
+    spec = importlib.util.find_spec("matplotlib")
+    if spec and spec.origin:
+        path = Path(spec.origin).parent / "mpl-data" / "fonts" / "ttf" / "DejaVuSansMono.ttf"
+        try:
+            return ImageFont.truetype(str(path), FONT_SIZE)
+        except OSError:
+            pass
+    return ImageFont.load_default(FONT_SIZE)
+
+
+def _columns(width: int) -> int:
+    return max(1, int(width // _font().getlength("M")))
+
+
+def _line_height() -> int:
+    ascent, descent = _font().getmetrics()
+    return ascent + descent + LINE_SPACING
+
+
+@lru_cache(maxsize=LINE_CACHE_SIZE)
+def _text_line(line: str, width: int) -> Image.Image:
+    img = Image.new("L", (width, _line_height()), 255)
+    if line:
+        ImageDraw.Draw(img).text((0, LINE_SPACING // 2), line, font=_font(), fill=0)
+    # Texto sem pontilhado: limiar simples deixa as letras nítidas
+    return img.point(lambda v: 255 if v >= 128 else 0).convert("1", dither=Image.Dither.NONE)
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    cols = _columns(width)
+    lines: List[str] = []
+    for raw in text.rstrip("\n").split("\n"):
+        lines += textwrap.wrap(raw, cols, replace_whitespace=False, drop_whitespace=True) or [""]
+    return lines
+
+
+@tracing.traced("print.render")
+def render_receipt(text: str, order_code: Optional[str] = None, width: int = PRINTER_DOTS) -> Image.Image:
+    """O recibo completo numa imagem modo ``"1"`` de ``width`` pontos de largura."""
+    t0 = time.perf_counter()
+    # (imagem, é bloco à parte): logo e códigos ganham margem e vão centralizados
+    blocks: List[Tuple[Image.Image, bool]] = []
+    logo = _logo(min(LOGO_WIDTH, width))
+    if logo is not None:
+        blocks.append((logo, True))
+    blocks += [(_text_line(line, width), False) for line in _wrap(text, width)]
+    if order_code:
+        blocks += [(qr_image(order_code, width), True), (barcode_image(order_code, width), True)]
+    placed = []
+    y = GAP
+    after_text = False
+    for img, separate in blocks:
+        if separate and after_text:
+            y += GAP
+        placed.append((img, ((width - img.width) // 2, y)))
+        y += img.height + (GAP if separate else 0)
+        after_text = not separate
+    receipt = Image.new("1", (width, y + GAP), 1)
+    for img, pos in placed:
+        receipt.paste(img, pos)
+    metrics.histogram("print.render").observe((time.perf_counter() - t0) * 1000)
+    return receipt
+
+
+def _cache_hit_rate():
+    info = _text_line.cache_info()
+    return metrics.hit_rate(info.hits, info.misses)
+
+
+metrics.register_gauge("cache.receipt_lines.hit_rate", _cache_hit_rate)
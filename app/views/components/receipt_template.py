@@ -0,0 +1,255 @@
+"""Modelo único de recibo para todas as impressões.
+
+``template()`` devolve o modelo montado com os dados da empresa das
+configurações (``APP_NAME``, ``COMPANY_NAME``, ``CNPJ``, ``PHONE``). A montagem
+acontece uma vez por conjunto de configurações: o cabeçalho já fica pronto e
+as seções viram uma lista de passos. ``render(pedido, cliente, pagamentos)``
+só preenche as partes do pedido e devolve um ``Receipt``, que sai como:
+
+- ``text()``: texto puro em ``COLUMNS`` colunas (``recibo.txt``);
+- ``escpos()``: bytes ESC/POS, com negrito, centralização e QR/código de
+  barras nativos da impressora;
+- ``raster()``: a imagem 1 bit de ``receipt_renderer``.
+
+``render_many`` monta vários recibos com o mesmo modelo; valores em reais,
+linhas de itens e linhas ESC/POS repetidas vêm de cache.
+"""
+
+from __future__ import annotations
+
+import textwrap
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from app.config import settings as app_settings
+from app.models.client import Client
+from app.models.order import Order, Payment
+from app.utils import tracing
+from app.views.components.qr_barcode_utils import PRINTER_DOTS
+
+# Colunas do papel de 58 mm (fonte A da impressora e fonte do receipt_renderer)
+COLUMNS = 32
+SECTIONS = ("header", "order", "client", "items", "totals", "payment", "code")
+
+# Estilos de linha: "" normal, "title" (centralizado, altura dupla), "center", "bold"
+Line = Tuple[str, str]
+
+ESC = b"\x1b"
+GS = b"\x1d"
+_ENCODING = "cp860"  # página de código português (ESC t 3)
+_ASCII_FALLBACK = str.maketrans({"—": "-", "–": "-", "•": "*", "“": '"', "”": '"', "’": "'", "…": "."})
+
+
+@lru_cache(maxsize=4096)
+def format_brl(cents: int) -> str:
+    """``123456`` → ``"R$ 1.234,56"``."""
+    sign = "-" if cents < 0 else ""
+    reais, centavos = divmod(abs(int(cents)), 100)
+    return f"{sign}R$ {reais:,}".replace(",", ".") + f",{centavos:02d}"
+
+
+def _date_br(iso: Optional[str]) -> str:
+    if not iso:
+        return ""
+    try:
+        return datetime.fromisoformat(iso[:10]).strftime("%d/%m/%Y")
+    except ValueError:
+        return iso[:10]
+
+
+def _two_cols(left: str, right: str, columns: int) -> str:
+    """``left`` e ``right`` nas pontas da linha (``left`` é cortado se não couber)."""
+    room = max(1, columns - len(right) - 1)
+    if len(left) > room:
+        left = left[: room - 1] + "…" if room > 1 else left[:room]
+    return f"{left}{' ' * (columns - len(left) - len(right))}{right}"
+
+
+@lru_cache(maxsize=1024)
+def _item_lines(name: str, detail: str, unit_cents: int, quantity: int, columns: int) -> Tuple[str, ...]:
+    label = f"{name} ({detail})" if detail else name
+    lines = textwrap.wrap(label, columns) or [""]
+    lines.append(_two_cols(f"  {quantity} x {format_brl(unit_cents)}", format_brl(unit_cents * quantity), columns))
+    return tuple(lines)
+
+
+class Receipt:
+    """Um recibo pronto: linhas com estilo e o código do pedido (QR/código de barras)."""
+
+    __slots__ = ("lines", "order_code", "columns")
+
+    def __init__(self, lines: List[Line], order_code: Optional[str] = None, columns: int = COLUMNS) -> None:
+        self.lines = lines
+        self.order_code = order_code
+        self.columns = columns
+
+    def text(self) -> str:
+        out = []
+        for style, text in self.lines:
+            out.append(text.center(self.columns).rstrip() if style in ("title", "center") else text)
+        return "\n".join(out) + "\n\n"
+
+    def escpos(self) -> bytes:
+        # ESC @ (reinicia) + ESC t 3 (página de código 860)
+        out = bytearray(ESC + b"@" + ESC + b"t\x03")
+        for style, text in self.lines:
+            out += _escpos_line(style, text)
+        if self.order_code:
+            out += ESC + b"a\x01" + _escpos_qr(self.order_code) + b"\n" + _escpos_code128(self.order_code) + ESC + b"a\x00"
+        out += b"\n\n"
+        return bytes(out)
+
+    def raster(self, width: int = PRINTER_DOTS) -> Image.Image:
+        from app.views.components.receipt_renderer import render_receipt
+
+        return render_receipt(self.text(), self.order_code, width)
+
+    def payload(self) -> Dict[str, Any]:
+        """Formato guardado na fila de impressão (``print_jobs``)."""
+        return {"text": self.text(), "order_code": self.order_code, "lines": [list(l) for l in self.lines]}
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Receipt":
+        lines = payload.get("lines")
+        if lines is None:
+            # Trabalho antigo, só com texto
+            lines = [("", l) for l in payload.get("text", "").rstrip("\n").split("\n")]
+        return cls([(str(s), str(t)) for s, t in lines], payload.get("order_code"))
+
+
+@lru_cache(maxsize=512)
+def _escpos_line(style: str, text: str) -> bytes:
+    data = text.translate(_ASCII_FALLBACK).encode(_ENCODING, errors="replace")
+    if style == "title":
+        # Centralizado, negrito, altura dupla
+        return ESC + b"a\x01" + ESC + b"E\x01" + GS + b"!\x01" + data + b"\n" + GS + b"!\x00" + ESC + b"E\x00" + ESC + b"a\x00"
+    if style == "center":
+        return ESC + b"a\x01" + data + b"\n" + ESC + b"a\x00"
+    if style == "bold":
+        return ESC + b"E\x01" + data + b"\n" + ESC + b"E\x00"
+    return data + b"\n"
+
+
+def _escpos_qr(data: str, module: int = 6) -> bytes:
+    raw = data.encode("ascii", errors="replace")
+    size = len(raw) + 3
+    return (
+        GS + b"(k\x04\x001A2\x00"  # modelo 2
+        + GS + b"(k\x03\x001C" + bytes([module])  # tamanho do módulo
+        + GS + b"(k\x03\x001E1"  # correção de erro M
+        + GS + b"(k" + bytes([size % 256, size // 256]) + b"1P0" + raw
+        + GS + b"(k\x03\x001Q0"  # imprime
+    )
+
+
+def _escpos_code128(data: str) -> bytes:
+    raw = b"{B" + data.encode("ascii", errors="replace")
+    # Altura 60 pontos, módulo de 2 pontos, sem texto legível (já vai na linha do código)
+    return GS + b"h\x3c" + GS + b"w\x02" + GS + b"H\x00" + GS + b"kI" + bytes([len(raw)]) + raw
+
+
+class ReceiptTemplate:
+    def __init__(self, company: Dict[str, Any], sections: Sequence[str] = SECTIONS, columns: int = COLUMNS) -> None:
+        self.columns = columns
+        self._rule: Line = ("", "-" * columns)
+        header: List[Line] = []
+        if company.get("APP_NAME"):
+            header.append(("title", str(company["APP_NAME"])))
+        if company.get("COMPANY_NAME"):
+            header += [("center", l) for l in textwrap.wrap(str(company["COMPANY_NAME"]), columns)]
+        if company.get("CNPJ"):
+            header.append(("center", f"CNPJ {company['CNPJ']}"))
+        if company.get("PHONE"):
+            header.append(("center", f"Tel. {company['PHONE']}"))
+        # Cabeçalho fixo: montado aqui, copiado em cada recibo
+        self._header_lines: Tuple[Line, ...] = tuple(header) + (self._rule,)
+        self._steps = [getattr(self, f"_{name}") for name in sections]
+
+    def render(self, order: Order, client: Optional[Client] = None, payments: Sequence[Payment] = ()) -> Receipt:
+        lines: List[Line] = []
+        for step in self._steps:
+            step(lines, order, client, payments)
+        return Receipt(lines, order.order_code, self.columns)
+
+    # ----- Seções -----
+    def _header(self, lines: List[Line], order: Order, client, payments) -> None:
+        lines += self._header_lines
+
+    def _order(self, lines: List[Line], order: Order, client, payments) -> None:
+        if order.order_code:
+            lines.append(("bold", f"Pedido {order.order_code}"))
+        lines.append(("", _two_cols(f"Data: {_date_br(order.created_at_iso)}", f"Status: {order.status}", self.columns)))
+        if order.due_date_iso:
+            lines.append(("", f"Prazo: {_date_br(order.due_date_iso)}"))
+
+    def _client(self, lines: List[Line], order: Order, client: Optional[Client], payments) -> None:
+        if client is None:
+            return
+        lines += [("", l) for l in textwrap.wrap(f"Cliente: {client.name}", self.columns)]
+        if client.phone:
+            lines.append(("", f"Tel.: {client.phone}"))
+
+    def _items(self, lines: List[Line], order: Order, client, payments) -> None:
+        lines.append(self._rule)
+        for it in order.items:
+            detail = it.service_subtype or it.service_type
+            lines += [("", l) for l in _item_lines(it.service_name, detail or "", it.unit_price_cents, it.quantity, self.columns)]
+        lines.append(self._rule)
+
+    def _totals(self, lines: List[Line], order: Order, client, payments) -> None:
+        lines.append(("bold", _two_cols("TOTAL", format_brl(_total(order)), self.columns)))
+
+    def _payment(self, lines: List[Line], order: Order, client, payments: Sequence[Payment]) -> None:
+        total = _total(order)
+        paid = 0
+        for p in payments:
+            paid += p.amount_cents
+            label = f"{p.method or 'Pagamento'} {_date_br(p.created_at_iso)[:5]}".rstrip()
+            lines.append(("", _two_cols(label, format_brl(p.amount_cents), self.columns)))
+        if paid >= total > 0:
+            lines.append(("bold", "PAGO"))
+        elif paid:
+            lines.append(("bold", _two_cols("Falta pagar", format_brl(total - paid), self.columns)))
+        else:
+            lines.append(("", "Pagamento na retirada"))
+
+    def _code(self, lines: List[Line], order: Order, client, payments) -> None:
+        if order.order_code:
+            # Legível acima do QR/código de barras
+            lines += [("", ""), ("center", order.order_code)]
+
+
+def _total(order: Order) -> int:
+    return order.total_cents or sum(i.unit_price_cents * i.quantity for i in order.items)
+
+
+def _company_key() -> Tuple:
+    cfg = app_settings.get_settings()
+    return tuple(cfg.get(k) for k in ("APP_NAME", "COMPANY_NAME", "CNPJ", "PHONE"))
+
+
+@lru_cache(maxsize=4)
+def _compiled(key: Tuple) -> ReceiptTemplate:
+    return ReceiptTemplate(dict(zip(("APP_NAME", "COMPANY_NAME", "CNPJ", "PHONE"), key)))
+
+
+def template() -> ReceiptTemplate:
+    """Modelo com os dados atuais da empresa (remontado quando as configurações mudam)."""
+    return _compiled(_company_key())
+
+
+@tracing.traced("print.template")
+def render_many(
+    records: Iterable[Tuple[Order, Optional[Client], Sequence[Payment]]],
+    tpl: Optional[ReceiptTemplate] = None,
+) -> List[Receipt]:
+    """Recibos de vários pedidos (reimpressão em lote) com um só modelo."""
+    tpl = tpl or template()
+    return [tpl.render(order, client, payments) for order, client, payments in records]
+
+
+def render(order: Order, client: Optional[Client] = None, payments: Sequence[Payment] = ()) -> Receipt:
+    return render_many([(order, client, payments)])[0]
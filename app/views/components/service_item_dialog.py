@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
-    QComboBox,
     QDialog,
     QDialogButtonBox,
     QFormLayout,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
     QSpinBox,
+    QVBoxLayout,
 )
 from app.views.components.dialog_theme import apply_dialog_theme, DialogHeader
 
 from app.controllers.service_controller import ServiceController
 from app.models.order import OrderItem
+from app.models.service import Service
 
 
 class ServiceItemDialog(QDialog):
@@ -20,12 +25,14 @@ class ServiceItemDialog(QDialog):
         self.setModal(True)
         self.setMinimumWidth(420)
         self._svc_ctrl = service_controller
-        self._services = self._svc_ctrl.list_services()
+        # Catálogo em memória: abrir o diálogo e filtrar não consultam o banco
+        self._catalog = service_controller.catalog()
 
-        self._combo = QComboBox(self)
-        for s in self._services:
-            label = f"{s.name} — {s.subtype or s.type} (R$ {s.price_cents/100:.2f})"
-            self._combo.addItem(label, s)
+        self._search = QLineEdit(self)
+        self._search.setPlaceholderText("Digite para buscar (nome, tipo ou subtipo)...")
+        self._search.setClearButtonEnabled(True)
+        self._list = QListWidget(self)
+        self._list.setMinimumHeight(220)
 
         self._qty = QSpinBox(self)
         self._qty.setMinimum(1)
@@ -33,7 +40,8 @@ class ServiceItemDialog(QDialog):
         self._qty.setValue(1)
 
         form = QFormLayout()
-        form.addRow("Serviço:", self._combo)
+        form.addRow("Buscar:", self._search)
+        form.addRow("Serviço:", self._list)
         form.addRow("Quantidade:", self._qty)
 
         buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
@@ -42,23 +50,45 @@ class ServiceItemDialog(QDialog):
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
         form.addRow(buttons)
-        from PyQt6.QtWidgets import QVBoxLayout
         root = QVBoxLayout(self)
         root.addWidget(DialogHeader("Adicionar serviço", "Selecione um serviço e a quantidade para incluir no pedido."))
         root.addLayout(form)
         self.setLayout(root)
+
+        self._search.textChanged.connect(self._refresh)
+        self._search.returnPressed.connect(self.accept)
+        self._list.itemDoubleClicked.connect(lambda _: self.accept())
+        self._search.installEventFilter(self)
+
+        self._refresh("")
+        self._search.setFocus()
         apply_dialog_theme(self, min_width=440)
 
+    def _refresh(self, text: str) -> None:
+        # Usados recentemente primeiro (ordem do catálogo)
+        self._list.clear()
+        for s in self._catalog.search(text):
+            item = QListWidgetItem(f"{s.name} — {s.subtype or s.type} (R$ {s.price_cents/100:.2f})")
+            item.setData(Qt.ItemDataRole.UserRole, s.id)
+            self._list.addItem(item)
+        if self._list.count():
+            self._list.setCurrentRow(0)
+
+    def eventFilter(self, obj, event) -> bool:
+        # Setas no campo de busca navegam pela lista sem tirar o foco da digitação
+        if obj is self._search and event.type() == event.Type.KeyPress and event.key() in (Qt.Key.Key_Up, Qt.Key.Key_Down):
+            step = -1 if event.key() == Qt.Key.Key_Up else 1
+            row = max(0, min(self._list.count() - 1, self._list.currentRow() + step))
+            self._list.setCurrentRow(row)
+            return True
+        return super().eventFilter(obj, event)
+
+    def selected_service(self) -> Service | None:
+        item = self._list.currentItem()
+        return self._catalog.get(item.data(Qt.ItemDataRole.UserRole)) if item else None
+
     def result_item(self) -> OrderItem | None:
-        idx = self._combo.currentIndex()
-        if idx < 0:
+        item = self._list.currentItem()
+        if item is None:
             return None
-        svc = self._combo.itemData(idx)
-        qty = int(self._qty.value())
-        return OrderItem(
-            service_name=svc.name,
-            service_type=svc.type,
-            service_subtype=svc.subtype,
-            unit_price_cents=int(svc.price_cents),
-            quantity=qty,
-        )
+        return self._catalog.make_item(item.data(Qt.ItemDataRole.UserRole), int(self._qty.value()))
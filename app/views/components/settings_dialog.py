@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Dict, Any, Optional
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
+    QCheckBox,
     QDialog,
     QDialogButtonBox,
     QFormLayout,
     QGridLayout,
     QGroupBox,
     QHBoxLayout,
+    QLabel,
     QLineEdit,
     QMessageBox,
     QSpinBox,
+    QTableWidget,
+    QTableWidgetItem,
     QTabWidget,
     QVBoxLayout,
     QWidget,
@@ -40,6 +45,7 @@ class SettingsDialog(QDialog):
         self._build_company_tab()
         self._build_printer_tab()
         self._build_ui_tab()
+        self._build_maintenance_tab()
 
         self._buttons = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Cancel
@@ -80,12 +86,14 @@ class SettingsDialog(QDialog):
         self._fields["THERMAL_PRINTER_BAUDRATE"] = QSpinBox()
         self._fields["THERMAL_PRINTER_BAUDRATE"].setRange(1200, 256000)
         self._fields["THERMAL_PRINTER_HOST"] = QLineEdit()
+        self._fields["THERMAL_PRINTER_RASTER"] = QCheckBox("Recibo como imagem (logo, QR e código de barras)")
 
         form.addRow("USB Vendor ID (ex 0x04b8):", self._fields["THERMAL_PRINTER_VENDOR_ID"]) 
         form.addRow("USB Product ID (ex 0x0e15):", self._fields["THERMAL_PRINTER_PRODUCT_ID"]) 
         form.addRow("Serial (COMx):", self._fields["THERMAL_PRINTER_SERIAL_PORT"]) 
         form.addRow("Baudrate:", self._fields["THERMAL_PRINTER_BAUDRATE"]) 
         form.addRow("Host (IP):", self._fields["THERMAL_PRINTER_HOST"]) 
+        form.addRow("", self._fields["THERMAL_PRINTER_RASTER"])
 
         tab.setLayout(form)
         self._tabs.addTab(tab, "Impressora")
@@ -110,6 +118,51 @@ class SettingsDialog(QDialog):
         tab.setLayout(form)
         self._tabs.addTab(tab, "Aparência")
 
+    def _build_maintenance_tab(self) -> None:
+        # Somente leitura: estado do arquivo e últimas execuções (backup, ANALYZE, vacuum...)
+        from app.data import maintenance
+        from app.data import sqlite as sqldb
+
+        tab = QWidget(self)
+        box = QVBoxLayout(tab)
+        form = QFormLayout()
+        try:
+            stats = maintenance.file_stats()
+            form.addRow("Tamanho do banco:", QLabel(_fmt_bytes(stats.file_bytes)))
+            form.addRow("Espaço livre interno:", QLabel(f"{_fmt_bytes(stats.free_bytes)} ({stats.freelist_count} páginas)"))
+            form.addRow("Vacuum incremental:", QLabel("ativo" if stats.auto_vacuum == 2 else "inativo (será convertido)"))
+            runs = sqldb.list_maintenance_runs(limit=30)
+        except Exception as exc:
+            form.addRow("Banco:", QLabel(f"indisponível: {exc}"))
+            runs = []
+        reclaimed = sum(r["bytes"] or 0 for r in runs if r["kind"] == maintenance.KIND_VACUUM and r["ok"])
+        form.addRow("Liberado (últimas execuções):", QLabel(_fmt_bytes(reclaimed)))
+        box.addLayout(form)
+
+        table = QTableWidget(len(runs), 5, tab)
+        table.setHorizontalHeaderLabels(["Tarefa", "Início", "Duração", "Bytes", "Status"])
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        for row, run in enumerate(runs):
+            try:
+                started = datetime.fromisoformat(run["started_at_iso"]).astimezone().strftime("%d/%m/%Y %H:%M")
+            except ValueError:
+                started = run["started_at_iso"]
+            values = (
+                run["kind"],
+                started,
+                f"{run['duration_ms'] / 1000:.2f} s",
+                _fmt_bytes(run["bytes"]) if run["bytes"] else "",
+                "ok" if run["ok"] else f"falhou: {run['detail'].get('error', '')}",
+            )
+            for col, text in enumerate(values):
+                table.setItem(row, col, QTableWidgetItem(text))
+        table.resizeColumnsToContents()
+        box.addWidget(table)
+
+        tab.setLayout(box)
+        self._tabs.addTab(tab, "Manutenção")
+
     # ----- Data binding -----
     def _load_values(self, values: Dict[str, Any]) -> None:
         def set_line(key: str, widget: QLineEdit) -> None:
@@ -142,6 +195,10 @@ class SettingsDialog(QDialog):
             if isinstance(w, QSpinBox):
                 w.setValue(val)
 
+        raster = self._fields.get("THERMAL_PRINTER_RASTER")
+        if isinstance(raster, QCheckBox):
+            raster.setChecked(bool(values.get("THERMAL_PRINTER_RASTER", True)))
+
     def _collect_values(self) -> Dict[str, Any]:
         data: Dict[str, Any] = {}
         for key, w in self._fields.items():
@@ -150,15 +207,25 @@ class SettingsDialog(QDialog):
                 data[key] = text if text != "" else None
             elif isinstance(w, QSpinBox):
                 data[key] = int(w.value())
+            elif isinstance(w, QCheckBox):
+                data[key] = w.isChecked()
         return data
 
     def _on_save(self) -> None:
         try:
             values = self._collect_values()
             app_settings.save_settings(values)
+            # Libera a porta antiga já; a próxima impressão abre a nova configuração
+            from app.views.components.thermal_printer import printer_session
+
+            printer_session.reset()
             QMessageBox.information(self, "Configurações", "Configurações salvas com sucesso.")
             self.accept()
         except Exception as exc:
             QMessageBox.critical(self, "Erro", f"Falha ao salvar configurações: {exc}")
 
 
+def _fmt_bytes(n: int) -> str:
+    if n >= 1024 * 1024:
+        return f"{n / (1024 * 1024):.1f} MB"
+    return f"{n / 1024:.0f} KB"
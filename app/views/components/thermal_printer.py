@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+import select
+import socket
+import threading
+import time
+from typing import Callable, Optional, Tuple, TypeVar, Union
 
 from PIL import Image
 
+from app.config import settings as app_settings
+from app.utils import flight_recorder, metrics, tracing
+from app.views.components.receipt_renderer import to_1bit
+
 try:
     from escpos.printer import Usb, Serial, Network
 except Exception:  # libs podem não estar instaladas
@@ -14,6 +22,7 @@ except Exception:  # libs podem não estar instaladas
 class ThermalPrinter:
     def __init__(self, usb: Optional[tuple[int, int]] = None, serial_port: Optional[str] = None, host: Optional[str] = None, baudrate: int = 9600):
         self._p = None
+        self.last_error: Optional[str] = None
         try:
             if usb and Usb:
                 vid, pid = usb
@@ -22,35 +31,99 @@ class ThermalPrinter:
                 self._p = Serial(devfile=serial_port, baudrate=baudrate)
             elif host and Network:
                 self._p = Network(host)
-        except Exception:
+        except Exception as exc:
             self._p = None
+            self.last_error = str(exc)
+
+    @staticmethod
+    def configured() -> bool:
+        """Há alguma impressora (USB, serial ou rede) definida nas configurações."""
+        cfg = app_settings.get_settings()
+        usb = cfg.get("THERMAL_PRINTER_VENDOR_ID") and cfg.get("THERMAL_PRINTER_PRODUCT_ID")
+        return bool(usb or cfg.get("THERMAL_PRINTER_SERIAL_PORT") or cfg.get("THERMAL_PRINTER_HOST"))
+
+    @classmethod
+    def from_settings(cls) -> "ThermalPrinter":
+        cfg = app_settings.get_settings()
+        vid, pid = cfg.get("THERMAL_PRINTER_VENDOR_ID"), cfg.get("THERMAL_PRINTER_PRODUCT_ID")
+        return cls(
+            usb=(vid, pid) if vid and pid else None,
+            serial_port=cfg.get("THERMAL_PRINTER_SERIAL_PORT"),
+            host=cfg.get("THERMAL_PRINTER_HOST"),
+            baudrate=int(cfg.get("THERMAL_PRINTER_BAUDRATE") or 9600),
+        )
 
     def available(self) -> bool:
         return self._p is not None
 
+    @tracing.traced("print.text")
     def print_text(self, text: str) -> bool:
         if not self._p:
             return False
+        t0 = time.perf_counter()
+        ok = False
         try:
             self._p.text(text)
             self._p.text("\n")
+            ok = True
             return True
-        except Exception:
+        except Exception as exc:
+            self.last_error = str(exc)
+            metrics.counter("print.failed").inc()
             return False
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            metrics.histogram("print.text").observe(ms)
+            flight_recorder.record("print", "text", ms, ok, f"{len(text)} caracteres")
 
-    def print_image(self, image_path: str, width: int = 384) -> bool:
-        if not self._p or not os.path.exists(image_path):
+    @tracing.traced("print.raw")
+    def print_raw(self, data: bytes) -> bool:
+        """Envia bytes ESC/POS prontos (ex.: ``receipt_template.Receipt.escpos``)."""
+        if not self._p:
             return False
+        t0 = time.perf_counter()
+        ok = False
         try:
-            img = Image.open(image_path)
-            if img.width > width:
-                ratio = width / img.width
-                img = img.resize((width, int(img.height * ratio)))
-            self._p.image(img)
+            self._p._raw(data)
+            ok = True
             return True
-        except Exception:
+        except Exception as exc:
+            self.last_error = str(exc)
+            metrics.counter("print.failed").inc()
             return False
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            metrics.histogram("print.raw").observe(ms)
+            flight_recorder.record("print", "raw", ms, ok, f"{len(data)} bytes")
+
+    @tracing.traced("print.image")
+    def print_image(self, image: Union[str, Image.Image], width: int = 384) -> bool:
+        """Imprime uma imagem do PIL (ex.: ``receipt_renderer.render_receipt``) ou um arquivo.
 
+        Imagens que não são 1 bit são reduzidas e pontilhadas aqui
+        (``receipt_renderer.to_1bit``), não a cada envio pelo python-escpos.
+        """
+        if not self._p:
+            return False
+        if isinstance(image, str) and not os.path.exists(image):
+            return False
+        t0 = time.perf_counter()
+        ok = False
+        try:
+            img = Image.open(image) if isinstance(image, str) else image
+            self._p.image(to_1bit(img, width))
+            ok = True
+            return True
+        except Exception as exc:
+            self.last_error = str(exc)
+            metrics.counter("print.failed").inc()
+            return False
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            metrics.histogram("print.image").observe(ms)
+            flight_recorder.record("print", "image", ms, ok)
+
+    @tracing.traced("print.cut")
     def cut(self) -> None:
         if not self._p:
             return
@@ -58,3 +131,129 @@ class ThermalPrinter:
             self._p.cut()
         except Exception:
             pass
+
+    def healthy(self) -> bool:
+        """Verificação barata de que a conexão já aberta ainda serve (não envia nada).
+
+        Rede: o socket não foi fechado pela impressora. Serial: a porta segue
+        aberta. USB não tem teste barato; um erro na próxima escrita faz a
+        ``PrinterSession`` reconectar.
+        """
+        if not self._p:
+            return False
+        device = getattr(self._p, "_device", None)
+        if not device:
+            return True  # ainda não abriu: abre na primeira escrita
+        if isinstance(device, socket.socket):
+            try:
+                readable, _, _ = select.select([device], [], [], 0)
+                # Legível sem dados pendentes = a outra ponta fechou
+                return not readable or device.recv(1, socket.MSG_PEEK) != b""
+            except (OSError, ValueError):
+                return False
+        is_open = getattr(device, "is_open", None)
+        return bool(is_open) if is_open is not None else True
+
+    def close(self) -> None:
+        if not self._p:
+            return
+        try:
+            self._p.close()
+        except Exception:
+            pass
+        self._p = None
+
+
+_T = TypeVar("_T")
+
+
+class PrinterSession:
+    """Mantém aberta a conexão com a impressora configurada entre um recibo e outro.
+
+    Abrir USB/serial custa centenas de ms; aqui a mesma ``ThermalPrinter`` é
+    reaproveitada. Ela é refeita quando:
+
+    - as configurações da impressora mudam (comparadas a cada uso, ou
+      ``reset()`` ao salvar no ``SettingsDialog``);
+    - ficou ociosa por ``HEALTH_CHECK_IDLE_S`` e ``healthy()`` falhou;
+    - a conexão não abriu (``run`` tenta abrir de novo uma vez) ou um envio
+      falhou (a próxima tentativa, agendada pela fila, reconecta).
+
+    Usada só pela thread de impressão (``app.utils.print_spooler``).
+    """
+
+    HEALTH_CHECK_IDLE_S = 30.0
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._printer: Optional[ThermalPrinter] = None
+        self._key: Optional[Tuple] = None
+        self._last_used = 0.0
+        self._stale = False
+
+    @staticmethod
+    def _settings_key() -> Tuple:
+        cfg = app_settings.get_settings()
+        return tuple(cfg.get(k) for k in (
+            "THERMAL_PRINTER_VENDOR_ID",
+            "THERMAL_PRINTER_PRODUCT_ID",
+            "THERMAL_PRINTER_SERIAL_PORT",
+            "THERMAL_PRINTER_BAUDRATE",
+            "THERMAL_PRINTER_HOST",
+        ))
+
+    def printer(self) -> ThermalPrinter:
+        with self._lock:
+            key = self._settings_key()
+            now = time.monotonic()
+            reason = None
+            if self._printer is None or self._stale or key != self._key:
+                reason = "connect"
+            elif now - self._last_used > self.HEALTH_CHECK_IDLE_S and not self._printer.healthy():
+                reason = "reconnect"
+            if reason:
+                self._open(key, reason)
+            self._last_used = now
+            return self._printer  # type: ignore[return-value]
+
+    def _open(self, key: Tuple, reason: str) -> None:
+        if self._printer is not None:
+            self._printer.close()
+        t0 = time.perf_counter()
+        self._printer = ThermalPrinter.from_settings()
+        self._key = key
+        self._stale = False
+        metrics.counter(f"print.{reason}").inc()
+        flight_recorder.record("print", reason, (time.perf_counter() - t0) * 1000, self._printer.available(), self._printer.last_error)
+
+    def run(self, job: Callable[[ThermalPrinter], _T]) -> _T:
+        """Executa ``job`` na impressora.
+
+        Só repete na hora quando a conexão não abriu: nada foi enviado ainda.
+        Um erro no meio do ``job`` não é repetido aqui (parte do recibo pode já
+        ter saído); a conexão é refeita no próximo uso e o erro sobe para quem
+        chamou (a fila agenda nova tentativa).
+        """
+        printer = self.printer()
+        if not printer.available():
+            self.reset()
+            printer = self.printer()
+        try:
+            return job(printer)
+        except Exception:
+            self.reset()
+            raise
+
+    def reset(self) -> None:
+        """Refaz a conexão no próximo uso (não bloqueia quem chama)."""
+        self._stale = True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._printer is not None:
+                self._printer.close()
+            self._printer = None
+            self._key = None
+
+
+printer_session = PrinterSession()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QGroupBox, QGridLayout
@@ -8,7 +8,9 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButt
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from app.events.bus import bus
 from app.utils.firebase_repository import FirebaseRepository
+from app.utils.workers import LatestTaskRunner
 from app.views.components.dialog_theme import apply_app_font
 from app.config import settings as app_settings
 
@@ -17,6 +19,15 @@ class DashboardView(QWidget):
     def __init__(self, repository: FirebaseRepository):
         super().__init__()
         self._repo = repository
+        # Consultas fora da thread da UI; só o resultado da recarga mais recente é desenhado
+        self._loader = LatestTaskRunner(self)
+        self._loader.finished.connect(self._on_loaded)
+        self._loader.failed.connect(self._on_failed)
+        # Números agregados: qualquer mudança em pedidos/pagamentos pede recarga,
+        # adiada até a aba ficar visível
+        self._stale = False
+        for signal in (bus.orders_created, bus.orders_updated, bus.orders_deleted, bus.payments_added):
+            signal.connect(self._on_data_changed)
 
         layout = QVBoxLayout(self)
 
@@ -24,12 +35,16 @@ class DashboardView(QWidget):
         actions = QHBoxLayout()
         self._range = QComboBox()
         self._range.addItems(["Últimos 7 dias", "Últimos 30 dias", "Últimos 90 dias", "Tudo"])
+        self._loading = QLabel("Carregando…")
+        self._loading.setVisible(False)
         btn_refresh = QPushButton("Atualizar")
         btn_export = QPushButton("Exportar Relatório")
         btn_refresh.clicked.connect(self.reload)
         btn_export.clicked.connect(self._export_report)
+        self._range.currentIndexChanged.connect(self.reload)
         actions.addWidget(QLabel("Dashboard — Receitas e Serviços"))
         actions.addWidget(self._range)
+        actions.addWidget(self._loading)
         actions.addStretch(1)
         actions.addWidget(btn_refresh)
         actions.addWidget(btn_export)
@@ -68,24 +83,54 @@ class DashboardView(QWidget):
         self.reload()
 
     def reload(self) -> None:
-        self._update_summary()
-        self._draw_top()
-        self._draw_bottom()
-        self._draw_days()
+        """Dispara as consultas em segundo plano; resultados antigos são descartados."""
+        self._loading.setText("Carregando…")
+        self._loading.setVisible(True)
+        self._loader.submit(self._fetch, self._selected_days())
+
+    def _on_data_changed(self, _ids: list) -> None:
+        if self.isVisible():
+            self.reload()
+        else:
+            self._stale = True
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if self._stale:
+            self._stale = False
+            self.reload()
+
+    def _fetch(self, days: int | None) -> Dict[str, Any]:
+        # Roda na thread do pool: apenas consultas, nada de widgets
+        summary_days = days or 30
+        return {
+            "summary": self._repo.summary_since(summary_days),
+            "top": self._repo.top_services_by_revenue(8, days),
+            "bottom": self._repo.bottom_services_by_revenue(8, days),
+            "days": list(reversed(self._repo.revenue_by_day(summary_days))),
+        }
+
+    def _on_loaded(self, data: Dict[str, Any]) -> None:
+        self._loading.setVisible(False)
+        self._update_summary(data["summary"])
+        self._draw_top(data["top"])
+        self._draw_bottom(data["bottom"])
+        self._draw_days(data["days"])
+
+    def _on_failed(self, message: str) -> None:
+        self._loading.setText(f"Falha ao carregar: {message}")
 
     def _selected_days(self) -> int | None:
         idx = self._range.currentIndex()
         return {0: 7, 1: 30, 2: 90}.get(idx, None)
 
-    def _update_summary(self) -> None:
-        days = self._selected_days() or 30
-        count, total, avg = self._repo.summary_since(days)
+    def _update_summary(self, summary: Tuple[int, int, float]) -> None:
+        count, total, avg = summary
         self._lbl_orders.setText(f"Pedidos: {count}")
         self._lbl_total.setText(f"Total: R$ {total/100:.2f}")
         self._lbl_avg.setText(f"Ticket médio: R$ {avg/100:.2f}")
 
-    def _draw_top(self) -> None:
-        data = self._repo.top_services_by_revenue(8, self._selected_days())
+    def _draw_top(self, data: List[Tuple[str, str, str, int]]) -> None:
         labels = [f"{n} ({t}/{s or '-'})" for n, t, s, _ in data]
         values = [c / 100.0 for _, _, _, c in data]
         self._fig_top.clear()
@@ -99,8 +144,7 @@ class DashboardView(QWidget):
         self._fig_top.subplots_adjust(left=0.38, right=0.98, top=0.95, bottom=0.15)
         self._canvas_top.draw()
 
-    def _draw_bottom(self) -> None:
-        data = self._repo.bottom_services_by_revenue(8, self._selected_days())
+    def _draw_bottom(self, data: List[Tuple[str, str, str, int]]) -> None:
         labels = [f"{n} ({t}/{s or '-'})" for n, t, s, _ in data]
         values = [c / 100.0 for _, _, _, c in data]
         self._fig_bottom.clear()
@@ -113,9 +157,7 @@ class DashboardView(QWidget):
         self._fig_bottom.subplots_adjust(left=0.38, right=0.98, top=0.95, bottom=0.15)
         self._canvas_bottom.draw()
 
-    def _draw_days(self) -> None:
-        days = self._selected_days() or 30
-        data = list(reversed(self._repo.revenue_by_day(days)))
+    def _draw_days(self, data: List[Tuple[str, int]]) -> None:
         labels = [d for d, _ in data]
         values = [c / 100.0 for _, c in data]
         self._fig_days.clear()
@@ -152,6 +194,6 @@ class DashboardView(QWidget):
         # Simples feedback no título
         self.window().setWindowTitle(self.window().windowTitle() + f" — Exportado {fname}")
 
-    
+
 
 
@@ -12,6 +12,7 @@ from PyQt6.QtWidgets import (
     QSpinBox,
 )
 
+from app.events.bus import bus
 from app.utils.firebase_repository import FirebaseRepository
 
 
@@ -61,6 +62,7 @@ class InventoryView(QWidget):
         self._btn_upsert.clicked.connect(self._on_upsert)
         self._btn_adjust_plus.clicked.connect(lambda: self._on_adjust(1))
         self._btn_adjust_minus.clicked.connect(lambda: self._on_adjust(-1))
+        bus.inventory_adjusted.connect(self._on_inventory_adjusted)
 
         self.reload()
 
@@ -74,7 +76,7 @@ class InventoryView(QWidget):
         if not item_id or not name:
             return
         self._repository.upsert_inventory_item(item_id, name, unit, qty)
-        self.reload()
+        bus.publish("inventory_adjusted", item_id)
 
     def _on_adjust(self, delta: int) -> None:
         if not self._repository:
@@ -83,7 +85,7 @@ class InventoryView(QWidget):
         if not item_id:
             return
         self._repository.adjust_inventory(item_id, delta)
-        self.reload()
+        bus.publish("inventory_adjusted", item_id)
 
     def reload(self) -> None:
         if not self._repository:
@@ -91,9 +93,25 @@ class InventoryView(QWidget):
             return
         items = self._repository.list_inventory()
         self._table.setRowCount(len(items))
-        for r, (iid, name, unit, qty) in enumerate(items):
-            self._table.setItem(r, 0, QTableWidgetItem(iid))
-            self._table.setItem(r, 1, QTableWidgetItem(name))
-            self._table.setItem(r, 2, QTableWidgetItem(unit))
-            self._table.setItem(r, 3, QTableWidgetItem(str(qty)))
+        for r, row in enumerate(items):
+            self._fill_row(r, row)
         self._table.resizeColumnsToContents()
+
+    def _fill_row(self, r: int, row) -> None:
+        iid, name, unit, qty = row
+        self._table.setItem(r, 0, QTableWidgetItem(iid))
+        self._table.setItem(r, 1, QTableWidgetItem(name))
+        self._table.setItem(r, 2, QTableWidgetItem(unit))
+        self._table.setItem(r, 3, QTableWidgetItem(str(qty)))
+
+    def _on_inventory_adjusted(self, ids: list) -> None:
+        if not self._repository or not ids:
+            self.reload()
+            return
+        positions = {self._table.item(r, 0).text(): r for r in range(self._table.rowCount()) if self._table.item(r, 0)}
+        for row in self._repository.list_inventory(ids):
+            r = positions.get(row[0])
+            if r is None:
+                r = self._table.rowCount()
+                self._table.insertRow(r)
+            self._fill_row(r, row)
@@ -1,19 +1,18 @@
 from __future__ import annotations
 
+from typing import Callable, Dict, Tuple
+
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QAction, QKeySequence
-from PyQt6.QtWidgets import QLabel, QMainWindow, QStatusBar, QTabWidget, QWidget, QVBoxLayout
+from PyQt6.QtWidgets import QLabel, QMainWindow, QMessageBox, QStatusBar, QTabWidget, QWidget, QVBoxLayout
 
 from app.config.settings import WINDOW_TITLE, APP_NAME, PHONE, CNPJ
 from app.controllers.service_controller import ServiceController
 from app.controllers.client_controller import ClientController
 from app.controllers.orders_controller import OrdersController
 from app.utils.firebase_repository import FirebaseRepository
-from app.views.clients_view import ClientsView
-from app.views.services_view import ServicesView
-from app.views.orders_list_view import OrdersListView
-from app.views.dashboard_view import DashboardView
 from app.utils.icons_manager import IconManager
+from app.utils.print_spooler import spooler
 from app.views.components.settings_dialog import SettingsDialog
 from app.views.components.sync_dialog import SyncDialog
 from app.views.components.dialog_theme import toggle_app_theme, set_app_theme, apply_app_font
@@ -35,28 +34,41 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(WINDOW_TITLE)
         self.resize(1100, 760)
 
+        # Abas são construídas na primeira exibição (ver tab_view); aqui só entram
+        # contêineres vazios, para a janela aparecer sem importar/consultar nada pesado.
         self._tabs = QTabWidget(self)
         apply_app_font(self._tabs)
-        self._tab_clients = ClientsView(self._client_controller)
-        self._tab_services = ServicesView(self._service_controller)
-        self._tab_orders_list = OrdersListView(
-            self._orders_controller, self._client_controller, self._service_controller
+        self._tab_factories: Dict[str, Callable[[], QWidget]] = {
+            "orders": self._build_orders_list,
+            "clients": self._build_clients,
+            "services": self._build_services,
+            "dashboard": self._build_dashboard,
+        }
+        self._tab_views: Dict[str, QWidget] = {}
+        self._tab_pages: Dict[str, QWidget] = {}
+        tab_specs: Tuple[Tuple[str, str, str], ...] = (
+            ("orders", "lista", "Pedidos"),
+            ("clients", "clientes", "Clientes"),
+            ("services", "servicos", "Serviços"),
+            ("dashboard", "dashboard", "Dashboard"),
         )
-        self._tab_dashboard = DashboardView(self._repository)
-
-        self._tabs.addTab(self._tab_orders_list, IconManager.get_icon("lista"), "Pedidos")
-        self._tabs.addTab(self._tab_clients, IconManager.get_icon("clientes"), "Clientes")
-        self._tabs.addTab(self._tab_services, IconManager.get_icon("servicos"), "Serviços")
-        self._tabs.addTab(self._tab_dashboard, IconManager.get_icon("dashboard"), "Dashboard")
+        for key, icon_name, title in tab_specs:
+            page = QWidget()
+            page.setObjectName(key)
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            self._tab_pages[key] = page
+            self._tabs.addTab(page, IconManager.get_icon(icon_name), title)
+        self._tabs.currentChanged.connect(self._on_tab_changed)
 
         # Header com logo + ações
         header_actions = [
-            ("pedido", "Novo Pedido", "Ctrl+N", lambda: self._tab_orders_list.open_new_order()),
-            ("clientes", "Clientes", "Ctrl+Shift+C", lambda: self._tabs.setCurrentWidget(self._tab_clients)),
-            ("servicos", "Serviços", "Ctrl+Shift+S", lambda: self._tabs.setCurrentWidget(self._tab_services)),
+            ("pedido", "Novo Pedido", "Ctrl+N", self._open_new_order),
+            ("clientes", "Clientes", "Ctrl+Shift+C", lambda: self.show_tab("clients")),
+            ("servicos", "Serviços", "Ctrl+Shift+S", lambda: self.show_tab("services")),
             ("config", "Configurações", "Ctrl+,", self._open_settings_dialog),
             ("toggle", "Alternar tema", "Ctrl+T", self._toggle_theme),
-            ("dashboard", "Dashboard", "Ctrl+D", lambda: self._tabs.setCurrentWidget(self._tab_dashboard)),
+            ("dashboard", "Dashboard", "Ctrl+D", lambda: self.show_tab("dashboard")),
         ]
         header = HeaderBar(WINDOW_TITLE, header_actions, self)
         header.setObjectName("HeaderBar")
@@ -81,6 +93,49 @@ class MainWindow(QMainWindow):
         self._build_status_bar()
         self._build_menu()
 
+    # ----- Abas sob demanda -----
+    def _build_orders_list(self) -> QWidget:
+        from app.views.orders_list_view import OrdersListView
+        return OrdersListView(self._orders_controller, self._client_controller, self._service_controller)
+
+    def _build_clients(self) -> QWidget:
+        from app.views.clients_view import ClientsView
+        return ClientsView(self._client_controller)
+
+    def _build_services(self) -> QWidget:
+        from app.views.services_view import ServicesView
+        return ServicesView(self._service_controller)
+
+    def _build_dashboard(self) -> QWidget:
+        # matplotlib (backend Qt) só é importado quando o dashboard é aberto
+        from app.views.dashboard_view import DashboardView
+        return DashboardView(self._repository)
+
+    def tab_view(self, key: str) -> QWidget:
+        """Retorna a view da aba, construindo-a na primeira chamada."""
+        view = self._tab_views.get(key)
+        if view is None:
+            view = self._tab_factories[key]()
+            apply_app_font(view)
+            self._tab_pages[key].layout().addWidget(view)
+            self._tab_views[key] = view
+        return view
+
+    def _on_tab_changed(self, index: int) -> None:
+        page = self._tabs.widget(index)
+        if page is not None and page.objectName() in self._tab_factories:
+            self.tab_view(page.objectName())
+
+    def prepare_current_tab(self) -> None:
+        """Constrói a aba visível; chamado logo após a janela ser exibida."""
+        self._on_tab_changed(self._tabs.currentIndex())
+
+    def show_tab(self, key: str) -> None:
+        self._tabs.setCurrentWidget(self._tab_pages[key])
+
+    def _open_new_order(self) -> None:
+        self.tab_view("orders").open_new_order()
+
     def _build_status_bar(self) -> None:
         sb = QStatusBar(self)
         status = f"{APP_NAME} | Tel: {PHONE} | CNPJ: {CNPJ}"
@@ -88,7 +143,17 @@ class MainWindow(QMainWindow):
         label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
         sb.addWidget(label)
         self.setStatusBar(sb)
-        
+        # Andamento da fila de impressão (app.utils.print_spooler)
+        spooler.job_queued.connect(lambda job_id: sb.showMessage(f"Recibo #{job_id} na fila de impressão", 5000))
+        spooler.job_finished.connect(self._on_print_job_finished)
+
+    def _on_print_job_finished(self, job_id: int, status: str, latency_ms: float, detail: str) -> None:
+        if status == "done":
+            self.statusBar().showMessage(f"Recibo #{job_id} impresso ({detail}) em {latency_ms / 1000:.1f} s", 5000)
+        elif status == "pending":
+            self.statusBar().showMessage(f"Recibo #{job_id}: {detail}; tentando de novo…", 10000)
+        else:
+            QMessageBox.warning(self, "Impressão", f"Não foi possível imprimir o recibo #{job_id}:\n{detail}")
 
     def _update_sync_count(self) -> None:
         # Sem sincronização (modo offline)
@@ -104,26 +169,26 @@ class MainWindow(QMainWindow):
         menu_nav = self.menuBar().addMenu("Atalhos")
         act_new_order = QAction(IconManager.get_icon("pedido"), "Novo Pedido", self)
         act_new_order.setShortcut(QKeySequence("Ctrl+N"))
-        act_new_order.triggered.connect(lambda: self._tab_orders_list.open_new_order())
+        act_new_order.triggered.connect(self._open_new_order)
         menu_nav.addAction(act_new_order)
 
         act_list_orders = QAction(IconManager.get_icon("lista"), "Lista de Pedidos", self)
         act_list_orders.setShortcut(QKeySequence("Ctrl+L"))
-        act_list_orders.triggered.connect(lambda: self._tabs.setCurrentWidget(self._tab_orders_list))
+        act_list_orders.triggered.connect(lambda: self.show_tab("orders"))
         menu_nav.addAction(act_list_orders)
 
         act_clients = QAction(IconManager.get_icon("clientes"), "Clientes", self)
         act_clients.setShortcut(QKeySequence("Ctrl+Shift+C"))
-        act_clients.triggered.connect(lambda: self._tabs.setCurrentWidget(self._tab_clients))
+        act_clients.triggered.connect(lambda: self.show_tab("clients"))
         menu_nav.addAction(act_clients)
 
         act_services = QAction(IconManager.get_icon("servicos"), "Serviços", self)
         act_services.setShortcut(QKeySequence("Ctrl+Shift+S"))
-        act_services.triggered.connect(lambda: self._tabs.setCurrentWidget(self._tab_services))
+        act_services.triggered.connect(lambda: self.show_tab("services"))
         menu_nav.addAction(act_services)
         act_dash = QAction(IconManager.get_icon("dashboard"), "Dashboard", self)
         act_dash.setShortcut(QKeySequence("Ctrl+D"))
-        act_dash.triggered.connect(lambda: self._tabs.setCurrentWidget(self._tab_dashboard))
+        act_dash.triggered.connect(lambda: self.show_tab("dashboard"))
         menu_nav.addAction(act_dash)
 
         # Configurações
@@ -132,6 +197,10 @@ class MainWindow(QMainWindow):
         act_settings.setShortcut(QKeySequence("Ctrl+,"))
         act_settings.triggered.connect(self._open_settings_dialog)
         menu_settings.addAction(act_settings)
+        act_diag = QAction(IconManager.get_icon("dashboard"), "Diagnóstico de desempenho", self)
+        act_diag.setShortcut(QKeySequence("Ctrl+Shift+D"))
+        act_diag.triggered.connect(self._open_diagnostics)
+        menu_settings.addAction(act_diag)
         # Removido: ação de sincronização
 
     def _open_settings_dialog(self) -> None:
@@ -141,6 +210,17 @@ class MainWindow(QMainWindow):
             from app.config.settings import WINDOW_TITLE
             self.setWindowTitle(WINDOW_TITLE)
 
+    def _open_diagnostics(self) -> None:
+        # Não modal e reaproveitado: pode ficar aberto enquanto se reproduz o problema
+        from app.views.components.diagnostics_dialog import DiagnosticsDialog
+
+        dlg = getattr(self, "_diagnostics", None)
+        if dlg is None:
+            dlg = self._diagnostics = DiagnosticsDialog(self)
+        dlg.show()
+        dlg.raise_()
+        dlg.activateWindow()
+
     def _open_sync_dialog(self) -> None:
         # Removido: sem sincronização online
         pass
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone, date
-import os
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QKeySequence, QShortcut, QFont
@@ -11,6 +10,7 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QCheckBox,
     QComboBox,
     QPushButton,
     QTableWidget,
@@ -24,13 +24,18 @@ from app.config.settings import UI_TABLE_ROW_HEIGHT, UI_FONT_SIZE_PT
 from app.controllers.client_controller import ClientController
 from app.controllers.orders_controller import OrdersController
 from app.controllers.service_controller import ServiceController
+from app.events.bus import bus
+from app.utils import flight_recorder, tracing
+from app.utils.print_spooler import spooler
 from app.utils.icons_manager import IconManager
+from app.views.components import receipt_template
 from app.views.components.order_dialog import OrderDialog
-from app.views.components.qr_barcode_utils import generate_qr_png, generate_barcode_png
-from app.config import settings as app_settings
 
 
 class OrdersListView(QWidget):
+    # Acima de tantos blocos de linhas a remover, recarrega a tabela inteira
+    MAX_ROW_PATCHES = 200
+
     def __init__(self, orders_controller: OrdersController, client_controller: ClientController, service_controller: ServiceController):
         super().__init__()
         self._orders_ctrl = orders_controller
@@ -46,6 +51,8 @@ class OrdersListView(QWidget):
         self._q_code = QLineEdit()
         self._q_code.setPlaceholderText("Código do pedido (QR/Barcode)...")
         self._btn_search = QPushButton(IconManager.get_icon("buscar"), "Buscar")
+        # Pedidos arquivados só entram na busca quando pedido (ou pelo código MC-AAMMDD)
+        self._include_archived = QCheckBox("Incluir arquivados")
 
         header = QHBoxLayout()
         header.addWidget(self._btn_new_order)
@@ -56,6 +63,7 @@ class OrdersListView(QWidget):
         header.addWidget(QLabel("Código:"))
         header.addWidget(self._q_code)
         header.addWidget(self._btn_search)
+        header.addWidget(self._include_archived)
         header.addStretch(1)
 
         # Tabela
@@ -83,6 +91,7 @@ class OrdersListView(QWidget):
         self._closing_date.setDate(date.today())
         self._btn_cash_close = QPushButton("Fechar Caixa do Dia")
         self._btn_mark_delivered = QPushButton(IconManager.get_icon("adicionar"), "Marcar entregue")
+        self._btn_reprint = QPushButton(IconManager.get_icon("imprimir"), "Reimprimir recibo")
         self._btn_delete = QPushButton(IconManager.get_icon("excluir"), "Remover Pedido")
 
         bottom_bar = QHBoxLayout()
@@ -90,6 +99,7 @@ class OrdersListView(QWidget):
         bottom_bar.addWidget(self._closing_date)
         bottom_bar.addWidget(self._btn_cash_close)
         bottom_bar.addStretch(1)
+        bottom_bar.addWidget(self._btn_reprint)
         bottom_bar.addWidget(self._btn_mark_delivered)
         bottom_bar.addWidget(self._btn_delete)
 
@@ -104,16 +114,24 @@ class OrdersListView(QWidget):
         self._btn_search.clicked.connect(self._reload)
         self._q_client.returnPressed.connect(self._reload)
         self._q_code.returnPressed.connect(self._reload)
+        self._include_archived.toggled.connect(self._reload)
         self._btn_mark_delivered.clicked.connect(self._mark_delivered)
+        self._btn_reprint.clicked.connect(self._reprint_selected)
         self._btn_cash_close.clicked.connect(self._on_cash_close)
         self._table.itemSelectionChanged.connect(self._on_selection_changed)
         self._btn_delete.clicked.connect(self._on_delete)
 
         # Atalhos (evita conflito do Ctrl+N com o menu)
         QShortcut(QKeySequence("Ctrl+D"), self, self._mark_delivered)
+        QShortcut(QKeySequence("Ctrl+P"), self, self._reprint_selected)
         QShortcut(QKeySequence("Delete"), self, self._on_delete)
         QShortcut(QKeySequence("Return"), self, self._reload)
 
+        # Mudanças em pedidos (desta tela ou de outras) atualizam só as linhas afetadas
+        bus.orders_created.connect(self._on_orders_created)
+        bus.orders_updated.connect(self._on_orders_updated)
+        bus.orders_deleted.connect(self._on_orders_deleted)
+
         self._reload()
         self._on_selection_changed()
 
@@ -124,70 +142,40 @@ class OrdersListView(QWidget):
         dlg = OrderDialog(self, self._client_ctrl, self._service_ctrl, self._orders_ctrl)
         if dlg.exec() != dlg.DialogCode.Accepted:
             return
-        client = dlg.selected_client()
         client_id = dlg.selected_client_id()
         items = dlg.selected_items()
         if not client_id or not items:
             return
-        due_iso = dlg.selected_due_date_iso()
-        order = self._orders_ctrl.create_order(client_id, items, due_date_iso=due_iso)
+        with tracing.span("ui.new_order", items=len(items)), flight_recorder.timed("ui", "new_order", f"{len(items)} itens"):
+            due_iso = dlg.selected_due_date_iso()
+            order = self._orders_ctrl.create_order(client_id, items, due_date_iso=due_iso)
 
-        payment_mode = dlg.selected_payment_mode()
-        total_cents = sum(i.unit_price_cents * i.quantity for i in items)
-        if payment_mode == "Pagar 50% agora":
-            self._orders_ctrl.add_payment(order.id, total_cents // 2, method="entrada", note="50%")
-        elif payment_mode == "Pagar tudo agora":
-            self._orders_ctrl.add_payment(order.id, total_cents, method="à vista", note="100%")
+            payment_mode = dlg.selected_payment_mode()
+            total_cents = sum(i.unit_price_cents * i.quantity for i in items)
+            if payment_mode == "Pagar 50% agora":
+                self._orders_ctrl.add_payment(order.id, total_cents // 2, method="entrada", note="50%")
+            elif payment_mode == "Pagar tudo agora":
+                self._orders_ctrl.add_payment(order.id, total_cents, method="à vista", note="100%")
 
-        if getattr(dlg, 'should_print', lambda: False)():
-            self._print_receipt(client, items, total_cents, order.order_code)
+            if getattr(dlg, 'should_print', lambda: False)():
+                self._print_receipts([order.id])
 
-        self._reload()
         QMessageBox.information(self, "Pedido criado", f"Pedido criado com total R$ {total_cents/100:.2f}.")
 
-    def _print_receipt(self, client, items, total_cents: int, order_code: str | None) -> None:
-        lines = []
-        lines.append("Myrthes Costuras — Recibo de Pedido")
-        lines.append(f"Cliente: {getattr(client,'name','')} — {getattr(client,'phone','') or ''}")
-        lines.append("")
-        for it in items:
-            price = (it.unit_price_cents * it.quantity) / 100.0
-            lines.append(f"- {it.service_name} ({it.service_subtype or it.service_type}) x{it.quantity} — R$ {price:.2f}")
-        lines.append("-")
-        lines.append(f"Total: R$ {total_cents/100:.2f}")
-
-        qr_path = bc_path = None
-        if order_code:
-            qr_path = generate_qr_png(order_code)
-            bc_path = generate_barcode_png(order_code)
-            lines.append("")
-            lines.append(f"Código do Pedido: {order_code}")
-
-        try:
-            from app.views.components.thermal_printer import ThermalPrinter
-            vid = getattr(app_settings, "THERMAL_PRINTER_VENDOR_ID", None)
-            pid = getattr(app_settings, "THERMAL_PRINTER_PRODUCT_ID", None)
-            printer = ThermalPrinter(
-                usb=(vid, pid) if vid and pid else None,
-                serial_port=getattr(app_settings, "THERMAL_PRINTER_SERIAL_PORT", None),
-                host=getattr(app_settings, "THERMAL_PRINTER_HOST", None),
-                baudrate=int(getattr(app_settings, "THERMAL_PRINTER_BAUDRATE", 9600)),
-            )
-            if printer.available():
-                printer.print_text("\n".join(lines) + "\n\n")
-                if qr_path:
-                    printer.print_image(qr_path)
-                if bc_path:
-                    printer.print_image(bc_path)
-                printer.cut()
-                return
-        except Exception:
-            pass
-
-        if order_code and qr_path and bc_path:
-            lines += [f"QR: {os.path.abspath(qr_path)}", f"Barcode: {os.path.abspath(bc_path)}", "(Use um app de QR/código de barras no celular para identificar o pedido)"]
-        with open("recibo.txt", "w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
+    @tracing.traced("ui.print_receipt")
+    @flight_recorder.recorded("ui", "print_receipt")
+    def _print_receipts(self, order_ids: list[str]) -> int:
+        """Recibos dos pedidos (com pagamentos registrados) pelo modelo comum; retorna quantos."""
+        receipts = receipt_template.render_many(self._orders_ctrl.receipt_records(order_ids))
+        # A impressão (e o recibo.txt, se não houver impressora) sai da fila em segundo plano
+        for receipt in receipts:
+            spooler.submit_receipt(receipt)
+        return len(receipts)
+
+    def _reprint_selected(self) -> None:
+        ids = self._selected_order_ids()
+        if ids:
+            self._print_receipts(ids)
 
     def _on_cash_close(self) -> None:
         date_iso = self._closing_date.date().toString("yyyy-MM-dd")
@@ -209,56 +197,146 @@ class OrdersListView(QWidget):
         )
         if ret != QMessageBox.StandardButton.Yes:
             return
-        for m in rows:
-            row = m.row()
-            item = self._table.item(row, 5)
-            oid = item.data(Qt.ItemDataRole.UserRole) if item else None
-            if not oid and item:
-                oid = item.text()
-            if oid:
-                self._orders_ctrl.delete_order(str(oid))
-        self._reload()
+        # Uma transação para toda a seleção; as linhas saem via orders_deleted
+        ids = self._selected_order_ids()
+        self._warn_archived(ids, self._orders_ctrl.delete_orders(ids), "removidos")
 
-    def _reload(self) -> None:
+    def _list_orders(self, ids: list[str] | None = None):
+        """Consulta com os filtros atuais da barra de busca (opcionalmente só ``ids``)."""
         status = self._status.currentText()
         q_client = self._q_client.text().strip()
         q_code = self._q_code.text().strip()
-        rows = self._orders_ctrl.list_orders(status if status != "todos" else None, q_client or None, q_code or None)
+        return self._orders_ctrl.list_orders(
+            status if status != "todos" else None,
+            q_client or None,
+            q_code or None,
+            ids=ids,
+            include_archived=self._include_archived.isChecked(),
+        )
+
+    def _reload(self) -> None:
+        rows = self._list_orders()
         self._table.setRowCount(len(rows))
-        for r, (oid, code, client_name, status, total_cents, due) in enumerate(rows):
-            self._table.setItem(r, 0, QTableWidgetItem(code or ""))
-            self._table.setItem(r, 1, QTableWidgetItem(client_name or ""))
-            self._table.setItem(r, 2, QTableWidgetItem(status))
-            self._table.setItem(r, 3, QTableWidgetItem(f"{(total_cents/100):.2f}"))
-            self._table.setItem(r, 4, QTableWidgetItem(due or ""))
-            id_item = QTableWidgetItem(oid)
-            id_item.setData(Qt.ItemDataRole.UserRole, oid)
-            self._table.setItem(r, 5, id_item)
-            self._table.setRowHeight(r, UI_TABLE_ROW_HEIGHT)
+        for r, row in enumerate(rows):
+            self._fill_row(r, row)
         self._table.resizeColumnsToContents()
         self._table.setColumnHidden(5, True)
 
-    def _current_order_id(self) -> str | None:
-        rows = self._table.selectionModel().selectedRows()
-        if not rows:
-            return None
-        row = rows[0].row()
-        item = self._table.item(row, 5)
-        oid = item.data(Qt.ItemDataRole.UserRole) if item else None
-        if not oid and item:
-            oid = item.text()
-        return oid
+    def _fill_row(self, r: int, row) -> None:
+        oid, code, client_name, status, total_cents, due = row
+        self._table.setItem(r, 0, QTableWidgetItem(code or ""))
+        self._table.setItem(r, 1, QTableWidgetItem(client_name or ""))
+        self._table.setItem(r, 2, QTableWidgetItem(status))
+        self._table.setItem(r, 3, QTableWidgetItem(f"{(total_cents/100):.2f}"))
+        self._table.setItem(r, 4, QTableWidgetItem(due or ""))
+        id_item = QTableWidgetItem(oid)
+        id_item.setData(Qt.ItemDataRole.UserRole, oid)
+        self._table.setItem(r, 5, id_item)
+        self._table.setRowHeight(r, UI_TABLE_ROW_HEIGHT)
+
+    def _rows_by_id(self) -> dict[str, int]:
+        rows: dict[str, int] = {}
+        for r in range(self._table.rowCount()):
+            item = self._table.item(r, 5)
+            if item is not None:
+                rows[str(item.data(Qt.ItemDataRole.UserRole) or item.text())] = r
+        return rows
+
+    def _on_orders_created(self, ids: list) -> None:
+        if not ids:
+            self._reload()
+            return
+        # Mais novos no topo, como na consulta completa
+        for row in reversed(self._list_orders(ids)):
+            self._table.insertRow(0)
+            self._fill_row(0, row)
+
+    def _on_orders_updated(self, ids: list) -> None:
+        if not ids:
+            self._reload()
+            return
+        fresh = {row[0]: row for row in self._list_orders(ids)}
+        positions = self._rows_by_id()
+        gone: list[int] = []
+        for oid in ids:
+            r = positions.get(oid)
+            if r is None:
+                continue
+            if oid in fresh:
+                self._fill_row(r, fresh.pop(oid))
+            else:
+                # Deixou de atender ao filtro atual (ex.: status)
+                gone.append(r)
+        if not self._remove_rows(gone):
+            return  # a tabela foi recarregada por inteiro
+        # Passou a atender ao filtro: entra no topo
+        for row in reversed(list(fresh.values())):
+            self._table.insertRow(0)
+            self._fill_row(0, row)
+
+    def _on_orders_deleted(self, ids: list) -> None:
+        if not ids:
+            self._reload()
+            return
+        positions = self._rows_by_id()
+        self._remove_rows(positions[oid] for oid in ids if oid in positions)
+
+    def _remove_rows(self, rows) -> bool:
+        """Remove as linhas em blocos contíguos (uma chamada por bloco, de baixo para cima).
+
+        Retorna ``False`` se preferiu recarregar a tabela inteira.
+        """
+        runs: list[list[int]] = []
+        for r in sorted(set(rows), reverse=True):
+            if runs and runs[-1][0] == r + 1:
+                runs[-1][0] = r
+                runs[-1][1] += 1
+            else:
+                runs.append([r, 1])
+        if len(runs) > self.MAX_ROW_PATCHES:
+            # Seleção muito espalhada: refazer a tabela sai mais barato
+            self._reload()
+            return False
+        model = self._table.model()
+        for start, count in runs:
+            model.removeRows(start, count)
+        return True
+
+    def _selected_order_ids(self) -> list[str]:
+        ids: list[str] = []
+        for m in self._table.selectionModel().selectedRows():
+            item = self._table.item(m.row(), 5)
+            oid = item.data(Qt.ItemDataRole.UserRole) if item else None
+            if not oid and item:
+                oid = item.text()
+            if oid:
+                ids.append(str(oid))
+        return ids
 
     def _mark_delivered(self) -> None:
-        oid = self._current_order_id()
-        if not oid:
-            QMessageBox.information(self, "Pedidos", "Selecione um pedido na tabela.")
+        ids = self._selected_order_ids()
+        if not ids:
+            QMessageBox.information(self, "Pedidos", "Selecione um ou mais pedidos na tabela.")
             return
         delivered_iso = datetime.now(timezone.utc).isoformat()
-        self._orders_ctrl.update_status(oid, "entregue", delivered_iso)
-        self._reload()
+        self._warn_archived(ids, self._orders_ctrl.update_statuses(ids, "entregue", delivered_iso), "alterados")
+
+    def _warn_archived(self, requested: list[str], done: list[str], verb: str) -> None:
+        """Avisa dos pedidos da seleção que a operação não alcançou.
+
+        Remoção e mudança de status só valem para o banco principal; os
+        pedidos do arquivo morto ("Incluir arquivados") ficam como estão.
+        """
+        skipped = len(set(requested) - set(done))
+        if skipped:
+            QMessageBox.information(
+                self,
+                "Pedidos",
+                f"{skipped} pedido(s) arquivado(s) não foram {verb}: o arquivo morto é somente leitura.",
+            )
 
     def _on_selection_changed(self) -> None:
         has_sel = bool(self._table.selectionModel().selectedRows())
         self._btn_mark_delivered.setEnabled(has_sel)
+        self._btn_reprint.setEnabled(has_sel)
         self._btn_delete.setEnabled(has_sel)
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from datetime import date
-import os
+from datetime import date, datetime, timezone
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
@@ -9,7 +8,6 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QHBoxLayout,
     QLabel,
-    QLineEdit,
     QComboBox,
     QPushButton,
     QTableWidget,
@@ -17,20 +15,15 @@ from PyQt6.QtWidgets import (
     QDateEdit,
 )
 
-from app.config.settings import (
-    THERMAL_PRINTER_VENDOR_ID,
-    THERMAL_PRINTER_PRODUCT_ID,
-    THERMAL_PRINTER_SERIAL_PORT,
-    THERMAL_PRINTER_BAUDRATE,
-    THERMAL_PRINTER_HOST,
-)
 from app.controllers.client_controller import ClientController
 from app.controllers.orders_controller import OrdersController
 from app.controllers.service_controller import ServiceController
-from app.models.order import OrderItem
+from app.models.order import Order, OrderItem
+from app.utils import flight_recorder, tracing
+from app.utils.print_spooler import spooler
+from app.views.components import receipt_template
+from app.views.components.client_picker import ClientPicker
 from app.views.components.service_item_dialog import ServiceItemDialog
-from app.views.components.qr_barcode_utils import generate_qr_png, generate_barcode_png
-from app.views.components.thermal_printer import ThermalPrinter
 
 
 class OrdersView(QWidget):
@@ -41,9 +34,7 @@ class OrdersView(QWidget):
         self._orders_ctrl = orders_controller
 
         # Cliente
-        self._client_search = QLineEdit()
-        self._client_search.setPlaceholderText("Filtrar cliente por nome ou telefone...")
-        self._client_combo = QComboBox()
+        self._client_picker = ClientPicker(client_controller)
 
         # Prazo e status
         self._due_date = QDateEdit()
@@ -69,8 +60,7 @@ class OrdersView(QWidget):
         # Cliente UI
         client_row = QHBoxLayout()
         client_row.addWidget(QLabel("Cliente:"))
-        client_row.addWidget(self._client_combo, 2)
-        client_row.addWidget(self._client_search, 1)
+        client_row.addWidget(self._client_picker, 1)
         layout.addLayout(client_row)
 
         # Prazo/Status
@@ -104,17 +94,6 @@ class OrdersView(QWidget):
         self._btn_remove_item.clicked.connect(self._on_remove_item)
         self._btn_save.clicked.connect(self._on_save)
         self._btn_print.clicked.connect(self._on_print)
-        self._client_search.textChanged.connect(self._reload_clients)
-
-        self._reload_clients()
-
-    def _reload_clients(self) -> None:
-        query = self._client_search.text().strip()
-        clients = self._client_ctrl.search(query) if query else self._client_ctrl.list()
-        self._client_combo.clear()
-        for c in clients:
-            label = f"{c.name} — {c.phone or ''}"
-            self._client_combo.addItem(label, c)
 
     def _on_add_item(self) -> None:
         dlg = ServiceItemDialog(self, self._service_ctrl)
@@ -138,10 +117,9 @@ class OrdersView(QWidget):
         self._recalc_total()
 
     def _on_save(self) -> None:
-        idx = self._client_combo.currentIndex()
-        if idx < 0:
+        client = self._client_picker.selected_client()
+        if client is None:
             return
-        client = self._client_combo.itemData(idx)
         items: list[OrderItem] = []
         for r in range(self._table.rowCount()):
             it = self._table.item(r, 0).data(Qt.ItemDataRole.UserRole)
@@ -149,69 +127,36 @@ class OrdersView(QWidget):
         if not items:
             return
         due_iso = self._due_date.date().toString("yyyy-MM-dd")
-        order = self._orders_ctrl.create_order(client.id, items, due_date_iso=due_iso)
-        if self._status_combo.currentText() != "aberto":
-            self._orders_ctrl.update_status(order.id, self._status_combo.currentText(), None)
+        with tracing.span("ui.save_order", items=len(items)), flight_recorder.timed("ui", "save_order", f"{len(items)} itens"):
+            order = self._orders_ctrl.create_order(client.id, items, due_date_iso=due_iso)
+            if self._status_combo.currentText() != "aberto":
+                self._orders_ctrl.update_status(order.id, self._status_combo.currentText(), None)
         self._last_order_code = order.order_code if hasattr(order, 'order_code') else None
         self._table.setRowCount(0)
         self._recalc_total()
 
     def _on_print(self) -> None:
-        idx = self._client_combo.currentIndex()
-        if idx < 0:
+        client = self._client_picker.selected_client()
+        if client is None:
             return
-        client = self._client_combo.itemData(idx)
-        # total atual
-        total_cents = 0
-        items_text = []
-        for r in range(self._table.rowCount()):
-            it: OrderItem = self._table.item(r, 0).data(Qt.ItemDataRole.UserRole)
-            total_cents += it.unit_price_cents * it.quantity
-            price = (it.unit_price_cents * it.quantity) / 100.0
-            items_text.append(f"- {it.service_name} ({it.service_subtype or it.service_type}) x{it.quantity} — R$ {price:.2f}")
-        header = [
-            "Myrthes Costuras",
-            f"Cliente: {client.name} — {client.phone or ''}",
-            f"Prazo: {self._due_date.date().toString('dd/MM/yyyy')}  Status: {self._status_combo.currentText()}",
-            "",
-        ]
-        footer = [
-            "-",
-            f"Total: R$ {total_cents/100:.2f}",
-        ]
-        code_line = []
-        qr_path = bc_path = None
-        if hasattr(self, "_last_order_code") and self._last_order_code:
-            from app.views.components.qr_barcode_utils import generate_qr_png, generate_barcode_png
-            qr_path = generate_qr_png(self._last_order_code)
-            bc_path = generate_barcode_png(self._last_order_code)
-            code_line = [
-                "",
-                f"Código do Pedido: {self._last_order_code}",
-            ]
-        # Tenta impressora térmica
-        printer = ThermalPrinter(
-            usb=(THERMAL_PRINTER_VENDOR_ID, THERMAL_PRINTER_PRODUCT_ID) if THERMAL_PRINTER_VENDOR_ID and THERMAL_PRINTER_PRODUCT_ID else None,
-            serial_port=THERMAL_PRINTER_SERIAL_PORT,
-            host=THERMAL_PRINTER_HOST,
-            baudrate=THERMAL_PRINTER_BAUDRATE,
+        self._print_receipt(client)
+
+    @tracing.traced("ui.print_receipt")
+    @flight_recorder.recorded("ui", "print_receipt")
+    def _print_receipt(self, client) -> None:
+        # Itens que estão na tela agora
+        items: list[OrderItem] = [self._table.item(r, 0).data(Qt.ItemDataRole.UserRole) for r in range(self._table.rowCount())]
+        order = Order(
+            id=None,
+            client_id=client.id,
+            created_at_iso=datetime.now(timezone.utc).isoformat(),
+            status=self._status_combo.currentText(),
+            items=items,
+            due_date_iso=self._due_date.date().toString("yyyy-MM-dd"),
+            order_code=getattr(self, "_last_order_code", None),
         )
-        if printer.available():
-            txt = "\n".join(header + items_text + footer + code_line) + "\n\n"
-            ok = printer.print_text(txt)
-            if ok and qr_path:
-                printer.print_image(qr_path)
-            if ok and bc_path:
-                printer.print_image(bc_path)
-            printer.cut()
-            return
-        # Fallback: recibo.txt
-        lines = header + items_text + footer
-        if code_line:
-            lines += code_line + [f"QR: {os.path.abspath(qr_path)}", f"Barcode: {os.path.abspath(bc_path)}", "(Use um app de QR/código de barras no celular para identificar o pedido)"]
-        text = "\n".join(lines)
-        with open("recibo.txt", "w", encoding="utf-8") as f:
-            f.write(text)
+        # A impressão (e o recibo.txt, se não houver impressora) sai da fila em segundo plano
+        spooler.submit_receipt(receipt_template.render(order, client))
 
     def _recalc_total(self) -> None:
         total_cents = 0
@@ -18,6 +18,7 @@ from PyQt6.QtWidgets import (
 
 from app.config.settings import UI_TABLE_ROW_HEIGHT, UI_FONT_SIZE_PT
 from app.controllers.service_controller import ServiceController
+from app.events.bus import bus
 from app.models.service import Service
 from app.utils.icons_manager import IconManager
 from app.views.components.service_editor_dialog import ServiceEditorDialog
@@ -68,13 +69,15 @@ class ServicesView(QWidget):
         self.setLayout(layout)
 
         self._btn_edit.clicked.connect(self._on_edit_clicked)
-        self._btn_refresh.clicked.connect(self.reload)
+        self._btn_refresh.clicked.connect(self._controller.reload)
         self._btn_toggle_active.clicked.connect(self._on_toggle_active)
         self._btn_add.clicked.connect(self._on_add)
         self._show_inactive.stateChanged.connect(self.reload)
+        # Alterações feitas pelo controller (aqui ou em outra tela) já estão no catálogo
+        bus.services_changed.connect(self._on_services_changed)
 
         # Atalhos (evitar conflito com Ctrl+N global)
-        QShortcut(QKeySequence("F5"), self, self.reload)
+        QShortcut(QKeySequence("F5"), self, self._controller.reload)
         QShortcut(QKeySequence("F2"), self, self._on_edit_clicked)
         QShortcut(QKeySequence("Ctrl+T"), self, self._on_toggle_active)
         QShortcut(QKeySequence("Ctrl+Shift+N"), self, self._on_add)
@@ -83,30 +86,61 @@ class ServicesView(QWidget):
         self.reload()
 
     def reload(self) -> None:
+        # Vem do catálogo em memória; só "Atualizar"/F5 relê o banco
         services = self._controller.list_services(include_inactive=self._show_inactive.isChecked())
         self._populate(services)
 
+    def _on_services_changed(self, ids: List[str]) -> None:
+        if not ids:
+            self.reload()
+            return
+        # Atualiza só as linhas dos serviços alterados
+        catalog = self._controller.catalog()
+        for sid in ids:
+            svc = catalog.get(sid)
+            row = self._row_of(sid)
+            visible = svc is not None and (svc.active or self._show_inactive.isChecked())
+            if not visible:
+                if row is not None:
+                    self._table.removeRow(row)
+                continue
+            if row is None:
+                row = self._table.rowCount()
+                self._table.insertRow(row)
+            self._fill_row(row, svc)
+
+    def _row_of(self, service_id: str) -> Optional[int]:
+        for row in range(self._table.rowCount()):
+            item = self._table.item(row, 0)
+            svc = item.data(Qt.ItemDataRole.UserRole) if item else None
+            if svc is not None and svc.id == service_id:
+                return row
+        return None
+
     def _populate(self, services: List[Service]) -> None:
         self._table.setRowCount(len(services))
         for row, svc in enumerate(services):
-            self._table.setItem(row, 0, QTableWidgetItem(svc.name))
-            self._table.setItem(row, 1, QTableWidgetItem(svc.type))
-            self._table.setItem(row, 2, QTableWidgetItem(svc.subtype or "-"))
-            # Preço fixo (alinhado à direita), Ativo com ícone
-            price_item = QTableWidgetItem(self._format_brl(svc.price_cents))
-            price_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self._table.setItem(row, 3, price_item)
-            active_item = QTableWidgetItem()
-            active_item.setIcon(IconManager.get_icon("ok" if svc.active else "x"))
-            active_item.setText("")
-            active_item.setToolTip("Ativo" if svc.active else "Inativo")
-            self._table.setItem(row, 4, active_item)
-            self._table.setRowHeight(row, UI_TABLE_ROW_HEIGHT)
-            self._table.item(row, 0).setData(Qt.ItemDataRole.UserRole, svc)
+            self._fill_row(row, svc)
         # Ajusta somente colunas de texto amplas; mantém Preço/Ativo fixos
         for col in (0, 1, 2):
             self._table.resizeColumnToContents(col)
 
+    def _fill_row(self, row: int, svc: Service) -> None:
+        self._table.setItem(row, 0, QTableWidgetItem(svc.name))
+        self._table.setItem(row, 1, QTableWidgetItem(svc.type))
+        self._table.setItem(row, 2, QTableWidgetItem(svc.subtype or "-"))
+        # Preço fixo (alinhado à direita), Ativo com ícone
+        price_item = QTableWidgetItem(self._format_brl(svc.price_cents))
+        price_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self._table.setItem(row, 3, price_item)
+        active_item = QTableWidgetItem()
+        active_item.setIcon(IconManager.get_icon("ok" if svc.active else "x"))
+        active_item.setText("")
+        active_item.setToolTip("Ativo" if svc.active else "Inativo")
+        self._table.setItem(row, 4, active_item)
+        self._table.setRowHeight(row, UI_TABLE_ROW_HEIGHT)
+        self._table.item(row, 0).setData(Qt.ItemDataRole.UserRole, svc)
+
     def _selected_service(self) -> Optional[Service]:
         rows = self._table.selectionModel().selectedRows()
         if not rows:
@@ -124,14 +158,12 @@ class ServicesView(QWidget):
         if dlg.exec() == dlg.DialogCode.Accepted:
             new_price = dlg.new_price_cents()
             self._controller.update_price(svc, new_price)
-            self.reload()
 
     def _on_toggle_active(self) -> None:
         svc = self._selected_service()
         if not svc:
             return
         self._controller.set_active(svc.id, not svc.active)
-        self.reload()
 
     def _on_add(self) -> None:
         dlg = ServiceNewDialog(self)
@@ -139,7 +171,6 @@ class ServicesView(QWidget):
             return
         name, type_, subtype, price_cents = dlg.values()
         self._controller.upsert(name, type_, subtype, price_cents, active=True)
-        self.reload()
 
     @staticmethod
     def _format_brl(price_cents: int) -> str:
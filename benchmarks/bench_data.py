@@ -0,0 +1,334 @@
+"""Benchmark da camada de dados: todas as funções públicas de ``app.data.sqlite``
+e do ``FirebaseRepository`` em lojas sintéticas de vários tamanhos.
+
+Para cada escala o banco é gerado por ``benchmarks.synthetic`` (mesma semente,
+mesmos dados) e copiado antes da rodada, já que parte dos casos grava. Cada
+função roda uma vez para aquecer e depois ``--repeat`` vezes; o resultado traz
+mínimo, mediana e máximo em ms e quantas linhas voltaram.
+
+Funções públicas sem caso aparecem em ``missing`` (e num aviso): ao criar uma
+função nova, acrescente o caso em ``_cases``.
+
+Uso:
+    python -m benchmarks.bench_data [--scales small,medium] [--repeat 5] [--seed 42]
+        [--db-dir cache/] [--json saida.json] [--baseline anterior.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from app.data import sqlite as sqldb
+from app.models.client import Client
+from app.models.order import Order, OrderItem
+from app.models.service import Service
+from app.utils.firebase_repository import FirebaseRepository
+from benchmarks import synthetic
+
+# Mediana acima disso em relação à referência é marcada como regressão
+REGRESSION_RATIO = 1.2
+
+
+class _Context:
+    """Amostras tiradas do banco gerado, usadas como argumentos dos casos."""
+
+    def __init__(self, seed: int) -> None:
+        rnd = random.Random(seed)
+        with sqldb.get_conn() as conn:
+            self.recent_ids = [r[0] for r in conn.execute(
+                "SELECT id FROM orders ORDER BY created_at_iso DESC LIMIT 200"
+            )]
+            pool = [r[0] for r in conn.execute("SELECT id FROM orders ORDER BY id LIMIT 20000")]
+            self.client_id = conn.execute(
+                "SELECT client_id FROM orders GROUP BY client_id ORDER BY count(*) DESC LIMIT 1"
+            ).fetchone()[0]
+            self.order_code = conn.execute(
+                "SELECT order_code FROM orders ORDER BY created_at_iso DESC LIMIT 1"
+            ).fetchone()[0]
+        rnd.shuffle(pool)
+        # Pedidos que os casos de remoção consomem (cada repetição pega ids novos)
+        self._delete_pool = [oid for oid in pool if oid not in set(self.recent_ids)]
+        self.services = sqldb.list_services(include_inactive=True)
+        self.today = date.today().isoformat()
+
+    def take(self, n: int) -> List[str]:
+        taken, self._delete_pool = self._delete_pool[:n], self._delete_pool[n:]
+        return taken
+
+
+def _new_order(ctx: _Context, i: int) -> Order:
+    svc = ctx.services[i % len(ctx.services)]
+    items = [OrderItem(svc.name, svc.type, svc.subtype, svc.price_cents, 1) for _ in range(3)]
+    return Order(
+        id=None,
+        client_id=ctx.client_id,
+        created_at_iso=datetime.now(timezone.utc).isoformat(),
+        total_cents=sum(it.unit_price_cents for it in items),
+        items=items,
+        order_code=f"MC-BENCH-{i:08d}",
+    )
+
+
+def _cases(ctx: _Context, repo: FirebaseRepository) -> Dict[str, Callable[[int], Any]]:
+    """Casos na ordem de execução: leituras primeiro, gravações e remoções por último."""
+    s = sqldb
+    recent = ctx.recent_ids
+    svc = ctx.services[0]
+
+    def open_close(_i: int) -> None:
+        with s.get_conn():
+            pass
+
+    return {
+        # ----- sqlite: leitura -----
+        "sqlite.get_conn": open_close,
+        "sqlite.last_activity": lambda i: s.last_activity(),
+        "sqlite.idle_seconds": lambda i: s.idle_seconds(),
+        "sqlite.init_db": lambda i: s.init_db(),
+        "sqlite.list_services": lambda i: s.list_services(include_inactive=True),
+        "sqlite.recent_item_services": lambda i: s.recent_item_services(),
+        "sqlite.list_clients": lambda i: s.list_clients(),
+        "sqlite.search_clients": lambda i: s.search_clients("Silva"),
+        "sqlite.get_client_by_id": lambda i: s.get_client_by_id(ctx.client_id),
+        "sqlite.list_payments": lambda i: s.list_payments(recent),
+        "sqlite.list_orders": lambda i: s.list_orders(),
+        "sqlite.list_orders[status]": lambda i: s.list_orders(status="aberto"),
+        "sqlite.list_orders[client]": lambda i: s.list_orders(client_query="Silva"),
+        "sqlite.list_orders[code]": lambda i: s.list_orders(order_code_query=ctx.order_code),
+        "sqlite.list_orders[ids]": lambda i: s.list_orders(ids=recent),
+        "sqlite.get_order_with_items": lambda i: s.get_order_with_items(recent[i % len(recent)]),
+        "sqlite.read_sync_batch": lambda i: s.read_sync_batch(500),
+        "sqlite.count_sync_queue": lambda i: s.count_sync_queue(),
+        "sqlite.sync_queue_stats": lambda i: s.sync_queue_stats(),
+        "sqlite.list_inventory": lambda i: s.list_inventory(),
+        "sqlite.top_services_by_revenue": lambda i: s.top_services_by_revenue(10, 30),
+        "sqlite.top_services_by_revenue[all]": lambda i: s.top_services_by_revenue(10),
+        "sqlite.bottom_services_by_revenue": lambda i: s.bottom_services_by_revenue(10, 30),
+        "sqlite.revenue_by_day": lambda i: s.revenue_by_day(30),
+        "sqlite.summary_since": lambda i: s.summary_since(30),
+        "sqlite.cash_sum_for_date": lambda i: s.cash_sum_for_date(ctx.today),
+        "sqlite.list_maintenance_runs": lambda i: s.list_maintenance_runs(),
+        "sqlite.list_print_jobs": lambda i: s.list_print_jobs(),
+        "sqlite.print_queue_stats": lambda i: s.print_queue_stats(),
+        # ----- repositório: leitura -----
+        "repo.list_services": lambda i: repo.list_services(),
+        "repo.recent_item_services": lambda i: repo.recent_item_services(),
+        "repo.list_clients": lambda i: repo.list_clients(),
+        "repo.search_clients": lambda i: repo.search_clients("Silva"),
+        "repo.get_client_by_id": lambda i: repo.get_client_by_id(ctx.client_id),
+        "repo.list_payments": lambda i: repo.list_payments(recent),
+        "repo.list_orders": lambda i: repo.list_orders(),
+        "repo.get_order_with_items": lambda i: repo.get_order_with_items(recent[i % len(recent)]),
+        "repo.list_inventory": lambda i: repo.list_inventory(),
+        "repo.count_sync_queue": lambda i: repo.count_sync_queue(),
+        "repo.top_services_by_revenue": lambda i: repo.top_services_by_revenue(10, 30),
+        "repo.bottom_services_by_revenue": lambda i: repo.bottom_services_by_revenue(10, 30),
+        "repo.revenue_by_day": lambda i: repo.revenue_by_day(30),
+        "repo.summary_since": lambda i: repo.summary_since(30),
+        "repo.cash_sum_for_date": lambda i: repo.cash_sum_for_date(ctx.today),
+        "repo.ensure_default_services": lambda i: repo.ensure_default_services(),
+        # ----- sqlite: gravação -----
+        "sqlite.upsert_service": lambda i: s.upsert_service(svc),
+        "sqlite.update_service_price": lambda i: s.update_service_price(svc, svc.price_cents),
+        "sqlite.set_service_active": lambda i: s.set_service_active(svc.id, True),
+        "sqlite.upsert_client": lambda i: s.upsert_client(Client(None, f"Bench {i}", "(16) 90000-0000", None)),
+        "sqlite.upsert_clients": lambda i: s.upsert_clients(
+            Client(None, f"Bench {i}-{k}", None, None) for k in range(500)
+        ),
+        "sqlite.create_order": lambda i: s.create_order(_new_order(ctx, i)),
+        "sqlite.add_payment": lambda i: s.add_payment(recent[i % len(recent)], 1000, "à vista"),
+        "sqlite.update_orders_status": lambda i: s.update_orders_status(recent, "pronto", None),
+        "sqlite.enqueue_sync": lambda i: s.enqueue_sync("inventory", "adjust", {"id": "linha_branca", "delta": 1}),
+        "sqlite.upsert_inventory_item": lambda i: s.upsert_inventory_item("bench", "Bench", "un", i),
+        "sqlite.adjust_inventory": lambda i: s.adjust_inventory("bench", 1),
+        "sqlite.record_maintenance_run": lambda i: s.record_maintenance_run(
+            "bench", datetime.now(timezone.utc).isoformat(), 0, True
+        ),
+        "sqlite.enqueue_print_job": lambda i: s.enqueue_print_job({"text": f"Bench {i}", "order_code": ctx.order_code}),
+        "sqlite.claim_print_job": lambda i: s.claim_print_job(time.time()),
+        "sqlite.finish_print_job": lambda i: s.finish_print_job(i, True, 10.0),
+        "sqlite.requeue_print_jobs": lambda i: s.requeue_print_jobs(),
+        # ----- repositório: gravação -----
+        "repo.upsert_service": lambda i: repo.upsert_service(Service(svc.id, svc.name, svc.type, svc.subtype, svc.price_cents)),
+        "repo.update_service_price": lambda i: repo.update_service_price(svc, svc.price_cents),
+        "repo.set_service_active": lambda i: repo.set_service_active(svc.id, True),
+        "repo.upsert_client": lambda i: repo.upsert_client(Client(None, f"Repo {i}", None, None)),
+        "repo.create_order": lambda i: repo.create_order(ctx.client_id, _new_order(ctx, i).items),
+        "repo.add_payment": lambda i: repo.add_payment(recent[i % len(recent)], 1000, "à vista"),
+        "repo.update_order_status": lambda i: repo.update_order_status(recent[i % len(recent)], "aberto", None),
+        "repo.update_orders_status": lambda i: repo.update_orders_status(recent, "aberto", None),
+        "repo.upsert_inventory_item": lambda i: repo.upsert_inventory_item("bench", "Bench", "un", i),
+        "repo.adjust_inventory": lambda i: repo.adjust_inventory("bench", -1),
+        # ----- remoções (consomem pedidos/itens da fila) -----
+        "sqlite.delete_sync_item": lambda i: s.delete_sync_item(s.read_sync_batch(1)[0][0]),
+        "sqlite.delete_orders": lambda i: s.delete_orders(ctx.take(100)),
+        "repo.delete_order": lambda i: repo.delete_order(ctx.take(1)[0]),
+        "repo.delete_orders": lambda i: repo.delete_orders(ctx.take(100)),
+    }
+
+
+def public_functions() -> List[str]:
+    names = [
+        f"sqlite.{n}" for n, f in inspect.getmembers(sqldb, inspect.isfunction)
+        if f.__module__ == sqldb.__name__ and not n.startswith("_")
+    ]
+    names += [
+        f"repo.{n}" for n, _ in inspect.getmembers(FirebaseRepository, inspect.isfunction)
+        if not n.startswith("_")
+    ]
+    return sorted(names)
+
+
+def _time_case(fn: Callable[[int], Any], repeat: int) -> Dict[str, Any]:
+    result = fn(0)  # aquecimento (cache de páginas, compilação das consultas)
+    samples = []
+    for i in range(1, repeat + 1):
+        t0 = time.perf_counter()
+        result = fn(i)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {
+        "runs": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "rows": len(result) if isinstance(result, (list, tuple)) else None,
+    }
+
+
+def _pristine_db(scale: str, seed: int, db_dir: str) -> Dict[str, Any]:
+    path = os.path.join(db_dir, f"{scale}-{seed}.db")
+    meta_path = path + ".json"
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            return {"path": path, "generation": json.load(f)}
+    clients, orders = synthetic.SCALES[scale]
+    print(f"[{scale}] gerando {clients:,} clientes / {orders:,} pedidos...", file=sys.stderr)
+    stats = synthetic.generate(path, clients, orders, seed=seed)
+    meta = stats.__dict__
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return {"path": path, "generation": meta}
+
+
+def run_scale(scale: str, seed: int, repeat: int, db_dir: str, only: Optional[str] = None) -> Dict[str, Any]:
+    pristine = _pristine_db(scale, seed, db_dir)
+    work = os.path.join(db_dir, f"{scale}-{seed}.work.db")
+    shutil.copyfile(pristine["path"], work)
+    previous = sqldb.DB_PATH
+    sqldb.DB_PATH = work
+    try:
+        repo = FirebaseRepository(None)
+        ctx = _Context(seed)
+        cases = _cases(ctx, repo)
+        functions: Dict[str, Any] = {}
+        for name, fn in cases.items():
+            if only and only not in name:
+                continue
+            functions[name] = _time_case(fn, repeat)
+            print(f"[{scale}] {name:45s} {functions[name]['median_ms']:>10.2f} ms", file=sys.stderr)
+    finally:
+        sqldb.DB_PATH = previous
+        os.remove(work)
+    covered = {name.split("[")[0] for name in cases}
+    return {
+        "generation": pristine["generation"],
+        "functions": functions,
+        "missing": [n for n in public_functions() if n not in covered],
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Razão das medianas (atual / referência) para cada função medida nas duas."""
+    rows = []
+    for scale, data in result["scales"].items():
+        base_fns = baseline.get("scales", {}).get(scale, {}).get("functions", {})
+        for name, cur in data["functions"].items():
+            base = base_fns.get(name)
+            if not base or not base["median_ms"]:
+                continue
+            ratio = cur["median_ms"] / base["median_ms"]
+            rows.append({
+                "scale": scale,
+                "function": name,
+                "baseline_ms": base["median_ms"],
+                "current_ms": cur["median_ms"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > REGRESSION_RATIO,
+            })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="small,medium", help=f"lista separada por vírgula: {', '.join(synthetic.SCALES)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", default=None, help="só casos cujo nome contém este texto")
+    parser.add_argument("--db-dir", default=None, help="guarda os bancos gerados para as próximas rodadas")
+    parser.add_argument("--json", dest="json_path", help="grava o resultado em JSON ('-' para stdout)")
+    parser.add_argument("--baseline", default=None, help="JSON de uma rodada anterior para comparar")
+    args = parser.parse_args(argv)
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in synthetic.SCALES]
+    if unknown:
+        parser.error(f"escala desconhecida: {', '.join(unknown)}")
+
+    db_dir = args.db_dir or tempfile.mkdtemp(prefix="bench_data_")
+    os.makedirs(db_dir, exist_ok=True)
+    result: Dict[str, Any] = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "scales": {},
+    }
+    try:
+        for scale in scales:
+            result["scales"][scale] = run_scale(scale, args.seed, args.repeat, db_dir, args.only)
+    finally:
+        if not args.db_dir:
+            shutil.rmtree(db_dir, ignore_errors=True)
+
+    missing = sorted({n for data in result["scales"].values() for n in data["missing"]})
+    if missing:
+        print(f"aviso: funções sem caso de benchmark: {', '.join(missing)}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            result["comparison"] = compare(result, json.load(f))
+        for row in result["comparison"]:
+            flag = "  <-- regressão" if row["regression"] else ""
+            print(
+                f"{row['scale']:7s} {row['function']:45s} {row['baseline_ms']:>10.2f} -> {row['current_ms']:>10.2f} ms"
+                f"  x{row['ratio']:.2f}{flag}"
+            )
+
+    if args.json_path == "-":
+        json.dump(result, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    elif args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+"""Benchmark: cache de ícones e atlas pré-renderizado (Qt offscreen).
+
+Mede, em processos novos, o custo de obter os ícones da janela principal na
+inicialização com o atlas e renderizando via ``pytablericons`` (comportamento
+anterior), e, no mesmo processo, o custo de abrir o ``OrderDialog`` com o
+cache frio e quente.
+
+Uso:
+    python -m benchmarks.bench_icons [--runs 5] [--dialogs 20] [--json saida.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Ícones pedidos pela MainWindow (abas, menus) e pelo HeaderBar
+_STARTUP_ICONS = [(n, 20, "#2c3e50") for n in ("lista", "clientes", "servicos", "dashboard", "sair", "pedido", "lista", "clientes", "servicos", "dashboard", "config")]
+_STARTUP_ICONS += [(n, 22, "#ffffff") for n in ("pedido", "clientes", "servicos", "config", "toggle", "dashboard")]
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(_PROJECT_ROOT), env.get("PYTHONPATH")) if p)
+    return env
+
+
+def _child(mode: str) -> Dict[str, float]:
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])  # noqa: F841
+    from app.utils.icons_manager import IconManager
+
+    if mode == "render":
+        IconManager._atlas = {}
+    start = time.perf_counter()
+    for name, size, color in _STARTUP_ICONS:
+        IconManager.get_icon(name, size=size, color=color)
+    return {
+        "startup_icons_ms": round((time.perf_counter() - start) * 1000, 2),
+        "pytablericons_loaded": float("pytablericons" in sys.modules),
+    }
+
+
+def measure_startup(runs: int) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    for mode in ("atlas", "render"):
+        samples: List[Dict[str, float]] = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_icons", "--child", mode],
+                env=_env(),
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        result[mode] = {
+            "startup_icons_ms": round(statistics.median(s["startup_icons_ms"] for s in samples), 2),
+            "pytablericons_loaded": bool(samples[-1]["pytablericons_loaded"]),
+        }
+    return result
+
+
+def measure_dialogs(dialogs: int) -> Dict[str, Any]:
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+    from app.data import sqlite as sqldb
+    from app.controllers.client_controller import ClientController
+    from app.controllers.orders_controller import OrdersController
+    from app.controllers.service_controller import ServiceController
+    from app.utils.firebase_repository import FirebaseRepository
+    from app.utils.icons_manager import IconManager
+    from app.views.components.order_dialog import OrderDialog
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    sqldb.DB_PATH = db_path
+    try:
+        repo = FirebaseRepository(None)
+        repo.ensure_default_services()
+        controllers = (ClientController(repo), ServiceController(repo), OrdersController(repo))
+
+        def open_dialog() -> float:
+            start = time.perf_counter()
+            dlg = OrderDialog(None, *controllers)
+            elapsed = time.perf_counter() - start
+            dlg.deleteLater()
+            return elapsed * 1000
+
+        cold: List[float] = []
+        for _ in range(dialogs):
+            IconManager.clear_cache()
+            IconManager._atlas = {}
+            cold.append(open_dialog())
+        IconManager._atlas = None
+        IconManager.clear_cache()
+        open_dialog()
+        warm = [open_dialog() for _ in range(dialogs)]
+        return {
+            "dialogs": dialogs,
+            "uncached_ms": round(statistics.median(cold), 3),
+            "cached_ms": round(statistics.median(warm), 3),
+            "cache_hits": IconManager.hits,
+            "cache_misses": IconManager.misses,
+        }
+    finally:
+        os.unlink(db_path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--dialogs", type=int, default=20)
+    parser.add_argument("--json", dest="json_path", help="grava o resultado em JSON")
+    parser.add_argument("--child", choices=("atlas", "render"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child)))
+        return 0
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    result = {"startup": measure_startup(args.runs), "order_dialog": measure_dialogs(args.dialogs)}
+    for mode in ("atlas", "render"):
+        r = result["startup"][mode]
+        print(f"inicialização ({mode:6s}): {r['startup_icons_ms']:8.1f} ms  pytablericons carregado: {r['pytablericons_loaded']}")
+    d = result["order_dialog"]
+    print(f"OrderDialog: sem cache {d['uncached_ms']:.2f} ms  com cache {d['cached_ms']:.2f} ms")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,272 @@
+"""Benchmark: tempo de inicialização do app até a janela pintada (Qt offscreen).
+
+Três medições, todas em processos novos:
+
+- ``phases``: executa o ``main.py`` real com ``MYRTHES_STARTUP_PROFILE`` e coleta
+  as etapas (imports, QApplication, init do banco, janela, primeira pintura,
+  serviços padrão, aba atual) e o tempo acumulado em renderização de ícones;
+- ``imports``: executa ``main.py`` com ``-X importtime`` e agrega o custo por
+  pacote e por módulo;
+- ``tabs``: compara abas sob demanda com a construção antecipada de todas.
+
+O resultado é um JSON (``--json caminho`` ou ``--json -`` para stdout) para
+comparar versões.
+
+Uso:
+    python -m benchmarks.bench_startup [--runs 5] [--top 25] [--json saida.json]
+"""
+
+from __future__ import annotations
+
+import time
+
+_T0 = time.perf_counter()
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_MAIN = str(_PROJECT_ROOT / "main.py")
+_TAB_KEYS = ("orders", "clients", "services", "dashboard")
+
+
+def _env(**extra: str) -> Dict[str, str]:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", **extra)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(_PROJECT_ROOT), env.get("PYTHONPATH")) if p)
+    return env
+
+
+def _median_dicts(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    keys = [k for k in samples[0] if all(k in s for s in samples)]
+    return {k: round(statistics.median(s[k] for s in samples), 2) for k in keys}
+
+
+# ----- etapas do main.py -----
+
+def _run_app_once(timeout: float) -> Dict[str, Any]:
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, _MAIN],
+            env=_env(MYRTHES_STARTUP_PROFILE=path),
+            capture_output=True,
+            timeout=timeout,
+            check=True,
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    finally:
+        os.unlink(path)
+    data["marks"]["process_exit"] = round(wall_ms, 2)
+    return data
+
+
+def measure_phases(runs: int, timeout: float = 120.0) -> Dict[str, Any]:
+    samples = [_run_app_once(timeout) for _ in range(runs)]
+    return {
+        "marks_ms": _median_dicts([s["marks"] for s in samples]),
+        "totals_ms": _median_dicts([s["totals"] for s in samples]) if all(s["totals"] for s in samples) else {},
+    }
+
+
+# ----- -X importtime -----
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Converte as linhas ``import time: self | cumulative | módulo`` em registros."""
+    rows: List[Dict[str, Any]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # cabeçalho
+        name = parts[2].rstrip()
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_us": int(parts[0]),
+            "cumulative_us": int(parts[1]),
+        })
+    return rows
+
+
+def measure_imports(top: int, timeout: float = 120.0) -> Dict[str, Any]:
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", _MAIN],
+            env=_env(MYRTHES_STARTUP_PROFILE=path),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=True,
+        )
+    finally:
+        os.unlink(path)
+    rows = parse_importtime(out.stderr)
+    by_package: Dict[str, int] = {}
+    for r in rows:
+        pkg = r["module"].split(".")[0]
+        by_package[pkg] = by_package.get(pkg, 0) + r["self_us"]
+    packages = sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)
+    slowest = sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+    return {
+        "total_self_ms": round(sum(r["self_us"] for r in rows) / 1000, 2),
+        "modules": len(rows),
+        "by_package_ms": {k: round(v / 1000, 2) for k, v in packages[:top]},
+        "slowest_modules": [
+            {"module": r["module"], "self_ms": round(r["self_us"] / 1000, 2), "cumulative_ms": round(r["cumulative_us"] / 1000, 2)}
+            for r in slowest
+        ],
+    }
+
+
+# ----- abas sob demanda vs. antecipadas -----
+
+def _child(mode: str) -> Dict[str, float]:
+    """Reproduz o main.py construindo as abas conforme ``mode`` (ms desde o início)."""
+    marks: Dict[str, float] = {}
+
+    def mark(name: str) -> None:
+        marks[name] = round((time.perf_counter() - _T0) * 1000, 2)
+
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])
+    from app.utils.firebase_repository import FirebaseRepository
+    from app.controllers.service_controller import ServiceController
+    from app.views.main_window import MainWindow
+    mark("imports")
+
+    class _PaintWatcher(QObject):
+        def eventFilter(self, obj, event):  # type: ignore[override]
+            if event.type() == QEvent.Type.Paint and "first_paint" not in marks:
+                mark("first_paint")
+            return False
+
+    repository = FirebaseRepository(None)
+    window = MainWindow(repository=repository, service_controller=ServiceController(repository))
+    if mode == "eager":
+        for key in _TAB_KEYS:
+            window.tab_view(key)
+    mark("window_built")
+
+    watcher = _PaintWatcher()
+    window.installEventFilter(watcher)
+    window.show()
+    app.processEvents()
+    mark("shown")
+
+    def finish() -> None:
+        repository.ensure_default_services()
+        window.prepare_current_tab()
+        mark("current_tab_ready")
+        app.quit()
+
+    QTimer.singleShot(0, finish)
+    app.exec()
+    return marks
+
+
+def _run_child(mode: str) -> Dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", mode],
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure_tabs(runs: int) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    for mode in ("lazy", "eager"):
+        result[mode] = _median_dicts([_run_child(mode) for _ in range(runs)])
+    result["first_paint_gain_ms"] = round(result["eager"]["first_paint"] - result["lazy"]["first_paint"], 2)
+    return result
+
+
+# ----- relatório -----
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_PROJECT_ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run(runs: int = 5, top: int = 25, tabs: bool = True) -> Dict[str, Any]:
+    from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+
+    result: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "runs": runs,
+        },
+        "phases": measure_phases(runs),
+        "imports": measure_imports(top),
+    }
+    if tabs:
+        result["tabs"] = measure_tabs(runs)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25, help="quantos pacotes/módulos listar no importtime")
+    parser.add_argument("--no-tabs", action="store_true", help="pula a comparação de abas sob demanda")
+    parser.add_argument("--json", dest="json_path", help="grava o resultado em JSON ('-' para stdout)")
+    parser.add_argument("--child", choices=("lazy", "eager"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child)))
+        return 0
+
+    result = run(args.runs, args.top, tabs=not args.no_tabs)
+    if args.json_path == "-":
+        print(json.dumps(result, indent=2))
+        return 0
+
+    print("etapas (ms desde o início):")
+    for name, value in result["phases"]["marks_ms"].items():
+        print(f"  {name:20s} {value:8.1f}")
+    for name, value in result["phases"]["totals_ms"].items():
+        print(f"  total {name:14s} {value:8.1f}")
+    print(f"imports: {result['imports']['modules']} módulos, {result['imports']['total_self_ms']:.0f} ms")
+    for pkg, value in result["imports"]["by_package_ms"].items():
+        print(f"  {pkg:20s} {value:8.1f}")
+    if "tabs" in result:
+        for mode in ("lazy", "eager"):
+            marks = "  ".join(f"{k}={v:.0f}ms" for k, v in result["tabs"][mode].items())
+            print(f"{mode:6s} {marks}")
+        print(f"ganho até a primeira pintura: {result['tabs']['first_paint_gain_ms']:.0f} ms")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+"""Benchmark: formato compacto da sync_queue vs ``json.dumps``.
+
+Uso:
+    python -m benchmarks.bench_sync_codec [--n 20000] [--seed 42] [--json saida.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.data.sync_codec import decode_payload, encode_payload
+
+_SERVICES = [
+    ("Ajuste de tamanho", "ajuste_tamanho", None, 4500),
+    ("Troca de zíper", "troca_ziper", None, 5500),
+    ("Barra", "barra", "Original", 3500),
+    ("Barra", "barra", "Simples", 2500),
+    ("Pence", "pence", None, 3000),
+]
+
+
+def sample_queue(n: int, seed: int = 42) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Gera uma fila realista: maioria pedidos, depois status, clientes e serviços."""
+    rnd = random.Random(seed)
+    out: List[Tuple[str, str, Dict[str, Any]]] = []
+    for i in range(n):
+        roll = rnd.random()
+        if roll < 0.55:
+            items = []
+            for _ in range(rnd.randint(1, 6)):
+                name, type_, subtype, price = rnd.choice(_SERVICES)
+                items.append({
+                    "service_name": name,
+                    "service_type": type_,
+                    "service_subtype": subtype,
+                    "unit_price_cents": price,
+                    "quantity": rnd.randint(1, 3),
+                })
+            out.append(("order", "upsert", {
+                "id": f"local:order:{rnd.getrandbits(128):032x}",
+                "client_id": f"local:client:{rnd.getrandbits(128):032x}",
+                "created_at_iso": f"2025-08-{rnd.randint(1, 28):02d}T1{rnd.randint(0, 9)}:00:00+00:00",
+                "status": "aberto",
+                "total_cents": sum(it["unit_price_cents"] * it["quantity"] for it in items),
+                "due_date_iso": f"2025-09-{rnd.randint(1, 28):02d}",
+                "delivered_at_iso": None,
+                "order_code": f"MC-250812-{rnd.getrandbits(32):08x}",
+                "items": items,
+            }))
+        elif roll < 0.80:
+            out.append(("order", "update_status", {
+                "id": f"local:order:{rnd.getrandbits(128):032x}",
+                "status": "entregue",
+                "delivered_at_iso": "2025-08-20T15:00:00+00:00",
+            }))
+        elif roll < 0.95:
+            out.append(("client", "upsert", {
+                "id": f"local:client:{rnd.getrandbits(128):032x}",
+                "name": f"Cliente {i}",
+                "phone": f"(16) 9{rnd.randint(1000, 9999)}-{rnd.randint(1000, 9999)}",
+                "notes": None,
+            }))
+        else:
+            name, type_, subtype, price = rnd.choice(_SERVICES)
+            out.append(("service", "upsert", {
+                "id": f"local:{name}:{type_}:{subtype or ''}",
+                "name": name,
+                "type": type_,
+                "subtype": subtype,
+                "price_cents": price,
+                "active": True,
+            }))
+    return out
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(n: int = 20000, seed: int = 42) -> Dict[str, Any]:
+    queue = sample_queue(n, seed)
+
+    json_blobs: List[str] = []
+    compact_blobs: List[bytes] = []
+    t_json_enc = _timed(lambda: json_blobs.extend(json.dumps(d) for _, _, d in queue))
+    t_compact_enc = _timed(lambda: compact_blobs.extend(encode_payload(e, a, d) for e, a, d in queue))
+    t_json_dec = _timed(lambda: [json.loads(b) for b in json_blobs])
+    t_compact_dec = _timed(lambda: [decode_payload(b) for b in compact_blobs])
+
+    # garante que o formato é sem perdas
+    for (_, _, data), blob in zip(queue, compact_blobs):
+        assert decode_payload(blob) == data
+
+    json_bytes = sum(len(b.encode("utf-8")) for b in json_blobs)
+    compact_bytes = sum(len(b) for b in compact_blobs)
+    return {
+        "payloads": n,
+        "json": {
+            "bytes": json_bytes,
+            "encode_per_s": round(n / t_json_enc),
+            "decode_per_s": round(n / t_json_dec),
+        },
+        "compact": {
+            "bytes": compact_bytes,
+            "encode_per_s": round(n / t_compact_enc),
+            "decode_per_s": round(n / t_compact_dec),
+        },
+        "size_ratio": round(compact_bytes / json_bytes, 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="grava o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    result = run(args.n, args.seed)
+    print(f"payloads: {result['payloads']}")
+    for key in ("json", "compact"):
+        r = result[key]
+        print(f"{key:8s} {r['bytes']:>12,d} bytes  enc {r['encode_per_s']:>9,d}/s  dec {r['decode_per_s']:>9,d}/s")
+    print(f"tamanho compacto/json: {result['size_ratio']:.3f}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,297 @@
+"""Gerador de lojas sintéticas (determinístico por semente) para benchmarks.
+
+Produz um banco no mesmo esquema do app (``init_db``) com clientes, catálogo de
+serviços, pedidos com itens, pagamentos, estoque e movimentações de estoque
+(registros ``inventory/adjust`` da ``sync_queue``, que é onde o app as guarda).
+
+A distribuição imita a loja real:
+
+- itens sorteados do catálogo com peso por popularidade (barra e ajuste
+  dominam), então tipo/subtipo seguem o catálogo gravado em ``services``;
+- poucos clientes concentram muitos pedidos (cauda longa);
+- movimento maior de segunda a sábado e crescimento ao longo dos anos;
+- pedidos antigos quase todos entregues e pagos; recentes em aberto/pronto,
+  muitos com entrada de 50%.
+
+A mesma semente e escala geram sempre o mesmo banco, exceto pelas datas:
+o período termina em ``end`` (padrão: hoje), para os relatórios dos
+"últimos N dias" terem dados.
+
+Uso:
+    python -m benchmarks.synthetic --out loja.db [--scale small|medium|large] [--seed 42]
+    python -m benchmarks.synthetic --out loja.db --clients 5000 --orders 40000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.data import sqlite as sqldb
+from app.data.sync_codec import encode_payload
+
+# clientes, pedidos (≈3 itens e ≈1,4 pagamento por pedido)
+SCALES: Dict[str, Tuple[int, int]] = {
+    "small": (1_000, 10_000),
+    "medium": (10_000, 100_000),
+    "large": (100_000, 1_000_000),
+}
+
+# (nome, tipo, subtipo, preço em centavos, peso de popularidade)
+CATALOG: List[Tuple[str, str, Optional[str], int, float]] = [
+    ("Barra", "barra", "Simples", 2500, 30.0),
+    ("Barra", "barra", "Original", 3500, 18.0),
+    ("Barra", "barra", "Italiana", 4500, 4.0),
+    ("Ajuste de tamanho", "ajuste_tamanho", None, 4500, 20.0),
+    ("Ajuste de cintura", "ajuste_tamanho", "Cintura", 4000, 8.0),
+    ("Ajuste de manga", "ajuste_tamanho", "Manga", 3500, 5.0),
+    ("Troca de zíper", "troca_ziper", None, 5500, 10.0),
+    ("Troca de zíper", "troca_ziper", "Invisível", 6500, 3.0),
+    ("Pence", "pence", None, 3000, 6.0),
+    ("Troca de botão", "reparo", "Botão", 1000, 5.0),
+    ("Remendo", "reparo", "Remendo", 2000, 4.0),
+    ("Costura de rasgo", "reparo", "Rasgo", 2500, 4.0),
+    ("Troca de elástico", "reparo", "Elástico", 3000, 3.0),
+    ("Bainha de vestido", "barra", "Vestido", 6000, 2.0),
+    ("Ajuste de vestido de festa", "ajuste_tamanho", "Festa", 15000, 0.8),
+    ("Customização", "personalizado", None, 8000, 0.5),
+]
+
+INVENTORY: List[Tuple[str, str, str]] = [
+    ("ziper_padrao", "Zíper padrão", "un"),
+    ("ziper_invisivel", "Zíper invisível", "un"),
+    ("linha_branca", "Linha branca", "cone"),
+    ("linha_preta", "Linha preta", "cone"),
+    ("linha_azul", "Linha azul-marinho", "cone"),
+    ("botao_camisa", "Botão de camisa", "un"),
+    ("botao_calca", "Botão de calça", "un"),
+    ("elastico_2cm", "Elástico 2 cm", "m"),
+    ("entretela", "Entretela", "m"),
+    ("viés", "Viés", "m"),
+]
+
+_FIRST = (
+    "Ana Maria Beatriz Carla Daniela Eduarda Fernanda Gabriela Helena Isabela Joana Juliana Larissa Luciana "
+    "Mariana Natália Patrícia Renata Sandra Tatiane Vanessa Aline Bruna Camila Débora Elaine Flávia Gisele "
+    "João José Carlos Paulo Pedro Lucas Marcos Rafael Rodrigo Thiago Bruno Eduardo Felipe Gustavo André"
+).split()
+_LAST = (
+    "Silva Santos Oliveira Souza Rodrigues Ferreira Alves Pereira Lima Gomes Costa Ribeiro Martins Carvalho "
+    "Almeida Lopes Soares Fernandes Vieira Barbosa Rocha Dias Nascimento Andrade Moreira Nunes Marques Machado "
+    "Mendes Freitas Cardoso Ramos Gonçalves Santana Teixeira"
+).split()
+# Segunda a sábado; domingo quase parado
+_WEEKDAY_WEIGHT = (1.0, 1.0, 1.0, 1.0, 1.1, 1.4, 0.05)
+
+_BATCH = 50_000
+
+
+@dataclass
+class GenerationStats:
+    seed: int
+    clients: int
+    orders: int
+    items: int
+    payments: int
+    services: int
+    inventory: int
+    movements: int
+    seconds: float
+    db_bytes: int
+
+
+def _order_days(rnd: random.Random, n: int, start: date, end: date) -> List[date]:
+    """Datas de criação: peso por dia da semana e crescimento linear no período."""
+    span = (end - start).days + 1
+    days = [start + timedelta(days=i) for i in range(span)]
+    weights = [_WEEKDAY_WEIGHT[d.weekday()] * (0.5 + i / span) for i, d in enumerate(days)]
+    picked = rnd.choices(days, weights=weights, k=n)
+    picked.sort()
+    return picked
+
+
+def _iso(day: date, seconds: int) -> str:
+    return datetime.combine(day, dtime(), tzinfo=timezone.utc).replace(
+        hour=seconds // 3600, minute=(seconds // 60) % 60, second=seconds % 60
+    ).isoformat()
+
+
+def generate(
+    path: str,
+    clients: int,
+    orders: int,
+    seed: int = 42,
+    years: int = 3,
+    end: Optional[date] = None,
+    movements_per_item: int = 100,
+) -> GenerationStats:
+    """Cria (ou recria) ``path`` com uma loja sintética e retorna as contagens."""
+    t0 = time.perf_counter()
+    rnd = random.Random(seed)
+    end = end or date.today()
+    start = end - timedelta(days=365 * years)
+    for suffix in ("", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    previous = sqldb.DB_PATH
+    sqldb.DB_PATH = path
+    try:
+        sqldb.init_db()
+    finally:
+        sqldb.DB_PATH = previous
+
+    conn = sqlite3.connect(path)
+    # Só para a carga: o arquivo é descartável até o commit final
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+
+    services = [
+        (f"local:{name}:{type_}:{subtype or ''}", name, type_, subtype, price, weight)
+        for name, type_, subtype, price, weight in CATALOG
+    ]
+    conn.executemany(
+        "INSERT INTO services (id, name, type, subtype, price_cents, active) VALUES (?, ?, ?, ?, ?, 1)",
+        [s[:5] for s in services],
+    )
+    service_weights = [s[5] for s in services]
+
+    client_ids = [f"local:client:{rnd.getrandbits(128):032x}" for _ in range(clients)]
+    conn.executemany(
+        "INSERT INTO clients (id, name, phone, notes) VALUES (?, ?, ?, ?)",
+        (
+            (
+                cid,
+                f"{rnd.choice(_FIRST)} {rnd.choice(_LAST)} {rnd.choice(_LAST)}",
+                f"(16) 9{rnd.randint(1000, 9999)}-{rnd.randint(0, 9999):04d}",
+                "cliente antiga" if rnd.random() < 0.05 else None,
+            )
+            for cid in client_ids
+        ),
+    )
+
+    n_items = n_payments = 0
+    order_rows: List[tuple] = []
+    item_rows: List[tuple] = []
+    payment_rows: List[tuple] = []
+
+    def flush() -> None:
+        conn.executemany(
+            "INSERT INTO orders (id, client_id, created_at_iso, status, total_cents, due_date_iso, delivered_at_iso, order_code) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            order_rows,
+        )
+        conn.executemany(
+            "INSERT INTO order_items (order_id, service_name, service_type, service_subtype, unit_price_cents, quantity) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            item_rows,
+        )
+        conn.executemany(
+            "INSERT INTO payments (order_id, amount_cents, method, note, created_at_iso) VALUES (?, ?, ?, ?, ?)",
+            payment_rows,
+        )
+        order_rows.clear()
+        item_rows.clear()
+        payment_rows.clear()
+
+    for day in _order_days(rnd, orders, start, end):
+        age = (end - day).days
+        # Cauda longa: clientes do começo da lista voltam muito mais
+        client_id = client_ids[int(clients * rnd.random() ** 2.5)]
+        created = _iso(day, rnd.randint(8 * 3600, 18 * 3600))
+        oid = f"local:order:{rnd.getrandbits(128):032x}"
+        items = []
+        for svc in rnd.choices(services, weights=service_weights, k=rnd.choice((1, 1, 2, 2, 3, 3, 4, 5, 6))):
+            qty = 1 if rnd.random() < 0.85 else rnd.randint(2, 4)
+            items.append((oid, svc[1], svc[2], svc[3], svc[4], qty))
+        total = sum(it[4] * it[5] for it in items)
+
+        due = day + timedelta(days=rnd.randint(3, 10))
+        if age > 30 or rnd.random() < 0.4:
+            status = "entregue"
+        else:
+            status = "pronto" if rnd.random() < 0.35 else "aberto"
+        delivered = None
+        if status == "entregue":
+            delivered_day = min(end, day + timedelta(days=rnd.randint(2, 14)))
+            delivered = _iso(delivered_day, rnd.randint(9 * 3600, 18 * 3600))
+
+        if rnd.random() < 0.55:
+            payment_rows.append((oid, total // 2, "entrada", "50%", created))
+            if delivered:
+                payment_rows.append((oid, total - total // 2, "à vista", "restante", delivered))
+        elif delivered or rnd.random() < 0.3:
+            payment_rows.append((oid, total, "à vista", "100%", delivered or created))
+
+        order_rows.append((
+            oid, client_id, created, status, total, due.isoformat(), delivered,
+            f"MC-{day.strftime('%y%m%d')}-{rnd.getrandbits(32):08x}",
+        ))
+        item_rows.extend(items)
+        n_items += len(items)
+        if len(order_rows) >= _BATCH:
+            n_payments += len(payment_rows)
+            flush()
+    n_payments += len(payment_rows)
+    flush()
+
+    movements = []
+    for item_id, name, unit in INVENTORY:
+        quantity = rnd.randint(20, 200)
+        conn.execute(
+            "INSERT INTO inventory (id, name, unit, quantity) VALUES (?, ?, ?, ?)",
+            (item_id, name, unit, quantity),
+        )
+        for _ in range(movements_per_item):
+            movements.append(("inventory", "adjust", encode_payload(
+                "inventory", "adjust", {"id": item_id, "delta": rnd.choice((-3, -2, -1, -1, -1, 5, 10, 20))}
+            )))
+    conn.executemany("INSERT INTO sync_queue (entity, action, payload) VALUES (?, ?, ?)", movements)
+    conn.commit()
+    conn.close()
+
+    return GenerationStats(
+        seed=seed,
+        clients=clients,
+        orders=orders,
+        items=n_items,
+        payments=n_payments,
+        services=len(services),
+        inventory=len(INVENTORY),
+        movements=len(movements),
+        seconds=round(time.perf_counter() - t0, 2),
+        db_bytes=os.path.getsize(path),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="arquivo .db a criar (sobrescreve)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--clients", type=int, default=None, help="sobrepõe a escala")
+    parser.add_argument("--orders", type=int, default=None, help="sobrepõe a escala")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--years", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    clients, orders = SCALES[args.scale]
+    stats = generate(
+        args.out,
+        args.clients if args.clients is not None else clients,
+        args.orders if args.orders is not None else orders,
+        seed=args.seed,
+        years=args.years,
+    )
+    for key, value in asdict(stats).items():
+        print(f"{key:10s} {value:>14,}" if isinstance(value, int) else f"{key:10s} {value:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,9 @@
 import sys
+from pathlib import Path
+
+from app.utils import startup_profile
+
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 
 from app.config.firebase_config import get_firestore_client
@@ -6,17 +11,69 @@ from app.utils.firebase_repository import FirebaseRepository
 from app.controllers.service_controller import ServiceController
 from app.views.main_window import MainWindow
 from app.utils.sync_manager import SyncManager
+from app.utils.periodic import PeriodicJob
+from app.utils.loop_monitor import LoopLagMonitor
+from app.utils import flight_recorder
+from app.utils.print_spooler import spooler
+
+startup_profile.mark("imports")
+
+
+def archive_old_orders() -> None:
+    """Move pedidos entregues antigos para o arquivo morto (roda numa thread à parte)."""
+    from app.data import archive
+    from app.events.bus import bus
+
+    try:
+        moved = archive.archive_delivered()
+    except Exception:
+        return
+    ids = [oid for year_ids in moved.values() for oid in year_ids]
+    if ids:
+        # As listas reconsultam esses pedidos: somem da visão "quente", ficam se o histórico estiver incluído
+        bus.publish("orders_updated", *ids)
+
+
+def backup_if_due() -> None:
+    from app.data import backup
+
+    backup.run_if_due(should_stop=maintenance_stopping)
+
+
+def maintain_db_if_idle() -> None:
+    from app.data import maintenance
+
+    maintenance.run_if_idle(should_stop=maintenance_stopping)
+
+
+# Tarefas periódicas de manutenção (threads próprias; nenhuma roda na thread da UI)
+MAINTENANCE_JOBS = [
+    PeriodicJob("archiver", 24 * 3600, archive_old_orders, initial_delay_s=30),
+    # Verifica a cada 10 min se o backup venceu (BACKUP_INTERVAL_HOURS)
+    PeriodicJob("backup", 600, backup_if_due, initial_delay_s=60),
+    # optimize/ANALYZE/incremental_vacuum só com o banco ocioso (MAINTENANCE_IDLE_SECONDS)
+    PeriodicJob("db-maintenance", 300, maintain_db_if_idle, initial_delay_s=180),
+]
+
+
+def maintenance_stopping() -> bool:
+    return any(job.stopping() for job in MAINTENANCE_JOBS)
 
 
 def main() -> int:
     app = QApplication(sys.argv)
+    startup_profile.mark("qapplication")
+    # Últimas operações vão para logs/ numa exceção não tratada ou erro fatal do Qt
+    from app.data import sqlite as sqldb
+
+    flight_recorder.install(Path(sqldb.DB_PATH).resolve().parent / "logs")
+    flight_recorder.install_qt_handler()
 
     firestore_client = get_firestore_client()
     repository = FirebaseRepository(firestore_client)
-    repository.ensure_default_services()
+    startup_profile.mark("db_init")
 
     sync = SyncManager(firestore_client)
-    sync.start()
     # expõe para a janela poder abrir o diálogo de sync reutilizando a thread
     setattr(MainWindow, "_sync_manager", sync)
 
@@ -26,10 +83,37 @@ def main() -> int:
         repository=repository,
         service_controller=service_controller,
     )
+    startup_profile.mark("window_built")
+    startup_profile.watch_first_paint(window)
     window.show()
+    app.processEvents()
+    startup_profile.mark("shown")
+
+    # O restante roda depois que a janela já foi pintada
+    # Atraso do event loop (ui.loop_lag / ui.stalls no diagnóstico)
+    loop_monitor = LoopLagMonitor(app)
+    # Para o timer e o vigia da UI ainda com o event loop de pé
+    app.aboutToQuit.connect(loop_monitor.stop)
+
+    def finish_startup() -> None:
+        repository.ensure_default_services()
+        service_controller.catalog().invalidate()
+        startup_profile.mark("default_services")
+        window.prepare_current_tab()
+        startup_profile.mark("current_tab_ready")
+        sync.start()
+        spooler.start()
+        loop_monitor.start()
+        for job in MAINTENANCE_JOBS:
+            job.start()
+
+    QTimer.singleShot(0, finish_startup)
 
     code = app.exec()
+    for job in MAINTENANCE_JOBS:
+        job.stop()
     sync.stop()
+    spooler.stop()
     return code
 
 